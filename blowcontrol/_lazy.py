@@ -0,0 +1,39 @@
+"""
+Lazy attribute loading for BlowControl subpackages.
+
+A subpackage lists which submodule defines each public name; the submodule
+is imported on first attribute access (PEP 562), so importing the package
+itself stays cheap.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_module_attrs(
+    package: str, namespace: Dict[str, Any], attrs: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level __getattr__ and __dir__ for a package.
+
+    Args:
+        package: The package's __name__, used to resolve relative submodules
+        namespace: The package's globals(); loaded names are cached there
+        attrs: Public name -> relative submodule that defines it
+
+    Returns:
+        (__getattr__, __dir__) to assign at the package's top level.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = attrs.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(attrs))
+
+    return __getattr__, __dir__
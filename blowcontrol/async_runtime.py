@@ -0,0 +1,45 @@
+"""
+Shared asyncio runtime for BlowControl.
+
+Runs one event loop in a daemon thread for the life of the process, so
+synchronous code can await coroutines without paying for a fresh loop
+(selector, executor, signal wiring) on every call the way asyncio.run() does.
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="blowcontrol-asyncio", daemon=True
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_coro(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the background loop and block until it finishes.
+
+    Must not be called from a coroutine already running on that loop.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The coroutine's result; exceptions it raises are re-raised here.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
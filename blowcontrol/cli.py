@@ -3,27 +3,27 @@ CLI entry point for Dyson2MQTT modular app.
 """
 
 import argparse
-import json
 import logging
 import sys
-from typing import Any, Dict, Optional
-
-from blowcontrol.commands.auto_mode import set_auto_mode
-from blowcontrol.commands.fan_speed import set_fan_speed
-from blowcontrol.commands.night_mode import set_night_mode
-from blowcontrol.commands.oscillation import (
-    VALID_WIDTHS,
-    WIDTH_DISPLAY_NAMES,
-    get_oscillation_info,
-    parse_width_input,
-    set_oscillation_direction,
-    set_oscillation_width,
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from blowcontrol.commands._parse import parse_int_input
+from blowcontrol.utils import json_codec, parse_boolean
+
+# Defaults for missing [previous, current] state pairs in listen output
+_UNKNOWN = ("UNKNOWN", "UNKNOWN")
+_OFF = ("OFF", "OFF")
+_ZERO = ("0000", "0000")
+
+# (label, product-state key) lines shown for STATE-CHANGE, in display order;
+# CURRENT-STATE shows the first two
+_STATE_FIELDS = (
+    ("Power", "fpwr"),
+    ("Fan Speed", "fnsp"),
+    ("Auto Mode", "auto"),
+    ("Night Mode", "nmod"),
+    ("Oscillation", "oson"),
 )
-from blowcontrol.commands.power import set_power
-from blowcontrol.commands.sleep_timer import set_sleep_timer
-from blowcontrol.mqtt.client import DysonMQTTClient
-from blowcontrol.state.device_state import DeviceStatePrinter
-from blowcontrol.utils import parse_boolean
 
 
 def output_result(
@@ -37,55 +37,36 @@ def output_result(
         result = {"success": success, "message": message}
         if data:
             result.update(data)
-        print(json.dumps(result, indent=2))
+        # Indent for people; pipes and scripts get compact JSON
+        pretty = sys.stdout.isatty()
+        sys.stdout.write(json_codec.dumps(result, pretty) + "\n")
     else:
-        if success:
-            print(f"✓ {message}")
-        else:
-            print(f"✗ {message}")
+        sys.stdout.write(("✓ " if success else "✗ ") + message + "\n")
 
 
-def parse_int_input(value: Any) -> int:
+def _range_int(lo: int, hi: int, message: str) -> Callable[[Any], int]:
     """
-    Parse integer input from string or int.
-    Raises ValueError for invalid input.
+    Build a validator that parses int input and checks it lies in [lo, hi].
+    The returned function raises ValueError(message) for out-of-range values.
     """
-    if isinstance(value, str):
-        return int(value)
-    elif isinstance(value, int):
-        return value
-    else:
-        raise ValueError(f"Cannot convert {value} to integer")
 
+    def validate(value: Any) -> int:
+        number = value if type(value) is int else parse_int_input(value)
+        if lo <= number <= hi:
+            return number
+        raise ValueError(message)
 
-def validate_oscillation_heading(heading_input: Any) -> int:
-    """
-    Validate oscillation heading input.
-    Returns validated heading as int.
-    Raises ValueError for invalid input.
-    """
-    heading = parse_int_input(heading_input)
-    if not (0 <= heading <= 359):
-        raise ValueError("Heading must be between 0° and 359°")
-    return heading
+    return validate
 
 
-def validate_fan_speed_input(speed_input: Any) -> int:
-    """
-    Validate fan speed input.
-    Returns validated speed as int.
-    Raises ValueError for invalid input.
-    """
-    speed = parse_int_input(speed_input)
-    if not (0 <= speed <= 10):
-        raise ValueError("Fan speed must be between 0 and 10")
-    return speed
+# Validate CLI input, returning the value as int or raising ValueError
+validate_oscillation_heading = _range_int(0, 359, "Heading must be between 0° and 359°")
+validate_fan_speed_input = _range_int(0, 10, "Fan speed must be between 0 and 10")
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="BlowControl - Control Dyson fans via MQTT",
-        epilog="""
+_DESCRIPTION = "BlowControl - Control Dyson fans via MQTT"
+
+_EPILOG = """
 EXAMPLES:
   # Basic control
   blowcontrol power on                    # Turn fan on
@@ -117,7 +98,44 @@ CONFIGURATION:
 EXIT CODES:
   0  Success
   1  Error (invalid input, connection failure, etc.)
-        """,
+        """
+
+# One-line help per subcommand, shared by argparse and the minimal help
+_COMMAND_HELP: Dict[str, str] = {
+    "power": "Turn device power ON or OFF",
+    "auto": "Enable or disable auto mode",
+    "night": "Enable or disable night mode",
+    "speed": "Set fan speed (0-10)",
+    "timer": "Set sleep timer",
+    "listen": "Monitor device status in real-time",
+    "batch": "Run several commands from stdin over one connection",
+    "state": "Fetch current device state",
+    "width": "Set oscillation width",
+    "direction": "Set oscillation direction",
+}
+
+
+def _print_minimal_help() -> None:
+    """Print top-level help without building the argparse parser."""
+    width = max(map(len, _COMMAND_HELP))
+    lines = [
+        "usage: blowcontrol [-h] [--debug] <command> ...",
+        "",
+        _DESCRIPTION,
+        "",
+        "commands:",
+    ]
+    lines.extend(f"  {name:<{width}}  {text}" for name, text in _COMMAND_HELP.items())
+    lines.append("")
+    lines.append("Run 'blowcontrol <command> --help' for command options.")
+    sys.stdout.write("\n".join(lines) + "\n" + _EPILOG.rstrip() + "\n")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the full argparse parser, used for command help and unusual argv."""
+    parser = argparse.ArgumentParser(
+        description=_DESCRIPTION,
+        epilog=_EPILOG,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument(
@@ -130,11 +148,13 @@ EXIT CODES:
     # Power command
     power_parser = subparsers.add_parser(
         "power",
-        help="Turn device power ON or OFF",
+        help=_COMMAND_HELP["power"],
         description="Control device power state. Accepts various boolean formats.",
     )
     power_parser.add_argument(
-        "state", help="Power state: on/off, true/false, 1/0, yes/no, y/n, t/f"
+        "value",
+        metavar="state",
+        help="Power state: on/off, true/false, 1/0, yes/no, y/n, t/f",
     )
     power_parser.add_argument(
         "--json",
@@ -145,14 +165,15 @@ EXIT CODES:
     # Auto mode command
     auto_parser = subparsers.add_parser(
         "auto",
-        help="Enable or disable auto mode",
+        help=_COMMAND_HELP["auto"],
         description=(
             "Auto mode automatically adjusts fan speed based on environmental "
             "conditions."
         ),
     )
     auto_parser.add_argument(
-        "state",
+        "value",
+        metavar="state",
         help="Auto mode state: on/off, true/false, 1/0, yes/no, y/n, t/f",
     )
     auto_parser.add_argument(
@@ -162,11 +183,12 @@ EXIT CODES:
     # Night mode command
     night_parser = subparsers.add_parser(
         "night",
-        help="Enable or disable night mode",
+        help=_COMMAND_HELP["night"],
         description="Night mode reduces noise and airflow for quiet operation.",
     )
     night_parser.add_argument(
-        "state",
+        "value",
+        metavar="state",
         help="Night mode state: on/off, true/false, 1/0, yes/no, y/n, t/f",
     )
     night_parser.add_argument(
@@ -176,26 +198,28 @@ EXIT CODES:
     # Fan speed command
     fan_parser = subparsers.add_parser(
         "speed",
-        help="Set fan speed (0-10)",
+        help=_COMMAND_HELP["speed"],
         description=(
             "Set fan speed from 0 (off) to 10 (maximum). Speed 0 will power "
             "off the fan."
         ),
     )
-    fan_parser.add_argument("speed", help="Fan speed: 0-10 (0 = off, 10 = maximum)")
+    fan_parser.add_argument(
+        "value", metavar="speed", help="Fan speed: 0-10 (0 = off, 10 = maximum)"
+    )
     fan_parser.add_argument("--json", action="store_true", help="Output result as JSON")
 
     # Sleep timer command
     sleep_parser = subparsers.add_parser(
         "timer",
-        help="Set sleep timer",
+        help=_COMMAND_HELP["timer"],
         description=(
             "Set sleep timer to automatically turn off the device. Range: "
             "0-540 minutes."
         ),
     )
     sleep_parser.add_argument(
-        "minutes",
+        "value",
         type=str,
         metavar="TIME",
         help="Timer duration: 90, 2h15m, 2:15, 1h, 45m, 0 (off)",
@@ -207,7 +231,7 @@ EXIT CODES:
     # Listen command
     listen_parser = subparsers.add_parser(
         "listen",
-        help="Monitor device status in real-time",
+        help=_COMMAND_HELP["listen"],
         description=(
             "Listen for MQTT status updates and display them in real-time. "
             "Press Ctrl+C to stop."
@@ -216,13 +240,32 @@ EXIT CODES:
     listen_parser.add_argument(
         "--json",
         action="store_true",
-        help="Output raw JSON messages instead of formatted text",
+        help="Output each message as indented JSON instead of formatted text",
     )
+    listen_parser.add_argument(
+        "--raw",
+        dest="value",
+        action="store_const",
+        const="raw",
+        help="Print each payload exactly as received, without re-encoding",
+    )
+
+    # Batch command
+    subparsers.add_parser(
+        "batch",
+        help=_COMMAND_HELP["batch"],
+        description=(
+            "Read one command per line from stdin (e.g. 'power on', 'speed 5') "
+            "and run them in order over a single MQTT connection. Blank lines "
+            "and lines starting with # are ignored. Exits 1 if any command "
+            "failed."
+        ),
+    ).add_argument("--json", action="store_true", help="Output results as JSON")
 
     # Get state command
     state_parser = subparsers.add_parser(
         "state",
-        help="Fetch current device state",
+        help=_COMMAND_HELP["state"],
         description=(
             "Retrieve and display the current device state including power, "
             "speed, modes, and environmental data."
@@ -237,7 +280,7 @@ EXIT CODES:
     # Width command (oscillation width)
     width_parser = subparsers.add_parser(
         "width",
-        help="Set oscillation width",
+        help=_COMMAND_HELP["width"],
         description=(
             "Set oscillation width centered on current position. Can use "
             "numeric values or named presets."
@@ -245,7 +288,9 @@ EXIT CODES:
         aliases=["oscillation_width"],
     )
     width_parser.add_argument(
-        "width", help="Width: 0,45,90,180,350 or off,narrow,medium,wide,full"
+        "value",
+        metavar="width",
+        help="Width: 0,45,90,180,350 or off,narrow,medium,wide,full",
     )
     width_parser.add_argument(
         "--json", action="store_true", help="Output result as JSON"
@@ -254,315 +299,399 @@ EXIT CODES:
     # Direction command
     direction_parser = subparsers.add_parser(
         "direction",
-        help="Set oscillation direction",
+        help=_COMMAND_HELP["direction"],
         description=(
             "Set oscillation direction while preserving current width. "
             "Direction is in degrees."
         ),
     )
-    direction_parser.add_argument("direction", help="Direction in degrees: 0-359")
+    direction_parser.add_argument(
+        "value", metavar="direction", help="Direction in degrees: 0-359"
+    )
     direction_parser.add_argument(
         "--json", action="store_true", help="Output result as JSON"
     )
+    return parser
 
-    # Parse arguments
-    args = parser.parse_args()
 
-    # Configure logging based on debug flag
-    if args.debug:
-        logging.basicConfig(level=logging.INFO)
-    else:
-        # Suppress MQTT client logs unless debugging
-        logging.basicConfig(level=logging.WARNING)
-        logging.getLogger("blowcontrol.mqtt.client").setLevel(logging.WARNING)
+# (success, message, extra JSON fields) for output_result, or None when the
+# handler has already written its own output
+Outcome = Optional[Tuple[bool, str, Optional[Dict[str, Any]]]]
 
-    try:
-        if args.command == "power":
-            try:
-                # Validate input first
-                parse_boolean(args.state)  # This will raise ValueError if invalid
-                success = set_power(args.state)
-                output_result(
-                    success,
-                    f"Power set to {args.state.upper()}",
-                    json_mode=args.json,
-                )
-            except ValueError as e:
-                output_result(False, f"Invalid power state: {e}", json_mode=args.json)
-                sys.exit(1)
-            except Exception as e:
-                output_result(False, f"Failed to set power: {e}", json_mode=args.json)
-                sys.exit(1)
-        elif args.command == "auto":
-            try:
-                # Validate input first
-                parse_boolean(args.state)  # This will raise ValueError if invalid
-                success = set_auto_mode(args.state)
-                output_result(
-                    success,
-                    f"Auto mode set to {args.state.upper()}",
-                    json_mode=args.json,
-                )
-            except ValueError as e:
-                output_result(
-                    False, f"Invalid auto mode state: {e}", json_mode=args.json
-                )
-                sys.exit(1)
-            except Exception as e:
-                output_result(
-                    False, f"Failed to set auto mode: {e}", json_mode=args.json
-                )
-                sys.exit(1)
-        elif args.command == "night":
-            try:
-                # Validate input first
-                parse_boolean(args.state)  # This will raise ValueError if invalid
-                success = set_night_mode(args.state)
-                output_result(
-                    success,
-                    f"Night mode set to {args.state.upper()}",
-                    json_mode=args.json,
-                )
-            except ValueError as e:
-                output_result(
-                    False,
-                    f"Invalid night mode state: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
-            except Exception as e:
-                output_result(
-                    False,
-                    f"Failed to set night mode: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
-        elif args.command == "speed":
-            try:
-                validated_speed = validate_fan_speed_input(args.speed)
-                success = set_fan_speed(validated_speed)
-                output_result(
-                    success,
-                    f"Fan speed set to {validated_speed}",
-                    json_mode=args.json,
-                )
-            except ValueError as e:
-                output_result(False, f"Invalid fan speed: {e}", json_mode=args.json)
-                sys.exit(1)
-            except Exception as e:
-                output_result(
-                    False, f"Failed to set fan speed: {e}", json_mode=args.json
-                )
-                sys.exit(1)
-        elif args.command == "timer":
-            try:
-                success = set_sleep_timer(args.minutes)
-                output_result(
-                    success,
-                    f"Sleep timer set to {args.minutes}",
-                    json_mode=args.json,
-                )
-            except ValueError as e:
-                output_result(False, f"Invalid timer value: {e}", json_mode=args.json)
-                sys.exit(1)
-            except Exception as e:
-                output_result(
-                    False,
-                    f"Failed to set sleep timer: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
-        elif args.command == "listen":
-            try:
-                client = DysonMQTTClient(client_id="d2mqtt-listen")
-                client.connect()
-
-                def pretty_callback(client_: Any, userdata: Any, msg: Any) -> None:
-                    """Pretty print MQTT messages."""
-                    try:
-                        data = json.loads(msg.payload.decode(errors="replace"))
-                        if args.json:
-                            print(json.dumps(data, indent=2))
-                        else:
-                            if data.get("msg") == "STATE-CHANGE":
-                                print(
-                                    f"\n📊 State Change at {data.get('time', 'unknown')}"
-                                )
-                                if "product-state" in data:
-                                    state = data["product-state"]
-                                    print(
-                                        f"  Power: {state.get('fpwr', ['UNKNOWN'])[1]}"
-                                    )
-                                    print(
-                                        f"  Fan Speed: {state.get('fnsp', ['UNKNOWN'])[1]}"
-                                    )
-                                    print(
-                                        f"  Auto Mode: {state.get('auto', ['UNKNOWN'])[1]}"
-                                    )
-                                    print(
-                                        f"  Night Mode: {state.get('nmod', ['UNKNOWN'])[1]}"
-                                    )
-                                    print(
-                                        f"  Oscillation: {state.get('oson', ['UNKNOWN'])[1]}"
-                                    )
-                                    if state.get("oson", ["OFF"])[1] == "ON":
-                                        osal = state.get("osal", ["0000"])[1]
-                                        osau = state.get("osau", ["0000"])[1]
-                                        info = get_oscillation_info(osal, osau)
-                                        print(f"  Oscillation Width: {info['width']}°")
-                                        print(
-                                            f"  Oscillation Heading: {info['heading']}°"
-                                        )
-                                    print(
-                                        f"  Sleep Timer: {state.get('sltm', ['UNKNOWN'])[1]}"
-                                    )
-                            elif data.get("msg") == "LOCATION":
-                                print(f"\n📍 Location: {data.get('apos', 'unknown')}°")
-                            elif data.get("msg") == "CURRENT-STATE":
-                                print("\n📋 Current State Response")
-                                if "product-state" in data:
-                                    state = data["product-state"]
-                                    print(
-                                        f"  Power: {state.get('fpwr', ['UNKNOWN'])[1]}"
-                                    )
-                                    print(
-                                        f"  Fan Speed: {state.get('fnsp', ['UNKNOWN'])[1]}"
-                                    )
-                            else:
-                                print(f"\n📨 Message: {data.get('msg', 'unknown')}")
-                    except Exception as e:
-                        print(f"Error parsing message: {e}")
-
-                def json_callback(client_: Any, userdata: Any, msg: Any) -> None:
-                    """Output raw JSON MQTT messages."""
-                    try:
-                        data = json.loads(msg.payload.decode(errors="replace"))
-                        print(json.dumps(data, indent=2))
-                    except Exception as e:
-                        print(f"Error parsing message: {e}")
-
-                callback = json_callback if args.json else pretty_callback
-
-                client.subscribe_and_listen(
-                    ["status/current", "status/fault"], callback
-                )
-            except KeyboardInterrupt:
-                print("\n👋 Stopping listener...")
-                client.disconnect()
-            except Exception as e:
-                output_result(
-                    False,
-                    f"Failed to start listener: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
-        elif args.command == "state":
-            try:
-                import asyncio
 
-                from blowcontrol.mqtt.async_client import async_get_state
+def _handle_power(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.power import set_power
 
-                async def run_async_get_state() -> Optional[Dict[str, Any]]:
-                    """Async function to get device state."""
-                    return await async_get_state()
+    parsed = parse_boolean(value)
+    return set_power(parsed), f"Power set to {'ON' if parsed else 'OFF'}", None
 
-                state = asyncio.run(run_async_get_state())
-                if args.json:
-                    print(json.dumps(state, indent=2))
-                else:
-                    if state and "state" in state:
-                        DeviceStatePrinter.print_current_state(state["state"])
-                        if "environmental" in state:
-                            DeviceStatePrinter.print_environmental(
-                                state["environmental"]
-                            )
-                    else:
-                        print("No state received from device.")
-            except Exception as e:
-                output_result(False, f"Failed to get state: {e}", json_mode=args.json)
-                sys.exit(1)
-        elif args.command == "width":
+
+def _handle_auto(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.auto_mode import set_auto_mode
+
+    parsed = parse_boolean(value)
+    return set_auto_mode(parsed), f"Auto mode set to {'ON' if parsed else 'OFF'}", None
+
+
+def _handle_night(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.night_mode import set_night_mode
+
+    parsed = parse_boolean(value)
+    return (
+        set_night_mode(parsed),
+        f"Night mode set to {'ON' if parsed else 'OFF'}",
+        None,
+    )
+
+
+def _handle_speed(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.fan_speed import set_fan_speed
+
+    speed = validate_fan_speed_input(value)
+    return set_fan_speed(speed), f"Fan speed set to {speed}", None
+
+
+def _handle_timer(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.sleep_timer import set_sleep_timer
+
+    return set_sleep_timer(value), f"Sleep timer set to {value}", None
+
+
+def _on_state_change(data: Dict[str, Any]) -> None:
+    """Print a STATE-CHANGE message from the listen stream."""
+    lines = [f"\n📊 State Change at {data.get('time', 'unknown')}"]
+    if "product-state" in data:
+        sg = data["product-state"].get
+        lines += [f"  {label}: {sg(key, _UNKNOWN)[1]}" for label, key in _STATE_FIELDS]
+        if sg("oson", _OFF)[1] == "ON":
+            from blowcontrol.commands.oscillation import get_oscillation_info
+
+            info = get_oscillation_info(sg("osal", _ZERO)[1], sg("osau", _ZERO)[1])
+            lines.append(f"  Oscillation Width: {info['width']}°")
+            lines.append(f"  Oscillation Heading: {info['heading']}°")
+        lines.append(f"  Sleep Timer: {sg('sltm', _UNKNOWN)[1]}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _on_location(data: Dict[str, Any]) -> None:
+    """Print a LOCATION message from the listen stream."""
+    print(f"\n📍 Location: {data.get('apos', 'unknown')}°")
+
+
+def _on_current_state(data: Dict[str, Any]) -> None:
+    """Print a CURRENT-STATE message from the listen stream."""
+    lines = ["\n📋 Current State Response"]
+    if "product-state" in data:
+        sg = data["product-state"].get
+        lines += [
+            f"  {label}: {sg(key, _UNKNOWN)[1]}" for label, key in _STATE_FIELDS[:2]
+        ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+# Listen message type -> formatter
+_LISTEN_HANDLERS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "STATE-CHANGE": _on_state_change,
+    "LOCATION": _on_location,
+    "CURRENT-STATE": _on_current_state,
+}
+
+
+def _handle_listen(value: Optional[str], json_mode: bool) -> Outcome:
+    import queue
+    import threading
+
+    try:
+        from blowcontrol.mqtt.client import DysonMQTTClient
+
+        client = DysonMQTTClient(client_id="d2mqtt-listen")
+        client.connect()
+
+        def print_pretty(
+            payload: bytes,
+            _loads: Callable[[bytes], Any] = json_codec.loads,
+            _handlers: Dict[str, Callable[[Dict[str, Any]], None]] = _LISTEN_HANDLERS,
+        ) -> None:
+            """Pretty print an MQTT message."""
             try:
-                # Validate width input
-                try:
-                    parsed_width = parse_width_input(args.width)
-                    if parsed_width not in VALID_WIDTHS:
-                        valid_names = ", ".join([f"{w}°" for w in VALID_WIDTHS])
-                        raise ValueError(
-                            f"Width {parsed_width}° is not a valid Dyson step. "
-                            f"Valid widths: {valid_names}"
-                        )
-                except ValueError as e:
-                    output_result(
-                        False, f"Invalid width input: {e}", json_mode=args.json
-                    )
-                    sys.exit(1)
-
-                result = set_oscillation_width(args.width)
-                if result["success"]:
-                    width_name = WIDTH_DISPLAY_NAMES.get(
-                        result["actual_width"], f"{result['actual_width']}°"
-                    )
-                    message = f"Oscillation width set to {width_name}"
-                    if result.get("adjusted"):
-                        message += f" (adjusted from {result.get('requested_width', 'unknown')})"
-                    output_result(True, message, result, json_mode=args.json)
+                data = _loads(payload)
+                handler = _handlers.get(data.get("msg"))
+                if handler is not None:
+                    handler(data)
                 else:
-                    output_result(
-                        False,
-                        f"Failed to set oscillation width: "
-                        f"{result.get('error', 'Unknown error')}",
-                        result,
-                        json_mode=args.json,
-                    )
-                    sys.exit(1)
+                    print(f"\n📨 Message: {data.get('msg', 'unknown')}")
             except Exception as e:
-                output_result(
-                    False,
-                    f"Failed to set oscillation width: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
-        elif args.command == "direction":
+                print(f"Error parsing message: {e}")
+
+        def print_json(payload: bytes, _pretty: bool = sys.stdout.isatty()) -> None:
+            """Output an MQTT message as JSON, indented on a terminal."""
             try:
-                # Validate heading input
-                try:
-                    validated_heading = validate_oscillation_heading(args.direction)
-                except ValueError as e:
-                    output_result(
-                        False,
-                        f"Invalid direction input: {e}",
-                        json_mode=args.json,
-                    )
-                    sys.exit(1)
-
-                result = set_oscillation_direction(validated_heading)
-                if result["success"]:
-                    message = (
-                        f"Oscillation direction set to {validated_heading}° "
-                        f"(adjusted from {result.get('requested_heading', 'unknown')})"
-                    )
-                    if result.get("adjusted"):
-                        message += f" (adjusted from {result.get('original_heading', 'unknown')}°)"
-                    output_result(True, message, result, json_mode=args.json)
-                else:
-                    output_result(
-                        False,
-                        f"Failed to set oscillation direction: {result.get('error', 'Unknown error')}",
-                        result,
-                        json_mode=args.json,
-                    )
-                    sys.exit(1)
+                print(json_codec.dumps(json_codec.loads(payload), _pretty))
             except Exception as e:
-                output_result(
-                    False,
-                    f"Failed to set oscillation direction: {e}",
-                    json_mode=args.json,
-                )
-                sys.exit(1)
+                print(f"Error parsing message: {e}")
+
+        def print_raw(payload: bytes) -> None:
+            """Output an MQTT payload verbatim."""
+            print(payload.decode(errors="replace"))
+
+        if value == "raw":
+            printer = print_raw
+        elif json_mode:
+            printer = print_json
+        else:
+            printer = print_pretty
+
+        # Formatting runs on a worker thread so a slow terminal or pipe never
+        # stalls the paho network loop; None tells the worker to stop.
+        payloads: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+
+        def drain(
+            _get: Callable[[], Optional[bytes]] = payloads.get,
+            _printer: Callable[[bytes], None] = printer,
+        ) -> None:
+            while True:
+                payload = _get()
+                if payload is None:
+                    return
+                _printer(payload)
+
+        # Runs on the paho network thread; bind the queue's put as a local
+        def enqueue(
+            client_: Any,
+            userdata: Any,
+            msg: Any,
+            _put: Callable[[Optional[bytes]], None] = payloads.put,
+        ) -> None:
+            _put(msg.payload)
+
+        worker = threading.Thread(target=drain, name="blowcontrol-listen", daemon=True)
+        worker.start()
+        try:
+            client.subscribe_and_listen(["status/current", "status/fault"], enqueue)
+        finally:
+            payloads.put(None)
+            worker.join()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping listener...")
+        client.disconnect()
+    return None
+
+
+def _handle_state(value: Optional[str], json_mode: bool) -> Outcome:
+    from blowcontrol.mqtt.async_client import get_state_sync
+    from blowcontrol.state.device_state import DeviceStatePrinter
+
+    state = get_state_sync()
+    if json_mode:
+        print(json_codec.dumps(state, sys.stdout.isatty()))
+    elif state and "state" in state:
+        DeviceStatePrinter.print_current_state(state["state"])
+        if "environmental" in state:
+            DeviceStatePrinter.print_environmental(state["environmental"])
+    else:
+        print("No state received from device.")
+    return None
 
+
+def _oscillation_data(result: Any) -> Dict[str, Any]:
+    """Return an oscillation result's fields, leaving out an unset message."""
+    data: Dict[str, Any] = result.to_dict()
+    if data["message"] is None:
+        del data["message"]
+    return data
+
+
+def _handle_width(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.oscillation import (
+        VALID_WIDTHS,
+        VALID_WIDTHS_SORTED,
+        WIDTH_DISPLAY_NAMES,
+        parse_width_input,
+        set_oscillation_width,
+    )
+
+    parsed_width = parse_width_input(value)
+    if parsed_width not in VALID_WIDTHS:
+        valid_names = ", ".join([f"{w}°" for w in VALID_WIDTHS_SORTED])
+        raise ValueError(
+            f"Width {parsed_width}° is not a valid Dyson step. "
+            f"Valid widths: {valid_names}"
+        )
+
+    result = set_oscillation_width(value)
+    if not result.success:
+        return (
+            False,
+            f"Failed to set oscillation width: {result.error or 'Unknown error'}",
+            _oscillation_data(result),
+        )
+    width_name = WIDTH_DISPLAY_NAMES.get(result.actual_width, f"{result.actual_width}°")
+    message = f"Oscillation width set to {width_name}"
+    if result.adjusted:
+        message += f" (adjusted from {result.requested_width or 'unknown'})"
+    return True, message, _oscillation_data(result)
+
+
+def _handle_direction(value: str, json_mode: bool) -> Outcome:
+    from blowcontrol.commands.oscillation import set_oscillation_direction
+
+    validated_heading = validate_oscillation_heading(value)
+    result = set_oscillation_direction(validated_heading)
+    if not result.success:
+        return (
+            False,
+            f"Failed to set oscillation direction: {result.error or 'Unknown error'}",
+            _oscillation_data(result),
+        )
+    requested = result.requested_heading
+    message = (
+        f"Oscillation direction set to {validated_heading}° "
+        f"(adjusted from {'unknown' if requested is None else requested})"
+    )
+    if result.adjusted:
+        message += f" (adjusted from {result.original_heading}°)"
+    return True, message, _oscillation_data(result)
+
+
+# Commands that cannot run inside a batch
+_BATCH_EXCLUDED = frozenset(("batch", "listen"))
+
+
+def _handle_batch(value: Optional[str], json_mode: bool) -> Outcome:
+    import shlex
+
+    failed = False
+    for line in sys.stdin:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parsed = _fast_parse_args(shlex.split(line))
+        if parsed is None or parsed[0] in _BATCH_EXCLUDED:
+            output_result(False, f"Invalid batch command: {line}", json_mode=json_mode)
+            failed = True
+            continue
+        command, line_value, line_json, _ = parsed
+        # Every handler publishes on the same pooled client
+        if not _dispatch(command, line_value, json_mode or line_json):
+            failed = True
+    if failed:
+        sys.exit(1)
+    return None
+
+
+class _Command(NamedTuple):
+    """A CLI subcommand and how to report its errors."""
+
+    handler: Callable[[Any, bool], Outcome]
+    takes_value: bool
+    action: str  # "Failed to <action>: ..."
+    invalid: Optional[str] = None  # "Invalid <invalid>: ..." for ValueError
+
+
+COMMANDS: Dict[str, _Command] = {
+    "power": _Command(_handle_power, True, "set power", "power state"),
+    "auto": _Command(_handle_auto, True, "set auto mode", "auto mode state"),
+    "night": _Command(_handle_night, True, "set night mode", "night mode state"),
+    "speed": _Command(_handle_speed, True, "set fan speed", "fan speed"),
+    "timer": _Command(_handle_timer, True, "set sleep timer", "timer value"),
+    "listen": _Command(_handle_listen, False, "start listener"),
+    "state": _Command(_handle_state, False, "get state"),
+    "width": _Command(_handle_width, True, "set oscillation width", "width input"),
+    "oscillation_width": _Command(
+        _handle_width, True, "set oscillation width", "width input"
+    ),
+    "direction": _Command(
+        _handle_direction, True, "set oscillation direction", "direction input"
+    ),
+    "batch": _Command(_handle_batch, False, "run batch"),
+}
+
+
+def _dispatch(command: str, value: Optional[str], json_mode: bool) -> bool:
+    """
+    Run one command and report its outcome.
+
+    Returns False if the input was invalid, the command raised, or it reported
+    failure; True otherwise.
+    """
+    spec = COMMANDS[command]
+    try:
+        outcome = spec.handler(value, json_mode)
+    except ValueError as e:
+        if spec.invalid is None:
+            output_result(False, f"Failed to {spec.action}: {e}", json_mode=json_mode)
         else:
-            print(f"Error: Unknown command '{args.command}'")
+            output_result(False, f"Invalid {spec.invalid}: {e}", json_mode=json_mode)
+        return False
+    except Exception as e:
+        output_result(False, f"Failed to {spec.action}: {e}", json_mode=json_mode)
+        return False
+    if outcome is None:
+        return True
+    success, message, data = outcome
+    output_result(success, message, data, json_mode=json_mode)
+    return success
+
+
+def _fast_parse_args(
+    argv: List[str],
+) -> Optional[Tuple[str, Optional[str], bool, bool]]:
+    """
+    Parse the common ``[--debug] <command> [value] [--json]`` shape without
+    building the argparse parser.
+
+    Returns (command, value, json_mode, debug), or None if argv needs the full
+    parser (help, unknown commands or options, wrong argument count).
+    """
+    debug = False
+    json_mode = False
+    positionals = []
+    for arg in argv:
+        if arg == "--json":
+            json_mode = True
+        elif arg == "--debug":
+            debug = True
+        elif arg.startswith("-"):
+            return None
+        else:
+            positionals.append(arg)
+
+    if not positionals or positionals[0] not in COMMANDS:
+        return None
+    takes_value = COMMANDS[positionals[0]].takes_value
+    if len(positionals) != (2 if takes_value else 1):
+        return None
+    value = positionals[1] if takes_value else None
+    return positionals[0], value, json_mode, debug
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if not argv or argv == ["-h"] or argv == ["--help"]:
+        _print_minimal_help()
+        sys.exit(0)
+
+    fast_args = _fast_parse_args(argv)
+    if fast_args is not None:
+        command, value, json_mode, debug = fast_args
+    else:
+        args = _build_parser().parse_args(argv)
+        command = args.command
+        value = getattr(args, "value", None)
+        json_mode = args.json
+        debug = args.debug
+
+    # Configure logging based on debug flag; without --debug the root level
+    # alone suppresses MQTT client INFO logs
+    root = logging.getLogger()
+    root.setLevel(logging.INFO if debug else logging.WARNING)
+    if debug and not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root.addHandler(handler)
+
+    try:
+        if not _dispatch(command, value, json_mode):
             sys.exit(1)
     except KeyboardInterrupt:
         print("\n👋 Interrupted by user")
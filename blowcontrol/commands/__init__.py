@@ -12,16 +12,36 @@ Available Commands:
     - oscillation: Control oscillation with width/direction model
 """
 
-from .auto_mode import set_auto_mode
-from .fan_speed import set_fan_speed
-from .night_mode import set_night_mode
-from .oscillation import (
-    set_oscillation_angles,
-    set_oscillation_direction,
-    set_oscillation_width,
-)
-from .power import request_current_state, set_power
-from .sleep_timer import set_sleep_timer
+from typing import TYPE_CHECKING
+
+from blowcontrol._lazy import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .auto_mode import set_auto_mode
+    from .fan_speed import set_fan_speed
+    from .night_mode import set_night_mode
+    from .oscillation import (
+        OscillationResult,
+        set_oscillation_angles,
+        set_oscillation_direction,
+        set_oscillation_width,
+    )
+    from .power import request_current_state, set_power
+    from .sleep_timer import set_sleep_timer
+
+# Public name -> submodule that defines it, imported on first access
+_LAZY_ATTRS = {
+    "set_auto_mode": ".auto_mode",
+    "set_fan_speed": ".fan_speed",
+    "set_night_mode": ".night_mode",
+    "OscillationResult": ".oscillation",
+    "set_oscillation_angles": ".oscillation",
+    "set_oscillation_direction": ".oscillation",
+    "set_oscillation_width": ".oscillation",
+    "request_current_state": ".power",
+    "set_power": ".power",
+    "set_sleep_timer": ".sleep_timer",
+}
 
 __all__ = [
     "set_power",
@@ -33,4 +53,8 @@ __all__ = [
     "set_oscillation_angles",
     "set_oscillation_width",
     "set_oscillation_direction",
+    "OscillationResult",
 ]
+
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, globals(), _LAZY_ATTRS)
@@ -0,0 +1,22 @@
+"""
+Input parsing helpers shared by the command modules.
+"""
+
+from typing import Any
+
+
+def parse_int_input(value: Any) -> int:
+    """
+    Parse integer input from string or int.
+    Raises ValueError for invalid input.
+
+    Plain ints (the usual case after argparse) are returned as-is; bools are
+    still accepted as the int subtype they are.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    raise ValueError(f"Cannot convert {value} to integer")
@@ -3,15 +3,19 @@ Auto mode command module for Dyson2MQTT app.
 """
 
 import logging
-from typing import Union
+from typing import Optional, Union
 
 from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.mqtt.pool import get_pooled_client
+from blowcontrol.state.cache import invalidate_state_cache
 from blowcontrol.utils import parse_boolean
 
 logger = logging.getLogger(__name__)
 
 
-def set_auto_mode(on: Union[bool, str, int]) -> bool:
+def set_auto_mode(
+    on: Union[bool, str, int], client: Optional[DysonMQTTClient] = None
+) -> bool:
     """
     Set the Dyson device auto mode ON or OFF via MQTT.
 
@@ -19,6 +23,7 @@ def set_auto_mode(on: Union[bool, str, int]) -> bool:
         on: Boolean value or string representation. Supports:
             - True/False, "true"/"false", "t"/"f"
             - "1"/"0", "on"/"off", "yes"/"no", "y"/"n"
+        client: Connected client to publish on (default: the pooled client)
 
     Returns True if successful, False otherwise.
     """
@@ -26,11 +31,10 @@ def set_auto_mode(on: Union[bool, str, int]) -> bool:
         # Parse flexible boolean input
         auto_on = parse_boolean(on)
 
-        client = DysonMQTTClient(client_id="d2mqtt-cmd")
-        client.connect()
+        client = client or get_pooled_client()
         client.set_boolean_state("auto", auto_on)
-        client.disconnect()
+        invalidate_state_cache()
         return True
     except Exception as e:
-        logger.error(f"Failed to set auto mode: {e}")
+        logger.error("Failed to set auto mode: %s", e)
         return False
@@ -3,25 +3,18 @@ Fan speed command module for Dyson2MQTT app.
 """
 
 import logging
-from typing import Any, Union
+from typing import Any, Optional, Union
 
+from blowcontrol.commands._parse import parse_int_input
 from blowcontrol.commands.power import set_power
 from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.mqtt.pool import get_pooled_client
+from blowcontrol.state.cache import invalidate_state_cache, peek_state_cached
 
 logger = logging.getLogger(__name__)
 
-
-def parse_int_input(value: Any) -> int:
-    """
-    Parse integer input from string or int.
-    Raises ValueError for invalid input.
-    """
-    if isinstance(value, str):
-        return int(value)
-    elif isinstance(value, int):
-        return value
-    else:
-        raise ValueError(f"Cannot convert {value} to integer")
+# 4-digit zero-padded strings for every valid speed, e.g. FANSP_STR[5] == "0005"
+FANSP_STR = tuple(f"{i:04d}" for i in range(11))
 
 
 def validate_fan_speed(speed: Union[int, str, Any]) -> int:
@@ -34,12 +27,15 @@ def validate_fan_speed(speed: Union[int, str, Any]) -> int:
     return speed_int
 
 
-def set_fan_speed(speed: Union[int, str]) -> bool:
+def set_fan_speed(
+    speed: Union[int, str], client: Optional[DysonMQTTClient] = None
+) -> bool:
     """
     Set the Dyson device fan speed (0-10) via MQTT.
 
     Args:
         speed: Fan speed as integer or string (0-10). 0 will power off the fan.
+        client: Connected client to publish on (default: the pooled client)
 
     Returns True if successful, False otherwise.
     """
@@ -47,14 +43,26 @@ def set_fan_speed(speed: Union[int, str]) -> bool:
         validated_speed = validate_fan_speed(speed)
         if validated_speed == 0:
             # Speed 0 means turn off the fan
-            return set_power(False)
+            return set_power(False, client=client)
+
+        speed_str = FANSP_STR[validated_speed]
+
+        # Skip the publish if a fresh cached state shows the fan already
+        # running at this speed
+        state_result = peek_state_cached()
+        if state_result:
+            product_state = state_result["state"].get("product-state") or {}
+            if (
+                product_state.get("fpwr") == "ON"
+                and product_state.get("fnsp") == speed_str
+            ):
+                logger.debug("Fan speed already %s, skipping STATE-SET", speed_str)
+                return True
 
-        client = DysonMQTTClient(client_id="d2mqtt-cmd")
-        client.connect()
-        speed_str = f"{validated_speed:04d}"
+        client = client or get_pooled_client()
         client.set_numeric_state("fnsp", speed_str)
-        client.disconnect()
+        invalidate_state_cache()
         return True
     except Exception as e:
-        logger.error(f"Failed to set fan speed: {e}")
+        logger.error("Failed to set fan speed: %s", e)
         return False
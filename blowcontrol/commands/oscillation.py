@@ -2,30 +2,184 @@
 Oscillation command module for Dyson2MQTT app.
 """
 
+import bisect
 import logging
-from typing import Any, Dict, Optional, Union
-
-from blowcontrol.mqtt.client import DysonMQTTClient
+import sys
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple, Union
+
+from blowcontrol.commands._parse import parse_int_input
+from blowcontrol.mqtt.pool import get_pooled_client
+from blowcontrol.state.cache import (
+    get_state_cached,
+    invalidate_state_cache,
+    peek_state_cached,
+)
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
 
-def parse_int_input(value: Any) -> int:
+@dataclass(**_DATACLASS_OPTIONS)
+class OscillationResult:
     """
-    Parse integer input from string or int.
-    Raises ValueError for invalid input.
+    Outcome of an oscillation command.
+
+    Fields a command does not report keep their defaults; use to_dict() for
+    JSON output.
+    """
+
+    success: bool
+    actual_width: Optional[int] = None
+    actual_heading: Optional[int] = None
+    lower_angle: Optional[int] = None
+    upper_angle: Optional[int] = None
+    adjusted: bool = False
+    original_heading: Optional[int] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+    width_preserved: bool = False
+    current_width: Optional[int] = None
+    requested_heading: Optional[int] = None
+    oscillation_was_off: bool = False
+    width_adjusted: bool = False
+    requested_width: Any = None
+    adjusted_width: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict."""
+        return {name: getattr(self, name) for name in _RESULT_FIELDS}
+
+
+_RESULT_FIELDS = tuple(f.name for f in fields(OscillationResult))
+
+
+# 4-digit zero-padded strings for every valid angle, e.g. ANGLE_STR[54] == "0054"
+ANGLE_STR = tuple(f"{i:04d}" for i in range(360))
+
+# Constant parts of the oscillation STATE-SET payloads; treat as read-only
+_OSC_ON_TEMPLATE = {
+    "oscs": "ON",  # Enable oscillation
+    "oson": "ON",  # Turn on oscillation
+    "ancp": "CUST",  # Custom angle mode
+}
+_OSC_OFF_TEMPLATE = {
+    "oscs": "OFF",  # Disable oscillation
+    "oson": "OFF",  # Turn off oscillation
+}
+
+
+def _send_state_set(command_data: Dict[str, str]) -> bool:
+    """
+    Send an oscillation STATE-SET on the pooled client.
+
+    Skips the publish when a fresh cached state already matches every field
+    of the command, and invalidates the state cache after a successful send.
+    """
+    state_result = peek_state_cached()
+    if state_result:
+        product_state = state_result["state"].get("product-state") or {}
+        if all(product_state.get(k) == v for k, v in command_data.items()):
+            logger.debug("Device already matches %s, skipping STATE-SET", command_data)
+            return True
+
+    success = get_pooled_client().send_command("STATE-SET", command_data)
+    if success:
+        invalidate_state_cache()
+    return success
+
+
+def wrap360(x: int) -> int:
+    """Wrap an angle into 0-359, skipping the modulo when already in range."""
+    return x if 0 <= x < 360 else x % 360
+
+
+def angle_distance(a1: int, a2: int) -> int:
+    """Calculate the shortest angular distance between two angles."""
+    d = (a1 - a2) % 360
+    return d if d <= 180 else 360 - d
+
+
+def _fit_within_bounds(
+    width_int: int, heading_int: int
+) -> Tuple[int, int, int, Optional[str]]:
+    """
+    Fit an oscillation of the given width around a heading within 5°-355°.
+
+    Returns:
+        Tuple of (lower_angle, upper_angle, heading, adjustment_type), where
+        adjustment_type is None if the heading did not need adjusting
+
+    Raises:
+        ValueError: If the width cannot fit from any heading
     """
-    if isinstance(value, str):
-        return int(value)
-    elif isinstance(value, int):
-        return value
+    # Calculate lower and upper angles
+    half_width = width_int // 2
+    lower_angle = heading_int - half_width
+    upper_angle = heading_int + half_width
+
+    # Smart bounds adjustment: preserve width, adjust heading if needed
+    # Dyson's bounds protection: 5° minimum, 355° maximum
+
+    # Both angles already within 5°-355° (the common case) means no wrap-around
+    # and no adjustment; anything else would cross the forbidden zone or
+    # fall out of bounds
+    if 5 <= lower_angle and upper_angle <= 355:
+        return lower_angle, upper_angle, heading_int, None
+
+    # Try to find a valid heading that preserves the width
+    # First, check if the width itself is too large for any valid position
+    if width_int > 350:  # 355 - 5 = 350° maximum possible width
+        raise ValueError(
+            f"Width {width_int}° is too large. Maximum width is 350° (5° to 355°)."
+        )
+
+    # Find the best heading that keeps the full width within 5°-355°
+    # Strategy: try the closest valid positions to the original heading
+
+    # Option 1: Adjust heading so lower bound is exactly 5°
+    heading_option1 = wrap360(5 + half_width)
+    upper_option1 = wrap360(heading_option1 + half_width)
+
+    # Option 2: Adjust heading so upper bound is exactly 355°
+    heading_option2 = wrap360(355 - half_width)
+    lower_option2 = wrap360(heading_option2 - half_width)
+
+    # Choose the option closest to the original heading
+    dist1 = angle_distance(heading_int, heading_option1)
+    dist2 = angle_distance(heading_int, heading_option2)
+
+    # Validate both options and choose the closest valid one
+    # (option 1 wins a tie)
+    option1_valid = upper_option1 <= 355  # Lower bound at 5°
+    option2_valid = lower_option2 >= 5  # Upper bound at 355°
+
+    if option1_valid and (not option2_valid or dist1 <= dist2):
+        best_heading, adjustment_type = heading_option1, "lower bound"
+    elif option2_valid:
+        best_heading, adjustment_type = heading_option2, "upper bound"
     else:
-        raise ValueError(f"Cannot convert {value} to integer")
+        raise ValueError(
+            f"Width {width_int}° cannot fit within Dyson's bounds (5°-355°) from any heading. Try a smaller width."
+        )
+
+    # Recalculate with the adjusted heading
+    return (
+        wrap360(best_heading - half_width),
+        wrap360(best_heading + half_width),
+        best_heading,
+        adjustment_type,
+    )
 
 
 def set_oscillation_angles(
     width: Union[int, str], heading: Union[int, str] = 180
-) -> dict:
+) -> OscillationResult:
     """
     Set oscillation angles (width and heading) for the Dyson device.
 
@@ -34,7 +188,7 @@ def set_oscillation_angles(
         heading: Center direction in degrees (0-359, can be string or int)
 
     Returns:
-        Dict with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
+        OscillationResult with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
 
     Example:
         set_oscillation_angles(90, 180) → oscillates 135° to 225° (90° wide, center 180°)
@@ -45,16 +199,10 @@ def set_oscillation_angles(
         width_int = parse_int_input(width)
         heading_int = parse_int_input(heading)
     except ValueError as e:
-        return {
-            "success": False,
-            "error": f"Invalid input: {e}",
-            "actual_width": None,
-            "actual_heading": None,
-            "lower_angle": None,
-            "upper_angle": None,
-            "adjusted": False,
-            "original_heading": None,
-        }
+        return OscillationResult(
+            success=False,
+            error=f"Invalid input: {e}",
+        )
 
     # Validate inputs
     if width_int == 0:
@@ -62,53 +210,31 @@ def set_oscillation_angles(
         if not (0 <= heading_int <= 359):
             raise ValueError("Heading must be between 0° and 359°")
 
-        logger.info(f"Setting heading to {heading_int}° with no oscillation (width=0)")
+        logger.info("Setting heading to %s° with no oscillation (width=0)", heading_int)
 
         # Try using STATE-SET with angles but keep oscillation off
-        command_data = {
-            "osal": f"{heading_int:04d}",
-            "osau": f"{heading_int:04d}",
-            "oscs": "OFF",
-            "oson": "OFF",
-        }
+        angle = ANGLE_STR[heading_int]
+        command_data = {**_OSC_OFF_TEMPLATE, "osal": angle, "osau": angle}
 
         try:
-            client = DysonMQTTClient(client_id="d2mqtt-osc-heading")
-            success = client.send_standalone_command("STATE-SET", command_data)
-
-            if success:
-                return {
-                    "success": True,
-                    "actual_width": 0,
-                    "actual_heading": heading_int,
-                    "lower_angle": heading_int,
-                    "upper_angle": heading_int,
-                    "adjusted": False,
-                    "original_heading": None,
-                    "message": f"Set heading to {heading_int}° (no oscillation)",
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "Failed to set heading",
-                    "actual_width": None,
-                    "actual_heading": None,
-                    "lower_angle": None,
-                    "upper_angle": None,
-                    "adjusted": False,
-                    "original_heading": None,
-                }
+            if _send_state_set(command_data):
+                return OscillationResult(
+                    success=True,
+                    actual_width=0,
+                    actual_heading=heading_int,
+                    lower_angle=heading_int,
+                    upper_angle=heading_int,
+                    message=f"Set heading to {heading_int}° (no oscillation)",
+                )
+            return OscillationResult(
+                success=False,
+                error="Failed to set heading",
+            )
         except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error setting heading: {e}",
-                "actual_width": None,
-                "actual_heading": None,
-                "lower_angle": None,
-                "upper_angle": None,
-                "adjusted": False,
-                "original_heading": None,
-            }
+            return OscillationResult(
+                success=False,
+                error=f"Error setting heading: {e}",
+            )
 
     # Normal oscillation case (width >= 45)
     if not (45 <= width_int <= 350):
@@ -116,150 +242,81 @@ def set_oscillation_angles(
     if not (0 <= heading_int <= 359):
         raise ValueError("Heading must be between 0° and 359°")
 
-    # Calculate lower and upper angles
-    half_width = width_int // 2
-    lower_angle = (heading_int - half_width) % 360
-    upper_angle = (heading_int + half_width) % 360
+    # Smart bounds adjustment (precomputed for Dyson's width steps)
     original_heading = heading_int
+    entry = _OSC_TABLE.get((width_int, heading_int))
+    if entry is None:
+        entry = _fit_within_bounds(width_int, heading_int)
+    lower_angle, upper_angle, heading_int, adjustment_type = entry
 
-    # Smart bounds adjustment: preserve width, adjust heading if needed
-    # Dyson's bounds protection: 5° minimum, 355° maximum
-
-    # Check if we need to adjust the heading to stay within bounds
-    needs_adjustment = False
-
-    if lower_angle > upper_angle:
-        # Wrap-around case: would cross the forbidden zone
-        needs_adjustment = True
-    elif lower_angle < 5 or upper_angle > 355:
-        # Normal case but out of bounds
-        needs_adjustment = True
-
-    if needs_adjustment:
-        # Try to find a valid heading that preserves the width
-        # First, check if the width itself is too large for any valid position
-        if width_int > 350:  # 355 - 5 = 350° maximum possible width
-            raise ValueError(
-                f"Width {width_int}° is too large. Maximum width is 350° (5° to 355°)."
-            )
-
-        # Find the best heading that keeps the full width within 5°-355°
-        # Strategy: try the closest valid positions to the original heading
-
-        # Option 1: Adjust heading so lower bound is exactly 5°
-        heading_option1 = (5 + half_width) % 360
-        upper_option1 = (heading_option1 + half_width) % 360
-
-        # Option 2: Adjust heading so upper bound is exactly 355°
-        heading_option2 = (355 - half_width) % 360
-        lower_option2 = (heading_option2 - half_width) % 360
-
-        # Choose the option closest to the original heading
-        def angle_distance(a1: int, a2: int) -> int:
-            """Calculate the shortest angular distance between two angles."""
-            diff = abs(a1 - a2)
-            return min(diff, 360 - diff)
-
-        dist1 = angle_distance(original_heading, heading_option1)
-        dist2 = angle_distance(original_heading, heading_option2)
-
-        # Validate both options and choose the best one
-        valid_options = []
-
-        # Option 1: Lower bound at 5°
-        if upper_option1 <= 355:
-            valid_options.append((heading_option1, dist1, "lower bound"))
-
-        # Option 2: Upper bound at 355°
-        if lower_option2 >= 5:
-            valid_options.append((heading_option2, dist2, "upper bound"))
-
-        if not valid_options:
-            raise ValueError(
-                f"Width {width_int}° cannot fit within Dyson's bounds (5°-355°) from any heading. Try a smaller width."
-            )
-
-        # Choose the closest valid option
-        best_heading, best_distance, adjustment_type = min(
-            valid_options, key=lambda x: x[1]
-        )
-
-        # Recalculate with the adjusted heading
-        heading_int = best_heading
-        lower_angle = (heading_int - half_width) % 360
-        upper_angle = (heading_int + half_width) % 360
-
+    if adjustment_type:
         logger.warning(
-            f"Adjusted heading from {original_heading}° to {heading_int}° to fit width {width_int}° within bounds (adjusted {adjustment_type})"
+            "Adjusted heading from %s° to %s° to fit width %s° within bounds (adjusted %s)",
+            original_heading,
+            heading_int,
+            width_int,
+            adjustment_type,
         )
 
-    # Final validation - this should always pass now
-    if lower_angle > upper_angle or lower_angle < 5 or upper_angle > 355:
-        raise ValueError(
-            f"Internal error: failed to find valid heading for width {width_int}°"
-        )
-
-    # Handle wrap-around case (e.g., 350° to 10°) - only allowed if within
-    # bounds
-    if lower_angle > upper_angle:
-        logger.warning(
-            f"Wrap-around oscillation: {lower_angle}° to {upper_angle}° (width={width_int}°, heading={heading_int}°)"
-        )
+    # _fit_within_bounds only returns in-bounds, non-wrapping ranges
+    assert 5 <= lower_angle <= upper_angle <= 355, "bounds adjustment bug"
 
     logger.info(
-        f"Setting oscillation: width={width_int}°, heading={heading_int}° -> angles {lower_angle}°-{upper_angle}°"
+        "Setting oscillation: width=%s°, heading=%s° -> angles %s°-%s°",
+        width_int,
+        heading_int,
+        lower_angle,
+        upper_angle,
     )
 
     # Debug output
     if original_heading != heading_int:
         logger.info(
-            f"Heading was adjusted from {original_heading}° to {heading_int}° (lower: {lower_angle}°, upper: {upper_angle}°)"
+            "Heading was adjusted from %s° to %s° (lower: %s°, upper: %s°)",
+            original_heading,
+            heading_int,
+            lower_angle,
+            upper_angle,
         )
 
     # Format as 4-digit strings with leading zeros
-    osal = f"{lower_angle:04d}"
-    osau = f"{upper_angle:04d}"
+    osal = ANGLE_STR[lower_angle]
+    osau = ANGLE_STR[upper_angle]
 
     # Create the STATE-SET command
-    command_data = {
-        "oscs": "ON",  # Enable oscillation
-        "oson": "ON",  # Turn on oscillation
-        "osal": osal,  # Lower angle
-        "osau": osau,  # Upper angle
-        "ancp": "CUST",  # Custom angle mode
-    }
+    command_data = {**_OSC_ON_TEMPLATE, "osal": osal, "osau": osau}
 
     try:
-        client = DysonMQTTClient(client_id="d2mqtt-osc")
-        success = client.send_standalone_command("STATE-SET", command_data)
+        success = _send_state_set(command_data)
         if success:
             logger.info(
-                f"✅ Oscillation set: {lower_angle}°-{upper_angle}° (width={width_int}°, heading={heading_int}°)"
+                "✅ Oscillation set: %s°-%s° (width=%s°, heading=%s°)",
+                lower_angle,
+                upper_angle,
+                width_int,
+                heading_int,
             )
         else:
             logger.error("❌ Failed to send oscillation command")
 
-        return {
-            "success": success,
-            "actual_width": width_int,
-            "actual_heading": heading_int,
-            "lower_angle": lower_angle,
-            "upper_angle": upper_angle,
-            "adjusted": original_heading != heading_int,
-            "original_heading": original_heading,
-        }
+        return OscillationResult(
+            success=success,
+            actual_width=width_int,
+            actual_heading=heading_int,
+            lower_angle=lower_angle,
+            upper_angle=upper_angle,
+            adjusted=original_heading != heading_int,
+            original_heading=original_heading,
+        )
     except Exception as e:
-        logger.error(f"❌ Error setting oscillation: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "actual_width": width_int,
-            "actual_heading": heading_int,
-            "lower_angle": None,
-            "upper_angle": None,
-            "adjusted": False,
-            "original_heading": original_heading,
-        }
+        logger.error("❌ Error setting oscillation: %s", e)
+        return OscillationResult(
+            success=False,
+            error=str(e),
+            actual_width=width_int,
+            actual_heading=heading_int,
+            original_heading=original_heading,
+        )
 
 
 def get_oscillation_info(osal: str, osau: str) -> dict[str, Any]:
@@ -276,15 +333,10 @@ def get_oscillation_info(osal: str, osau: str) -> dict[str, Any]:
     lower = int(osal)
     upper = int(osau)
 
-    # Calculate width and heading
-    if lower <= upper:
-        # Normal case: 90° to 270° = 180° width, 180° heading
-        width = upper - lower
-        heading = (lower + upper) // 2
-    else:
-        # Wrap-around case: 350° to 10° = 380° total, but 20° width
-        width = (360 - lower) + upper
-        heading = ((lower + upper + 360) // 2) % 360
+    # Calculate width and heading; the modulo covers the wrap-around case
+    # (350° to 10° = 20° width, 0° heading) without a separate branch
+    width = (upper - lower) % 360
+    heading = (lower + width // 2) % 360
 
     return {
         "width": width,
@@ -296,13 +348,32 @@ def get_oscillation_info(osal: str, osau: str) -> dict[str, Any]:
 
 
 # Dyson's valid oscillation width steps
-VALID_WIDTHS = [0, 45, 90, 180, 350]
+VALID_WIDTHS = frozenset((0, 45, 90, 180, 350))
+VALID_WIDTHS_SORTED = (0, 45, 90, 180, 350)
 
 # Named width steps matching Dyson's terminology
-WIDTH_NAMES = {"off": 0, "narrow": 45, "medium": 90, "wide": 180, "full": 350}
+WIDTH_NAMES = MappingProxyType(
+    {"off": 0, "narrow": 45, "medium": 90, "wide": 180, "full": 350}
+)
+
+# Width names in lower, Title and UPPER case so common spellings need no
+# case folding
+WIDTH_NAMES_CI = MappingProxyType(
+    {k: v for k, v in WIDTH_NAMES.items()}
+    | {k.title(): v for k, v in WIDTH_NAMES.items()}
+    | {k.upper(): v for k, v in WIDTH_NAMES.items()}
+)
 
 # Reverse mapping for display
-WIDTH_DISPLAY_NAMES = {v: k for k, v in WIDTH_NAMES.items()}
+WIDTH_DISPLAY_NAMES = MappingProxyType(
+    {0: "off", 45: "narrow", 90: "medium", 180: "wide", 350: "full"}
+)
+
+# Bounds-adjusted (lower, upper, heading, adjustment_type) for every heading
+# at each oscillating width step, so set_oscillation_angles is a lookup
+_OSC_TABLE: Dict[Tuple[int, int], Tuple[int, int, int, Optional[str]]] = {
+    (w, h): _fit_within_bounds(w, h) for w in VALID_WIDTHS if w for h in range(360)
+}
 
 
 def parse_width_input(width_input: Any) -> int:
@@ -319,9 +390,12 @@ def parse_width_input(width_input: Any) -> int:
         ValueError: If the input is not a valid width or name
     """
     if isinstance(width_input, str):
-        width_lower = width_input.lower()
-        if width_lower in WIDTH_NAMES:
-            return WIDTH_NAMES[width_lower]
+        # Mixed-case spellings (e.g. "nArrow") still fall back to folding
+        width = WIDTH_NAMES_CI.get(width_input)
+        if width is None:
+            width = WIDTH_NAMES.get(width_input.lower())
+        if width is not None:
+            return width
         else:
             # Try to parse as numeric string
             try:
@@ -337,9 +411,33 @@ def parse_width_input(width_input: Any) -> int:
         raise ValueError(f"Width must be an integer or string, got {type(width_input)}")
 
 
+def _extract_position(
+    state: Dict[str, Any],
+) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    Read the oscillation range and fan position from a device state.
+
+    Uses the product-state section, or the top-level fields if there is none.
+
+    Returns:
+        Tuple of (osal, osau, heading). The heading is the centre of the
+        oscillation range, or the reported apos when there is no range.
+        Values missing from the state are None.
+    """
+    product_state = state.get("product-state") or state
+    osal = product_state.get("osal")
+    osau = product_state.get("osau")
+    if osal is not None and osau is not None:
+        lower, upper = int(osal), int(osau)
+        # Centre of the range, including the wrap-around case (350°-10° -> 0°)
+        return lower, upper, (lower + (upper - lower) % 360 // 2) % 360
+    apos = product_state.get("apos")
+    return None, None, None if apos is None else int(apos)
+
+
 def set_oscillation_width(
     width_input: Any, fallback_heading: int = 180
-) -> dict[str, Any]:
+) -> OscillationResult:
     """
     Set oscillation width centered on current fan position (Dyson app style).
 
@@ -348,194 +446,128 @@ def set_oscillation_width(
         fallback_heading: Default heading if current position cannot be determined (default 180°)
 
     Returns:
-        Dict with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
+        OscillationResult with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
 
     Example:
         Fan at 128° → set_oscillation_width("medium") → oscillates 83° to 173°
         Fan at 128° → set_oscillation_width(90) → oscillates 83° to 173°
     """
-    import asyncio
-
-    from blowcontrol.mqtt.async_client import async_get_state
-
     # Parse the width input (numeric or named)
     try:
         width = parse_width_input(width_input)
         original_width_input = width_input
     except ValueError as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "actual_width": None,
-            "actual_heading": None,
-            "lower_angle": None,
-            "upper_angle": None,
-            "adjusted": False,
-            "original_heading": None,
-            "width_adjusted": False,
-            "requested_width": width_input,
-            "adjusted_width": None,
-        }
+        return OscillationResult(
+            success=False,
+            error=str(e),
+            requested_width=width_input,
+        )
 
     # Validate and adjust width to match Dyson's steps
     original_width = width
     if width not in VALID_WIDTHS:
-        # Find the next largest valid width
-        valid_width = None
-        for valid in VALID_WIDTHS:
-            if valid >= width:
-                valid_width = valid
-                break
-
-        if valid_width is None:
-            # If larger than 350, use 350
-            valid_width = 350
-
-        width_name = WIDTH_DISPLAY_NAMES.get(valid_width, f"{valid_width}°")
+        # Find the next largest valid width (350 if larger than every step)
+        idx = bisect.bisect_left(VALID_WIDTHS_SORTED, width)
+        valid_width = (
+            VALID_WIDTHS_SORTED[idx] if idx < len(VALID_WIDTHS_SORTED) else 350
+        )
+
         logger.warning(
-            f"Width {width}° is not a valid Dyson step. Using {valid_width}° ({width_name}) instead. Valid: off, narrow, medium, wide, full"
+            "Width %s° is not a valid Dyson step. Using %s° (%s) instead. Valid: off, narrow, medium, wide, full",
+            width,
+            valid_width,
+            WIDTH_DISPLAY_NAMES.get(valid_width) or f"{valid_width}°",
         )
         width = valid_width
 
     # Handle special case: width 0 means turn off oscillation
     if width == 0:
         logger.info("Width 'off' requested - turning off oscillation")
-        command_data = {
-            "oscs": "OFF",  # Disable oscillation
-            "oson": "OFF",  # Turn off oscillation
-        }
-
         try:
-            client = DysonMQTTClient(client_id="d2mqtt-osc-stop")
-            success = client.send_standalone_command("STATE-SET", command_data)
+            success = _send_state_set(_OSC_OFF_TEMPLATE)
             if success:
                 logger.info("✅ Oscillation stopped")
             else:
                 logger.error("❌ Failed to stop oscillation")
 
-            result = {
-                "success": success,
-                "actual_width": 0,
-                "actual_heading": None,
-                "lower_angle": None,
-                "upper_angle": None,
-                "adjusted": False,
-                "original_heading": None,
-                "width_adjusted": original_width != width,
-                "requested_width": original_width_input,
-                "adjusted_width": "off",
-            }
+            result = OscillationResult(
+                success=success,
+                actual_width=0,
+                width_adjusted=original_width != width,
+                requested_width=original_width_input,
+                adjusted_width="off",
+            )
             return result
         except Exception as e:
-            logger.error(f"❌ Error stopping oscillation: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "actual_width": None,
-                "actual_heading": None,
-                "lower_angle": None,
-                "upper_angle": None,
-                "adjusted": False,
-                "original_heading": None,
-                "width_adjusted": original_width != width,
-                "requested_width": original_width_input,
-                "adjusted_width": "off",
-            }
+            logger.error("❌ Error stopping oscillation: %s", e)
+            return OscillationResult(
+                success=False,
+                error=str(e),
+                width_adjusted=original_width != width,
+                requested_width=original_width_input,
+                adjusted_width="off",
+            )
 
     # Try to get current fan position from device state
     current_heading = None
     try:
         logger.info("Getting current device state to determine fan position...")
 
-        # Run the async state function
-        async def get_state() -> Optional[Dict[str, Any]]:
-            return await async_get_state(quiet=True)
-
-        state_result = asyncio.run(get_state())
+        state_result = get_state_cached()
 
         if state_result and state_result.get("state"):
             state = state_result["state"]
-            # Look for current position in the state - it might be in different fields
-            # Check if oscillation is on and get the current angles
-
-            # First try to get product-state data
-            product_state = state.get("product-state", {})
-            if product_state:
-                if "osal" in product_state and "osau" in product_state:
-                    # If oscillating, estimate center position
-                    osal = int(product_state["osal"])
-                    osau = int(product_state["osau"])
-                    if osal <= osau:
-                        current_heading = (osal + osau) // 2
-                    else:
-                        # Wrap-around case
-                        current_heading = ((osal + osau + 360) // 2) % 360
-                    logger.info(
-                        f"Estimated current position from oscillation range: {current_heading}° (range: {osal}°-{osau}°)"
-                    )
-                elif "apos" in product_state:
-                    # Direct position if available
-                    current_heading = int(product_state["apos"])
-                    logger.info(f"Current fan position from state: {current_heading}°")
-
-            # Fallback to direct state fields if product-state not found
-            if current_heading is None:
-                if "osal" in state and "osau" in state:
-                    # If oscillating, estimate center position
-                    osal = int(state["osal"])
-                    osau = int(state["osau"])
-                    if osal <= osau:
-                        current_heading = (osal + osau) // 2
-                    else:
-                        # Wrap-around case
-                        current_heading = ((osal + osau + 360) // 2) % 360
-                    logger.info(
-                        f"Estimated current position from oscillation range: {current_heading}° (range: {osal}°-{osau}°)"
-                    )
-                elif "apos" in state:
-                    # Direct position if available
-                    current_heading = int(state["apos"])
-                    logger.info(f"Current fan position from state: {current_heading}°")
+            osal, osau, current_heading = _extract_position(state)
 
-            if current_heading is None:
+            if osal is not None:
+                logger.info(
+                    "Estimated current position from oscillation range: %s° (range: %s°-%s°)",
+                    current_heading,
+                    osal,
+                    osau,
+                )
+            elif current_heading is not None:
+                logger.info("Current fan position from state: %s°", current_heading)
+            else:
                 logger.warning("No position information found in device state")
-                logger.debug(f"Available state keys: {list(state.keys())}")
-                if product_state:
-                    logger.debug(
-                        f"Available product-state keys: {list(product_state.keys())}"
-                    )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Available state keys: %s", list(state.keys()))
+                    product_state = state.get("product-state")
+                    if product_state:
+                        logger.debug(
+                            "Available product-state keys: %s",
+                            list(product_state.keys()),
+                        )
 
     except Exception as e:
-        logger.warning(f"Could not get current position from state: {e}")
+        logger.warning("Could not get current position from state: %s", e)
 
     # Use fallback if we couldn't get current position
     if current_heading is None:
         current_heading = fallback_heading
         logger.warning(
-            f"Using fallback heading {fallback_heading}° (could not determine current position)"
+            "Using fallback heading %s° (could not determine current position)",
+            fallback_heading,
         )
 
     # Use current or fallback position as heading and set the oscillation
-    width_name = WIDTH_DISPLAY_NAMES.get(width, f"{width}°")
     logger.info(
-        f"Setting {width}° ({width_name}) width centered on position {current_heading}°"
+        "Setting %s° (%s) width centered on position %s°",
+        width,
+        WIDTH_DISPLAY_NAMES.get(width) or f"{width}°",
+        current_heading,
     )
     result = set_oscillation_angles(width, current_heading)
 
     # Add info about width adjustment if it occurred
-    if original_width != width:
-        result["width_adjusted"] = True
-        result["requested_width"] = original_width_input
-        result["adjusted_width"] = WIDTH_DISPLAY_NAMES.get(width, width)
-    else:
-        result["width_adjusted"] = False
-        result["requested_width"] = original_width_input
-        result["adjusted_width"] = WIDTH_DISPLAY_NAMES.get(width, width)
+    result.width_adjusted = original_width != width
+    result.requested_width = original_width_input
+    result.adjusted_width = WIDTH_DISPLAY_NAMES.get(width, width)
 
     return result
 
 
-def set_oscillation_direction(heading: Union[int, str]) -> dict[str, Any]:
+def set_oscillation_direction(heading: Union[int, str]) -> OscillationResult:
     """
     Set oscillation heading (center direction) while preserving current width.
     If oscillation is currently off, just sets the heading without turning oscillation on.
@@ -544,7 +576,7 @@ def set_oscillation_direction(heading: Union[int, str]) -> dict[str, Any]:
         heading: Center direction in degrees (0-359, can be string or int)
 
     Returns:
-        Dict with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
+        OscillationResult with success, actual_width, actual_heading, lower_angle, upper_angle, adjusted
 
     Example:
         Current: 135°-225° (90° wide, center 180°)
@@ -553,41 +585,19 @@ def set_oscillation_direction(heading: Union[int, str]) -> dict[str, Any]:
         Current: Oscillation OFF
         set_oscillation_direction(90) → Sets heading to 90° (oscillation remains OFF)
     """
-    import asyncio
-
-    from blowcontrol.mqtt.async_client import async_get_state
-
     # Parse and validate heading
     try:
         heading_int = parse_int_input(heading)
         if not (0 <= heading_int <= 359):
-            return {
-                "success": False,
-                "error": "Heading must be between 0° and 359°",
-                "actual_width": None,
-                "actual_heading": None,
-                "lower_angle": None,
-                "upper_angle": None,
-                "adjusted": False,
-                "original_heading": None,
-                "width_preserved": False,
-                "current_width": None,
-                "oscillation_was_off": False,
-            }
+            return OscillationResult(
+                success=False,
+                error="Heading must be between 0° and 359°",
+            )
     except ValueError as e:
-        return {
-            "success": False,
-            "error": f"Invalid heading input: {e}",
-            "actual_width": None,
-            "actual_heading": None,
-            "lower_angle": None,
-            "upper_angle": None,
-            "adjusted": False,
-            "original_heading": None,
-            "width_preserved": False,
-            "current_width": None,
-            "oscillation_was_off": False,
-        }
+        return OscillationResult(
+            success=False,
+            error=f"Invalid heading input: {e}",
+        )
 
     # Get current oscillation state from device
     current_width = None
@@ -595,143 +605,85 @@ def set_oscillation_direction(heading: Union[int, str]) -> dict[str, Any]:
     try:
         logger.info("Getting current device state to determine oscillation status...")
 
-        # Run the async state function
-        async def get_state() -> Optional[Dict[str, Any]]:
-            return await async_get_state(quiet=True)
-
-        state_result = asyncio.run(get_state())
+        state_result = get_state_cached()
 
         if state_result and state_result.get("state"):
             state = state_result["state"]
 
             # Check if oscillation is currently on
-            product_state = state.get("product-state", {})
-            if product_state:
-                oscs = product_state.get("oscs", "OFF")
-                oson = product_state.get("oson", "OFF")
-
-                if oscs == "ON" and oson == "ON":
-                    oscillation_is_on = True
-                    # Get current oscillation angles
-                    if "osal" in product_state and "osau" in product_state:
-                        osal = int(product_state["osal"])
-                        osau = int(product_state["osau"])
-
-                        # Calculate current width
-                        if osal <= osau:
-                            current_width = osau - osal
-                        else:
-                            # Wrap-around case
-                            current_width = (360 - osal) + osau
-
-                        logger.info(
-                            f"Current oscillation: {osal}°-{osau}° (width: {current_width}°)"
-                        )
-                    else:
-                        logger.warning("Oscillation is on but no angle data found")
-                else:
+            product_state = state.get("product-state") or state
+            if product_state.get("oscs") == "ON" and product_state.get("oson") == "ON":
+                oscillation_is_on = True
+                # Get current oscillation angles
+                osal, osau, _ = _extract_position(state)
+                if osal is not None:
+                    current_width = (osau - osal) % 360
                     logger.info(
-                        "Oscillation is currently off - will just set heading without turning oscillation on"
-                    )
-
-            # Fallback to direct state fields if product-state not found
-            if current_width is None and oscillation_is_on:
-                oscs = state.get("oscs", "OFF")
-                oson = state.get("oson", "OFF")
-
-                if (
-                    oscs == "ON"
-                    and oson == "ON"
-                    and "osal" in state
-                    and "osau" in state
-                ):
-                    osal = int(state["osal"])
-                    osau = int(state["osau"])
-
-                    if osal <= osau:
-                        current_width = osau - osal
-                    else:
-                        current_width = (360 - osal) + osau
-
-                    logger.info(
-                        f"Current oscillation: {osal}°-{osau}° (width: {current_width}°)"
+                        "Current oscillation: %s°-%s° (width: %s°)",
+                        osal,
+                        osau,
+                        current_width,
                     )
+                else:
+                    logger.warning("Oscillation is on but no angle data found")
+            else:
+                logger.info(
+                    "Oscillation is currently off - will just set heading without turning oscillation on"
+                )
 
     except Exception as e:
-        logger.warning(f"Could not get current oscillation state: {e}")
+        logger.warning("Could not get current oscillation state: %s", e)
 
     # If oscillation is off, use the sweep pattern to set heading without
     # turning oscillation on
     if not oscillation_is_on:
         logger.info(
-            f"Oscillation is off - setting heading to {heading_int}° using sweep pattern"
+            "Oscillation is off - setting heading to %s° using sweep pattern",
+            heading_int,
         )
 
         # Use the pattern from sweep.txt: set both angles to heading with oson=ON
         # But also explicitly set oscs=OFF to keep oscillation off
+        angle = ANGLE_STR[heading_int]
         command_data = {
-            "osal": f"{heading_int:04d}",
-            "osau": f"{heading_int:04d}",
-            "oson": "ON",
+            **_OSC_ON_TEMPLATE,
             "oscs": "OFF",
-            "ancp": "CUST",
+            "osal": angle,
+            "osau": angle,
         }
 
         try:
-            client = DysonMQTTClient(client_id="d2mqtt-osc-heading-off")
-            success = client.send_standalone_command("STATE-SET", command_data)
-
-            if success:
+            if _send_state_set(command_data):
                 logger.info(
-                    f"✅ Set heading to {heading_int}° (oscillation remains off)"
+                    "✅ Set heading to %s° (oscillation remains off)", heading_int
                 )
-                return {
-                    "success": True,
-                    "actual_width": 0,
-                    "actual_heading": heading_int,
-                    "lower_angle": heading_int,
-                    "upper_angle": heading_int,
-                    "adjusted": False,
-                    "original_heading": None,
-                    "width_preserved": False,
-                    "current_width": 0,
-                    "oscillation_was_off": True,
-                    "message": f"Set heading to {heading_int}° (oscillation remains off)",
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "Failed to set heading",
-                    "actual_width": None,
-                    "actual_heading": None,
-                    "lower_angle": None,
-                    "upper_angle": None,
-                    "adjusted": False,
-                    "original_heading": None,
-                    "width_preserved": False,
-                    "current_width": None,
-                    "oscillation_was_off": True,
-                }
+                return OscillationResult(
+                    success=True,
+                    actual_width=0,
+                    actual_heading=heading_int,
+                    lower_angle=heading_int,
+                    upper_angle=heading_int,
+                    current_width=0,
+                    oscillation_was_off=True,
+                    message=f"Set heading to {heading_int}° (oscillation remains off)",
+                )
+            return OscillationResult(
+                success=False,
+                error="Failed to set heading",
+                oscillation_was_off=True,
+            )
         except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error setting heading: {e}",
-                "actual_width": None,
-                "actual_heading": None,
-                "lower_angle": None,
-                "upper_angle": None,
-                "adjusted": False,
-                "original_heading": None,
-                "width_preserved": False,
-                "current_width": None,
-                "oscillation_was_off": True,
-            }
+            return OscillationResult(
+                success=False,
+                error=f"Error setting heading: {e}",
+                oscillation_was_off=True,
+            )
 
     # Oscillation is on - preserve current width and set new heading
     if current_width is None:
         current_width = 90  # Default to medium width
         logger.warning(
-            f"Using default width {current_width}° (could not determine current width)"
+            "Using default width %s° (could not determine current width)", current_width
         )
         width_preserved = False
     else:
@@ -739,25 +691,39 @@ def set_oscillation_direction(heading: Union[int, str]) -> dict[str, Any]:
 
     # Validate the width is a valid Dyson step
     if current_width not in VALID_WIDTHS:
-        # Find the closest valid width
-        closest_width = min(VALID_WIDTHS, key=lambda x: abs(x - current_width))
+        # Find the closest valid width (the smaller one on a tie)
+        idx = bisect.bisect_left(VALID_WIDTHS_SORTED, current_width)
+        if idx == 0:
+            closest_width = VALID_WIDTHS_SORTED[0]
+        elif idx == len(VALID_WIDTHS_SORTED):
+            closest_width = VALID_WIDTHS_SORTED[-1]
+        else:
+            below = VALID_WIDTHS_SORTED[idx - 1]
+            above = VALID_WIDTHS_SORTED[idx]
+            closest_width = (
+                below if current_width - below <= above - current_width else above
+            )
         logger.warning(
-            f"Current width {current_width}° is not a valid step, using closest: {closest_width}°"
+            "Current width %s° is not a valid step, using closest: %s°",
+            current_width,
+            closest_width,
         )
         current_width = closest_width
 
     # Set oscillation with preserved width and new heading
-    width_name = WIDTH_DISPLAY_NAMES.get(current_width, f"{current_width}°")
     logger.info(
-        f"Setting heading to {heading_int}° while preserving {current_width}° ({width_name}) width"
+        "Setting heading to %s° while preserving %s° (%s) width",
+        heading_int,
+        current_width,
+        WIDTH_DISPLAY_NAMES.get(current_width) or f"{current_width}°",
     )
 
     result = set_oscillation_angles(current_width, heading_int)
 
     # Add heading-specific info
-    result["width_preserved"] = width_preserved
-    result["current_width"] = current_width
-    result["requested_heading"] = heading_int
-    result["oscillation_was_off"] = False
+    result.width_preserved = width_preserved
+    result.current_width = current_width
+    result.requested_heading = heading_int
+    result.oscillation_was_off = False
 
     return result
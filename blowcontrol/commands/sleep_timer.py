@@ -4,12 +4,20 @@ Sleep timer command module for Dyson2MQTT app.
 
 import logging
 import re
-from typing import Union
+from typing import Optional, Union
 
 from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.mqtt.pool import get_pooled_client
+from blowcontrol.state.cache import invalidate_state_cache
 
 logger = logging.getLogger(__name__)
 
+# 4-digit zero-padded strings for every valid timer value, e.g. SLTM_STR[90] == "0090"
+SLTM_STR = tuple(f"{i:04d}" for i in range(541))
+
+# Patterns for the '2h15m' / '1h' / '45m' timer format
+_RE_HM = re.compile(r"(?:(?P<h>\d+)h)?(?:(?P<m>\d+)m)?")
+
 
 def parse_sleep_time(value: Union[str, int]) -> int:
     """
@@ -29,6 +37,14 @@ def parse_sleep_time(value: Union[str, int]) -> int:
         raise ValueError(f"Invalid type for sleep timer: {type(value)}")
 
     s = value.strip().lower()
+
+    # raw minutes as string (the common case)
+    if s.isdigit():
+        minutes = int(s)
+        if minutes < 0 or minutes > 540:
+            raise ValueError("Sleep timer must be between 0 and 540 minutes (0 = off).")
+        return minutes
+
     if s == "off":
         return 0
 
@@ -50,51 +66,35 @@ def parse_sleep_time(value: Union[str, int]) -> int:
         raise ValueError(f"Invalid time format: {value}")
 
     # 2h15m or 1h or 45m (strict: only allow h then m, not mixed or out of order)
-    if re.fullmatch(r"(\d+h)?(\d+m)?", s):
-        hours = 0
-        mins = 0
-        h_match = re.match(r"(\d+)h", s)
-        m_match = re.search(r"(\d+)m", s)
-        if h_match:
-            hours = int(h_match.group(1))
-        if m_match:
-            mins = int(m_match.group(1))
-        if hours == 0 and mins == 0:
+    match = _RE_HM.fullmatch(s)
+    if match and (match["h"] or match["m"]):
+        minutes = int(match["h"] or 0) * 60 + int(match["m"] or 0)
+        if minutes == 0:
             raise ValueError(f"Invalid time format: {value}")
-        minutes = hours * 60 + mins
-        if minutes < 0 or minutes > 540:
-            raise ValueError("Sleep timer must be between 0 and 540 minutes (0 = off).")
-        return minutes
-
-    # raw minutes as string
-    if s.isdigit():  # type: ignore[unreachable]
-        minutes = int(s)
-        if minutes < 0 or minutes > 540:
+        if minutes > 540:
             raise ValueError("Sleep timer must be between 0 and 540 minutes (0 = off).")
         return minutes
 
     raise ValueError(f"Invalid time format: {value}")
 
 
-def set_sleep_timer(value: Union[str, int]) -> bool:
+def set_sleep_timer(
+    value: Union[str, int], client: Optional[DysonMQTTClient] = None
+) -> bool:
     """
     Set the Dyson device sleep timer (0-540 minutes, flexible input).
     0 or "off" will clear the timer.
+    Publishes on the pooled client unless a connected client is given.
     Returns True if successful, False otherwise.
     """
     try:
         minutes = parse_sleep_time(value)
-        client = DysonMQTTClient(client_id="d2mqtt-cmd")
-        client.connect()
+        client = client or get_pooled_client()
 
-        if minutes == 0:
-            client.set_numeric_state("sltm", "OFF")
-        else:
-            minutes_str = f"{minutes:04d}"
-            client.set_numeric_state("sltm", minutes_str)
+        client.set_numeric_state("sltm", SLTM_STR[minutes] if minutes else "OFF")
 
-        client.disconnect()
+        invalidate_state_cache()
         return True
     except Exception as e:
-        logger.error(f"Failed to set sleep timer: {e}")
+        logger.error("Failed to set sleep timer: %s", e)
         return False
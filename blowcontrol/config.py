@@ -5,10 +5,32 @@ Loads settings from environment variables and .env file.
 
 import os
 
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+def _dotenv_present() -> bool:
+    """
+    Return True if a .env file exists where load_dotenv() could find it.
+
+    Checks the working directory and its parents, then this package's
+    directory and its parents, with one stat call per directory.
+    """
+    for start in (os.getcwd(), os.path.dirname(os.path.abspath(__file__))):
+        path = start
+        while True:
+            if os.path.exists(os.path.join(path, ".env")):
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+    return False
+
+
+# Load environment variables from .env file; python-dotenv is only imported
+# when there is a file to load
+if not os.getenv("SKIP_DOTENV") and _dotenv_present():
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 # Device configuration
 DEVICE_IP = os.getenv("DEVICE_IP", "192.168.1.100")
@@ -32,11 +54,13 @@ if not os.getenv("TESTING"):
 
 # MQTT topic construction
 
+# Built once per (re)load; every device topic shares this prefix
+BASE_TOPIC = f"{ROOT_TOPIC}/{SERIAL_NUMBER}"
+
 
 def get_device_topic(suffix: str = "") -> str:
     """Construct MQTT topic for device communication."""
-    base_topic = f"{ROOT_TOPIC}/{SERIAL_NUMBER}"
-    return f"{base_topic}/{suffix}" if suffix else base_topic
+    return f"{BASE_TOPIC}/{suffix}" if suffix else BASE_TOPIC
 
 
 # Status topics
@@ -0,0 +1,41 @@
+"""
+Minimal entry point for fetching device state from scripts.
+
+``python -m blowcontrol.fast state --json`` prints the same JSON document as
+``blowcontrol state --json`` but skips argparse and the command modules, so
+repeated calls such as ``STATUS=$(python -m blowcontrol.fast state --json)``
+spend their time on the MQTT round-trip rather than interpreter setup.
+Anything else should use the full CLI.
+"""
+
+import sys
+from typing import List, Optional
+
+USAGE = "usage: python -m blowcontrol.fast state --json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the fast path and return the process exit code."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv != ["state", "--json"]:
+        sys.stderr.write(USAGE + "\n")
+        return 2
+
+    from blowcontrol.async_runtime import run_coro
+    from blowcontrol.mqtt.async_client import async_get_state
+    from blowcontrol.utils import json_codec
+
+    pretty = sys.stdout.isatty()
+    try:
+        state = run_coro(async_get_state(quiet=True))
+    except Exception as e:
+        result = {"success": False, "message": f"Failed to get state: {e}"}
+        sys.stdout.write(json_codec.dumps(result, pretty) + "\n")
+        return 1
+    sys.stdout.write(json_codec.dumps(state, pretty) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,35 @@ Classes:
 Functions:
     async_get_state: Asynchronous state fetching
     async_send_command: Asynchronous command sending
+    get_state_sync: Blocking state fetch on the shared event loop
+    get_pooled_client: Shared, already-connected client for commands
 """
 
-from .async_client import async_get_state, async_send_command
-from .client import DysonMQTTClient
+from typing import TYPE_CHECKING
 
-__all__ = ["DysonMQTTClient", "async_get_state", "async_send_command"]
+from blowcontrol._lazy import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .async_client import async_get_state, async_send_command, get_state_sync
+    from .client import DysonMQTTClient
+    from .pool import get_pooled_client
+
+# Public name -> submodule that defines it, imported on first access
+_LAZY_ATTRS = {
+    "async_get_state": ".async_client",
+    "async_send_command": ".async_client",
+    "get_state_sync": ".async_client",
+    "DysonMQTTClient": ".client",
+    "get_pooled_client": ".pool",
+}
+
+__all__ = [
+    "DysonMQTTClient",
+    "async_get_state",
+    "async_send_command",
+    "get_pooled_client",
+    "get_state_sync",
+]
+
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, globals(), _LAZY_ATTRS)
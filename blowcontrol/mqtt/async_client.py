@@ -1,132 +1,297 @@
 """
 Async MQTT client for Dyson2MQTT modular app.
 
-Uses asyncio with existing paho-mqtt (no additional dependencies).
+Uses asyncio with existing paho-mqtt (no additional dependencies): state
+fetches drive paho from the event loop, commands publish on the pooled client.
 """
 
 import asyncio
-import json
 import logging
-import threading
-from typing import Any, Dict, Optional
-
-from blowcontrol.config import ROOT_TOPIC, SERIAL_NUMBER
+from typing import Any, Callable, Dict, Optional, Union
+
+import paho.mqtt.client as mqtt
+from paho.mqtt import MQTTException
+
+from blowcontrol.async_runtime import run_coro
+from blowcontrol.config import (
+    ROOT_TOPIC,
+    SERIAL_NUMBER,
+    STATUS_CURRENT_TOPIC,
+    STATUS_FAULT_TOPIC,
+)
 from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.mqtt.pool import get_pooled_client
+from blowcontrol.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the broker's CONNACK before requesting state
+CONNECT_TIMEOUT = 10
+
+# Message types async_get_state() keeps; others are skipped before decoding
+_STATE_MESSAGE_TYPES = (
+    b'"CURRENT-STATE"',
+    b'"ENVIRONMENTAL-CURRENT-SENSOR-DATA"',
+    b'"STATE-CHANGE"',
+)
+
+# Broker and socket failures the command helpers report as False; anything
+# else (bad config, programming errors) propagates to the caller
+_CONNECTION_ERRORS = (OSError, MQTTException)
+
+
+class AsyncDysonMQTTClient(DysonMQTTClient):
+    """
+    DysonMQTTClient driven by the running asyncio loop instead of paho's thread.
+
+    The socket is serviced with loop.add_reader()/add_writer() and keepalive
+    runs from a loop task, so message callbacks fire on the loop itself and
+    can set asyncio primitives directly. Must be created inside a coroutine;
+    use aconnect()/aclose() rather than connect()/disconnect().
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._loop = asyncio.get_running_loop()
+        self._connack = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._socket_open = False
+        self._misc_task: Optional["asyncio.Task[None]"] = None
+        self._client.on_socket_open = self._on_socket_open
+        self._client.on_socket_close = self._on_socket_close
+        self._client.on_socket_register_write = self._on_socket_register_write
+        self._client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def connect(self, keepalive: int = 60) -> None:
+        raise TypeError("AsyncDysonMQTTClient is connected with 'await aconnect()'")
+
+    async def aconnect(self, keepalive: int = 60) -> None:
+        """
+        Connect to the MQTT broker without starting paho's network thread.
+
+        The blocking TCP handshake runs in the default executor so the loop
+        keeps serving other clients; everything after it runs on the loop.
+        """
+        logger.info("Connecting to MQTT broker at %s:%s...", self.device_ip, self.port)
+        self._closed.clear()
+        await self._loop.run_in_executor(
+            None, self._client.connect, self.device_ip, self.port, keepalive
+        )
+
+    async def wait_connected_async(self, timeout: Optional[float] = None) -> bool:
+        """Await CONNACK; return False if the timeout expires first."""
+        try:
+            await asyncio.wait_for(self._connack.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def aclose(self, timeout: float = 1.0) -> None:
+        """Send DISCONNECT and wait for the loop to flush it and close the socket."""
+        logger.info("Disconnecting from MQTT broker...")
+        self._client.disconnect()
+        # Nothing to wait for if the connection never got as far as a socket
+        if self._socket_open:
+            try:
+                await asyncio.wait_for(self._closed.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("MQTT socket did not close after DISCONNECT")
+        self._connected = False
+        self._connack.clear()
+
+    def _on_connect(self, client: Any, userdata: Any, flags: Any, rc: int) -> None:
+        super()._on_connect(client, userdata, flags, rc)
+        if rc == 0:
+            self._connack.set()
+
+    def _call_on_loop(self, func: Callable[..., Any], *args: Any) -> None:
+        """Run func on the loop; paho calls back from the executor during connect."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _on_socket_open(self, client: Any, userdata: Any, sock: Any) -> None:
+        self._socket_open = True
+        self._call_on_loop(self._watch_socket, client, sock)
+
+    def _watch_socket(self, client: Any, sock: Any) -> None:
+        self._loop.add_reader(sock, client.loop_read)
+        self._misc_task = self._loop.create_task(self._misc_loop())
+
+    def _on_socket_close(self, client: Any, userdata: Any, sock: Any) -> None:
+        self._call_on_loop(self._unwatch_socket, sock)
+
+    def _unwatch_socket(self, sock: Any) -> None:
+        self._loop.remove_reader(sock)
+        self._loop.remove_writer(sock)
+        if self._misc_task is not None:
+            self._misc_task.cancel()
+            self._misc_task = None
+        self._socket_open = False
+        self._closed.set()
+
+    def _on_socket_register_write(self, client: Any, userdata: Any, sock: Any) -> None:
+        self._call_on_loop(self._loop.add_writer, sock, client.loop_write)
+
+    def _on_socket_unregister_write(
+        self, client: Any, userdata: Any, sock: Any
+    ) -> None:
+        self._call_on_loop(self._loop.remove_writer, sock)
+
+    async def _misc_loop(self) -> None:
+        """Run paho's keepalive and timeout housekeeping once a second."""
+        while self._client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            await asyncio.sleep(1)
+
+
+# In-flight state fetch per event loop, shared by concurrent async_get_state calls
+_pending_fetches: Dict[asyncio.AbstractEventLoop, "asyncio.Task[Dict[str, Any]]"] = {}
+
 
 async def async_get_state(
     timeout: float = 60, quiet: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
-    Async function to get current device state using existing sync client.
-    Uses asyncio.to_thread to run sync code in a thread pool.
+    Async function to get current device state.
+
+    Runs entirely on the calling event loop via AsyncDysonMQTTClient, so no
+    worker thread is held while waiting for the device to answer. Calls made
+    while a fetch is already running on the same loop wait for its answer
+    instead of opening another connection and sending another request.
     """
     if not ROOT_TOPIC or not SERIAL_NUMBER:
         raise ValueError("ROOT_TOPIC and SERIAL_NUMBER must be set.")
 
-    def sync_get_state() -> Dict[str, Any]:
-        """Sync function to get state - runs in thread pool."""
-        topics = [
-            f"{ROOT_TOPIC}/{SERIAL_NUMBER}/status/current",
-            f"{ROOT_TOPIC}/{SERIAL_NUMBER}/status/fault",
-        ]
-
-        client = DysonMQTTClient(client_id="d2mqtt-async-getstate")
-        result = {"state": None, "environmental": None}
-        got_response = threading.Event()
-
-        def state_callback(client_: Any, userdata: Any, msg: Any) -> None:
-            try:
-                data = json.loads(msg.payload.decode(errors="replace"))
-                msg_type = data.get("msg")
+    loop = asyncio.get_running_loop()
+    task = _pending_fetches.get(loop)
+    if task is None:
+        task = loop.create_task(_fetch_state(timeout, quiet))
+        _pending_fetches[loop] = task
+        task.add_done_callback(lambda _: _pending_fetches.pop(loop, None))
+        # Shielded so cancelling this caller does not cancel the joiners' fetch
+        return dict(await asyncio.shield(task))
+
+    if not quiet:
+        print("[ASYNC] Joining state request already in progress")
+    try:
+        return dict(await asyncio.wait_for(asyncio.shield(task), timeout))
+    except asyncio.TimeoutError:
+        if not quiet:
+            print("[ASYNC] ⚠ Timeout - no response from device")
+        return {"state": None, "environmental": None}
+
+
+async def _fetch_state(timeout: float, quiet: bool) -> Dict[str, Any]:
+    """Connect, request the current state and collect the replies."""
+    topics = [
+        STATUS_CURRENT_TOPIC,
+        STATUS_FAULT_TOPIC,
+    ]
+
+    client = AsyncDysonMQTTClient(client_id="d2mqtt-async-getstate")
+    result: Dict[str, Any] = {"state": None, "environmental": None}
+    got_response = asyncio.Event()
+
+    def state_callback(client_: Any, userdata: Any, msg: Any) -> None:
+        if not any(msg_type in msg.payload for msg_type in _STATE_MESSAGE_TYPES):
+            return
+        try:
+            data = json_codec.loads(msg.payload)
+            msg_type = data.get("msg")
 
-                if msg_type == "CURRENT-STATE":
+            if msg_type == "CURRENT-STATE":
+                if not quiet:
+                    print("[ASYNC] ✓ Received device state")
+                result["state"] = data
+                got_response.set()
+            elif msg_type == "ENVIRONMENTAL-CURRENT-SENSOR-DATA":
+                if not quiet:
+                    print("[ASYNC] ✓ Received environmental data")
+                result["environmental"] = data
+            elif msg_type == "STATE-CHANGE":
+                if not result["state"]:
                     if not quiet:
-                        print("[ASYNC] ✓ Received device state")
+                        print("[ASYNC] ✓ Received state change")
                     result["state"] = data
                     got_response.set()
-                elif msg_type == "ENVIRONMENTAL-CURRENT-SENSOR-DATA":
-                    if not quiet:
-                        print("[ASYNC] ✓ Received environmental data")
-                    result["environmental"] = data
-                elif msg_type == "STATE-CHANGE":
-                    if not result["state"]:
-                        if not quiet:
-                            print("[ASYNC] ✓ Received state change")
-                        result["state"] = data
-                        got_response.set()
-
-            except Exception as e:
-                if not quiet:
-                    print(f"[ASYNC] ⚠ Parse error: {e}")
 
-        try:
-            # Replicate the exact subscribe_and_listen pattern
+        except Exception as e:
             if not quiet:
-                print("[ASYNC] Connecting to device...")
-            else:
-                # Suppress INFO logs when in quiet mode
-                import logging
+                print(f"[ASYNC] ⚠ Parse error: {e}")
 
-                logging.getLogger("app.mqtt.client").setLevel(logging.WARNING)
+    try:
+        if not quiet:
+            print("[ASYNC] Connecting to device...")
+        else:
+            # Suppress INFO logs when in quiet mode
+            logging.getLogger("app.mqtt.client").setLevel(logging.WARNING)
 
-            client._subscribed_topics = topics
-            client._user_callback = state_callback
-            client._client.on_message = state_callback
+        # State and sensor data both arrive on status/current; paho routes that
+        # topic straight to state_callback and drops fault messages undecoded
+        client._subscribed_topics = topics
+        client._client.message_callback_add(STATUS_CURRENT_TOPIC, state_callback)
 
-            client.connect()
+        await client.aconnect()
 
-            if not quiet:
-                print("[ASYNC] Waiting for connection...")
-            # Give time for connection and subscription to complete
-            import time
+        if not quiet:
+            print("[ASYNC] Waiting for connection...")
+        # Resubscription is queued in on_connect, ahead of the request below
+        connected = await client.wait_connected_async(timeout=CONNECT_TIMEOUT)
+        if not connected and not quiet:
+            print("[ASYNC] ⚠ No CONNACK yet, sending request anyway")
 
-            time.sleep(2)
+        if not quiet:
+            print("[ASYNC] Requesting device state...")
+        client.send_command("REQUEST-CURRENT-STATE")
 
+        try:
+            await asyncio.wait_for(got_response.wait(), timeout)
             if not quiet:
-                print("[ASYNC] Requesting device state...")
-            client.send_command("REQUEST-CURRENT-STATE")
+                print("[ASYNC] ✓ State received successfully")
+        except asyncio.TimeoutError:
+            if not quiet:
+                print("[ASYNC] ⚠ Timeout - no response from device")
+        return result
+
+    except Exception as e:
+        if not quiet:
+            print(f"[ASYNC] ✗ Error: {e}")
+        return result
+    finally:
+        try:
+            await client.aclose()
+        except _CONNECTION_ERRORS as e:
+            logger.debug("Error closing state-fetch connection: %s", e)
 
-            if got_response.wait(timeout=timeout):
-                if not quiet:
-                    print("[ASYNC] ✓ State received successfully")
-                return result
-            else:
-                if not quiet:
-                    print("[ASYNC] ⚠ Timeout - no response from device")
-                return result
 
-        except Exception as e:
-            if not quiet:
-                print(f"[ASYNC] ✗ Error: {e}")
-            return result
-        finally:
-            try:
-                client.disconnect()
-            except BaseException:
-                pass
+def get_state_sync(
+    timeout: float = 60, quiet: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Blocking wrapper around async_get_state for synchronous callers.
 
-    # Run sync function in thread pool
-    return await asyncio.to_thread(sync_get_state)
+    Runs on the shared background event loop, so repeated calls do not pay
+    for creating and closing a loop the way asyncio.run() does.
+    """
+    return run_coro(async_get_state(timeout=timeout, quiet=quiet))
 
 
 async def async_send_command(command: str) -> bool:
     """
-    Async function to send a command using existing sync client.
+    Async function to send a command on the pooled, already-connected client.
     """
 
     def sync_send_command() -> bool:
         """Sync function to send command - runs in thread pool."""
         try:
-            client = DysonMQTTClient(client_id="d2mqtt-async-cmd")
-            client.connect()
-            client.send_command(command)
-            client.disconnect()
-            return True
-        except Exception as e:
-            logger.error(f"Error sending command: {e}")
+            return get_pooled_client().send_command(command)
+        except _CONNECTION_ERRORS as e:
+            logger.error("Error sending command: %s", e)
             return False
 
     # Run sync function in thread pool
@@ -138,38 +303,40 @@ async def async_set_power(on: bool) -> bool:
 
     def sync_set_power() -> bool:
         try:
-            client = DysonMQTTClient(client_id="d2mqtt-async-cmd")
-            client.connect()
-            client.set_boolean_state("fpwr", on)
-            client.disconnect()
+            get_pooled_client().set_boolean_state("fpwr", on)
             return True
-        except Exception as e:
-            logger.error(f"Error setting power: {e}")
+        except _CONNECTION_ERRORS as e:
+            logger.error("Error setting power: %s", e)
             return False
 
     return await asyncio.to_thread(sync_set_power)
 
 
-async def async_set_fan_speed(speed: int) -> bool:
-    """Async function to set fan speed."""
+async def async_set_states(states: Dict[str, Union[bool, str]]) -> bool:
+    """
+    Async function to set several states in one STATE-SET publish.
+
+    Args:
+        states: Data keys and values, e.g. {"fpwr": True, "fnsp": "0005"}
+    """
 
-    def sync_set_fan_speed() -> bool:
+    def sync_set_states() -> bool:
         try:
-            if speed == 0:
-                # Power off
-                client = DysonMQTTClient(client_id="d2mqtt-async-cmd")
-                client.connect()
-                client.set_boolean_state("fpwr", False)
-                client.disconnect()
-            else:
-                client = DysonMQTTClient(client_id="d2mqtt-async-cmd")
-                client.connect()
-                speed_str = f"{speed:04d}"
-                client.set_numeric_state("fnsp", speed_str)
-                client.disconnect()
+            get_pooled_client().set_states(states)
             return True
-        except Exception as e:
-            logger.error(f"Error setting fan speed: {e}")
+        except _CONNECTION_ERRORS as e:
+            logger.error("Error setting states: %s", e)
             return False
 
-    return await asyncio.to_thread(sync_set_fan_speed)
+    return await asyncio.to_thread(sync_set_states)
+
+
+async def async_set_fan_speed(speed: int) -> bool:
+    """
+    Async function to set fan speed.
+
+    A non-zero speed also turns the fan on, in the same publish; 0 turns it off.
+    """
+    if speed == 0:
+        return await async_set_states({"fpwr": False})
+    return await async_set_states({"fpwr": True, "fnsp": f"{speed:04d}"})
@@ -5,18 +5,72 @@ Requires paho-mqtt:
     pip install paho-mqtt
 """
 
-import datetime
+import itertools
+import json
 import logging
-import random
-import string
-from typing import Any, Callable, Optional, Union
+import os
+import re
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
 
 import paho.mqtt.client as mqtt
 
+from blowcontrol import config
 from blowcontrol.config import DEVICE_IP, MQTT_PASSWORD, MQTT_PORT, SERIAL_NUMBER
 
 logger = logging.getLogger(__name__)
 
+# Payload skeletons for a one-key STATE-SET and a command without data. They are
+# only used when every interpolated value is plain text needing no JSON escapes,
+# and are bytes so paho can send the result without encoding it again.
+_STATE_SET_ONE = (
+    b'{"msg":"STATE-SET","mode-reason":"RAPP","time":"%s","data":{"%s":"%s"}}'
+)
+_COMMAND_NO_DATA = b'{"msg":"%s","mode-reason":"RAPP","time":"%s"}'
+_PLAIN = re.compile(r"[\w.:-]*\Z", re.ASCII)
+
+# Ready-made one-key STATE-SET payloads for the most frequent commands, with
+# only the timestamp left to fill in
+_STATE_SET_TEMPLATES = {
+    (key, value): _STATE_SET_ONE % (b"%s", key.encode(), value.encode())
+    for key, value in [("fpwr", "ON"), ("fpwr", "OFF")]
+    + [("fnsp", f"{speed:04d}") for speed in range(1, 11)]
+}
+
+
+# Client IDs are a per-process random tag plus a counter; the tag is redrawn
+# after fork so parent and child never hand the broker the same ID
+_client_numbers = itertools.count(1)
+_tag_pid = 0
+_tag = ""
+
+
+def _process_tag() -> str:
+    """Random hex tag for this process, drawn once per PID."""
+    global _tag_pid, _tag
+    pid = os.getpid()
+    if pid != _tag_pid:
+        _tag_pid, _tag = pid, os.urandom(3).hex()
+    return _tag
+
+
+# (epoch second, formatted) of the last timestamp; replaced as one tuple so
+# concurrent publishers never see a second paired with another's string
+_last_timestamp = (0, "")
+
+
+def _timestamp() -> str:
+    """Current UTC time to the second in the device's format (…T12:00:00Z)."""
+    global _last_timestamp
+    second = int(time.time())
+    cached_second, formatted = _last_timestamp
+    if second != cached_second:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        _last_timestamp = (second, formatted)
+    return formatted
+
 
 class DysonMQTTClient:
     """
@@ -46,36 +100,63 @@ class DysonMQTTClient:
         self._client.on_disconnect = self._on_disconnect
         self._client.on_message = None  # Set by user if needed
         self._connected = False
-        self._subscribed_topics: list[str] = []
+        # Set once CONNACK arrives (and resubscriptions are queued)
+        self._connected_event = threading.Event()
+        self._subscribed_topics: Optional[list[str]] = None
         self._user_callback: Optional[Callable[..., Any]] = None
+        # Resolved once per client, from the config as it is now (it may have
+        # been reloaded since import); None if the topic parts are not set
+        self._command_topic: Optional[str] = (
+            config.COMMAND_TOPIC if config.ROOT_TOPIC and config.SERIAL_NUMBER else None
+        )
 
     def connect(self, keepalive: int = 60) -> None:
         """Connect to the MQTT broker."""
-        logger.info(f"Connecting to MQTT broker at {self.device_ip}:{self.port}...")
+        logger.info("Connecting to MQTT broker at %s:%s...", self.device_ip, self.port)
         self._client.connect(self.device_ip, self.port, keepalive)
         self._client.loop_start()
 
     def disconnect(self) -> None:
         """Disconnect from the MQTT broker."""
         logger.info("Disconnecting from MQTT broker...")
-        self._client.loop_stop()
+        # DISCONNECT first: it wakes the network thread, which flushes pending
+        # QoS 0 publishes, sends the packet and exits. Stopping the loop first
+        # would wait out its select() timeout (up to a second) instead.
         self._client.disconnect()
+        self._client.loop_stop()
         self._connected = False
+        self._connected_event.clear()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the broker has accepted the connection.
+        :param timeout: Maximum time to wait in seconds (None waits forever)
+        :return: True if connected, False if the timeout expired first
+        """
+        return self._connected_event.wait(timeout)
+
+    def is_connected(self) -> bool:
+        """Return True while the broker socket is open (CONNACK may be pending)."""
+        return self._client.socket() is not None
 
     def publish(
-        self, topic: str, payload: str, qos: int = 0, retain: bool = False
+        self,
+        topic: str,
+        payload: Union[str, bytes],
+        qos: int = 0,
+        retain: bool = False,
     ) -> None:
         """Publish a message to a topic."""
         if not topic:
             raise ValueError("Topic is required for publish().")
-        logger.debug(f"Publishing to {topic}: {payload}")
+        logger.debug("Publishing to %s: %s", topic, payload)
         self._client.publish(topic, payload, qos, retain)
 
     def subscribe(self, topic: str, callback: Callable) -> None:
         """Subscribe to a topic and set a callback for received messages."""
         if not topic:
             raise ValueError("Topic is required for subscribe().")
-        logger.info(f"Subscribing to topic: {topic}")
+        logger.info("Subscribing to topic: %s", topic)
         self._subscribed_topics = [topic]
         self._user_callback = callback
         if self._connected:
@@ -90,8 +171,6 @@ class DysonMQTTClient:
         :param topics: str or list of str
         :param callback: Optional custom callback. If None, print topic and payload.
         """
-        import signal
-
         if isinstance(topics, str):
             topics = [topics]
 
@@ -119,26 +198,7 @@ class DysonMQTTClient:
         :param value: True for ON, False for OFF
         :param topic: Optional override for the MQTT topic
         """
-        from blowcontrol.config import ROOT_TOPIC, SERIAL_NUMBER
-
-        if not topic:
-            if not ROOT_TOPIC:
-                raise ValueError("ROOT_TOPIC is required but not set.")
-            if not SERIAL_NUMBER:
-                raise ValueError("SERIAL_NUMBER is required but not set.")
-            topic = f"{ROOT_TOPIC}/{SERIAL_NUMBER}/command"
-        str_value = "ON" if value else "OFF"
-        now = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-        payload = {
-            "msg": "STATE-SET",
-            "mode-reason": "RAPP",
-            "time": now,
-            "data": {key: str_value},
-        }
-        import json
-
-        logger.info(f"Setting {key} to {str_value} on topic {topic}")
-        self.publish(topic, json.dumps(payload))
+        self.set_states({key: value}, topic)
 
     def set_numeric_state(
         self, key: str, value: str, topic: Optional[str] = None
@@ -149,27 +209,37 @@ class DysonMQTTClient:
         :param value: The value to set (e.g., '0005')
         :param topic: Optional override for the MQTT topic
         """
-        from blowcontrol.config import ROOT_TOPIC, SERIAL_NUMBER
+        self.set_states({key: value}, topic)
 
-        if not topic:
-            if not ROOT_TOPIC:
-                raise ValueError("ROOT_TOPIC is required but not set.")
-            if not SERIAL_NUMBER:
-                raise ValueError("SERIAL_NUMBER is required but not set.")
-            topic = f"{ROOT_TOPIC}/{SERIAL_NUMBER}/command"
-        import datetime
-
-        now = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-        payload = {
-            "msg": "STATE-SET",
-            "mode-reason": "RAPP",
-            "time": now,
-            "data": {key: value},
+    def set_states(
+        self, states: Dict[str, Union[bool, str]], topic: Optional[str] = None
+    ) -> None:
+        """
+        Set several states in a single STATE-SET publish.
+        :param states: Data keys and values; bools are sent as ON/OFF and
+            strings as-is (e.g., {'fpwr': True, 'fnsp': '0005'})
+        :param topic: Optional override for the MQTT topic
+        """
+        topic = topic or self._default_topic()
+        data = {
+            key: ("ON" if value else "OFF") if isinstance(value, bool) else value
+            for key, value in states.items()
         }
-        import json
-
-        logger.info(f"Setting {key} to {value} on topic {topic}")
-        self.publish(topic, json.dumps(payload))
+        now = _timestamp()
+        message: Optional[bytes] = None
+        if len(data) == 1:
+            ((key, value),) = data.items()
+            template = _STATE_SET_TEMPLATES.get((key, value))
+            if template is not None:
+                message = template % now.encode()
+            elif _PLAIN.match(key) and _PLAIN.match(value):
+                message = _STATE_SET_ONE % (now.encode(), key.encode(), value.encode())
+        if message is None:
+            message = json.dumps(
+                {"msg": "STATE-SET", "mode-reason": "RAPP", "time": now, "data": data}
+            ).encode()
+        logger.info("Setting %s on topic %s", data, topic)
+        self.publish(topic, message)
 
     def send_command(
         self,
@@ -184,31 +254,37 @@ class DysonMQTTClient:
         :param topic: Optional override for the MQTT topic
         :return: True if sent successfully, False otherwise
         """
-        import datetime
-        import json
-
-        from blowcontrol.config import ROOT_TOPIC, SERIAL_NUMBER
-
-        if not topic:
-            if not ROOT_TOPIC or not SERIAL_NUMBER:
-                raise ValueError("ROOT_TOPIC and SERIAL_NUMBER must be set.")
-            topic = f"{ROOT_TOPIC}/{SERIAL_NUMBER}/command"
-        now = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-        payload: dict[str, Any] = {"msg": msg_type, "mode-reason": "RAPP", "time": now}
-        if data:
-            payload["data"] = data
+        topic = topic or self._default_topic()
+        now = _timestamp()
+        if not data and _PLAIN.match(msg_type):
+            message = _COMMAND_NO_DATA % (msg_type.encode(), now.encode())
+        else:
+            payload: dict[str, Any] = {
+                "msg": msg_type,
+                "mode-reason": "RAPP",
+                "time": now,
+            }
+            if data:
+                payload["data"] = data
+            message = json.dumps(payload).encode()
 
         try:
-            logger.info(f"Sending {msg_type} command on topic {topic}")
+            logger.info("Sending %s command on topic %s", msg_type, topic)
             if data:
-                logger.debug(f"Command data: {data}")
+                logger.debug("Command data: %s", data)
 
-            self.publish(topic, json.dumps(payload))
+            self.publish(topic, message)
             return True
         except Exception as e:
-            logger.error(f"Failed to send {msg_type} command: {e}")
+            logger.error("Failed to send %s command: %s", msg_type, e)
             return False
 
+    def _default_topic(self) -> str:
+        """Return the device command topic resolved when the client was built."""
+        if self._command_topic is None:
+            raise ValueError("ROOT_TOPIC and SERIAL_NUMBER must be set.")
+        return self._command_topic
+
     def send_standalone_command(
         self,
         msg_type: str,
@@ -229,7 +305,7 @@ class DysonMQTTClient:
             self.disconnect()
             return result
         except Exception as e:
-            logger.error(f"Failed to send standalone {msg_type} command: {e}")
+            logger.error("Failed to send standalone %s command: %s", msg_type, e)
             return False
 
     def _on_connect(self, client: Any, userdata: Any, flags: Any, rc: int) -> None:
@@ -239,21 +315,19 @@ class DysonMQTTClient:
             # Subscribe to topics after (re)connect
             if self._subscribed_topics:
                 for topic in self._subscribed_topics:
-                    logger.info(f"(Re)subscribing to topic: {topic}")
+                    logger.info("(Re)subscribing to topic: %s", topic)
                     self._client.subscribe(topic)
             if self._user_callback:
                 self._client.on_message = self._user_callback
+            self._connected_event.set()
         else:
-            logger.error(f"Failed to connect to MQTT broker. Return code: {rc}")
+            logger.error("Failed to connect to MQTT broker. Return code: %s", rc)
 
     def _on_disconnect(self, client: Any, userdata: Any, rc: int) -> None:
         logger.info("Disconnected from MQTT broker.")
         self._connected = False
+        self._connected_event.clear()
 
     def _generate_client_id(self) -> str:
         """Generate a unique client ID for MQTT connections."""
-        # Generate a random string for uniqueness
-        random_suffix = "".join(
-            random.choices(string.ascii_lowercase + string.digits, k=8)
-        )
-        return f"blowcontrol-{random_suffix}"
+        return f"blowcontrol-{_process_tag()}-{next(_client_numbers):x}"
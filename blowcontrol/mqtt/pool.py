@@ -0,0 +1,93 @@
+"""
+MQTT connection pool for BlowControl.
+
+Hands out long-lived, already-connected DysonMQTTClient instances keyed by
+broker address and credentials, so each command is a single PUBLISH instead
+of a full CONNECT/PUBLISH/DISCONNECT cycle.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from blowcontrol.config import DEVICE_IP, MQTT_PASSWORD, MQTT_PORT, SERIAL_NUMBER
+from blowcontrol.mqtt.client import DysonMQTTClient
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Optional[str], int, Optional[str], Optional[str]]
+
+# Connections kept open at once; the least recently used one is closed beyond this
+MAX_POOLED_CLIENTS = 4
+
+_pool_lock = threading.Lock()
+_pool: Dict[PoolKey, DysonMQTTClient] = {}
+
+
+def health_check(client: DysonMQTTClient) -> None:
+    """Reconnect a pooled client whose broker connection has dropped."""
+    if not client.is_connected():
+        logger.info("Pooled MQTT client lost its connection, reconnecting...")
+        client.disconnect()
+        client.connect()
+
+
+def get_client(
+    device_ip: Optional[str] = DEVICE_IP,
+    port: int = MQTT_PORT,
+    serial_number: Optional[str] = SERIAL_NUMBER,
+    password: Optional[str] = MQTT_PASSWORD,
+) -> DysonMQTTClient:
+    """
+    Return a connected client for the given broker and credentials.
+
+    The first call for a key creates and connects the client; later calls
+    reuse it after a health check. At most MAX_POOLED_CLIENTS stay connected,
+    evicting the least recently used. Pooled clients are disconnected at exit.
+    """
+    key = (device_ip, port, serial_number, password)
+    evicted: List[DysonMQTTClient] = []
+    with _pool_lock:
+        # Re-inserted on every hit so dict order tracks recency
+        client = _pool.pop(key, None)
+        if client is None:
+            client = DysonMQTTClient(
+                device_ip=device_ip,
+                port=port,
+                serial_number=serial_number,
+                password=password,
+            )
+            client.connect()
+        else:
+            health_check(client)
+        _pool[key] = client
+        while len(_pool) > MAX_POOLED_CLIENTS:
+            evicted.append(_pool.pop(next(iter(_pool))))
+    _disconnect(evicted)
+    return client
+
+
+def get_pooled_client() -> DysonMQTTClient:
+    """Return the pooled client for the configured device."""
+    return get_client()
+
+
+def close_all() -> None:
+    """Disconnect and forget every pooled client."""
+    with _pool_lock:
+        clients = list(_pool.values())
+        _pool.clear()
+    _disconnect(clients)
+
+
+def _disconnect(clients: List[DysonMQTTClient]) -> None:
+    """Disconnect clients that have left the pool, outside the pool lock."""
+    for client in clients:
+        try:
+            client.disconnect()
+        except Exception as e:
+            logger.warning("Error disconnecting pooled client: %s", e)
+
+
+atexit.register(close_all)
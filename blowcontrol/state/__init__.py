@@ -6,8 +6,37 @@ Classes and utilities for managing, monitoring, and displaying Dyson device stat
 Classes:
     DeviceStatePrinter: Format device state for human consumption
     DeviceStateListener: Thread-safe background state monitoring
+
+Functions:
+    get_state_cached: Fetch device state, reusing a recent result
+    peek_state_cached: Return a recent state without fetching
+    invalidate_state_cache: Drop the cached state after a STATE-SET
 """
 
-from .device_state import DeviceStateListener, DeviceStatePrinter
+from typing import TYPE_CHECKING
+
+from blowcontrol._lazy import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .cache import get_state_cached, invalidate_state_cache, peek_state_cached
+    from .device_state import DeviceStateListener, DeviceStatePrinter
+
+# Public name -> submodule that defines it, imported on first access
+_LAZY_ATTRS = {
+    "get_state_cached": ".cache",
+    "invalidate_state_cache": ".cache",
+    "peek_state_cached": ".cache",
+    "DeviceStateListener": ".device_state",
+    "DeviceStatePrinter": ".device_state",
+}
+
+__all__ = [
+    "DeviceStatePrinter",
+    "DeviceStateListener",
+    "get_state_cached",
+    "invalidate_state_cache",
+    "peek_state_cached",
+]
+
 
-__all__ = ["DeviceStatePrinter", "DeviceStateListener"]
+__getattr__, __dir__ = lazy_module_attrs(__name__, globals(), _LAZY_ATTRS)
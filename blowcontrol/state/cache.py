@@ -0,0 +1,68 @@
+"""
+Short-lived cache of the device state fetched over MQTT.
+
+Lets a burst of commands (e.g. set width, then set direction) share one
+REQUEST-CURRENT-STATE round-trip. Successful STATE-SET commands invalidate
+the cache so a stale state is never returned.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from blowcontrol.async_runtime import run_coro
+
+# Default time-to-live for a cached state, in seconds
+STATE_CACHE_TTL = 0.5
+
+_cached_ts = 0.0
+_cached_value: Optional[Dict[str, Any]] = None
+_cache_lock = threading.Lock()
+
+
+def get_state_cached(ttl: float = STATE_CACHE_TTL) -> Optional[Dict[str, Any]]:
+    """
+    Return the device state, fetching it only if the cached copy has expired.
+
+    Args:
+        ttl: Maximum age in seconds of a cached state before it is refetched
+
+    Returns:
+        The async_get_state() result dict, or None if nothing was received.
+        Only results that contain a device state are cached.
+    """
+    global _cached_ts, _cached_value
+    from blowcontrol.mqtt.async_client import async_get_state
+
+    with _cache_lock:
+        if _cached_value is not None and time.monotonic() - _cached_ts < ttl:
+            return _cached_value
+
+    state_result = run_coro(async_get_state(quiet=True))
+
+    if state_result and state_result.get("state"):
+        with _cache_lock:
+            _cached_value = state_result
+            _cached_ts = time.monotonic()
+    return state_result
+
+
+def peek_state_cached(ttl: float = STATE_CACHE_TTL) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached state if it is still fresh, without fetching.
+
+    Used to skip commands that would not change anything; a cache miss just
+    means the command is sent.
+    """
+    with _cache_lock:
+        if time.monotonic() - _cached_ts < ttl:
+            return _cached_value
+    return None
+
+
+def invalidate_state_cache() -> None:
+    """Drop the cached state; called after every successful STATE-SET."""
+    global _cached_ts, _cached_value
+    with _cache_lock:
+        _cached_value = None
+        _cached_ts = 0.0
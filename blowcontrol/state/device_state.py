@@ -2,13 +2,80 @@
 Device state pretty printer and thread-safe listener for Dyson2MQTT app.
 """
 
-import json
+import bisect
+import logging
+import sys
 import threading
 import time
-from typing import Any, Dict, Optional
-
-from blowcontrol.config import ROOT_TOPIC, SERIAL_NUMBER
+from typing import Any, Callable, Dict, Optional
+
+from blowcontrol.config import (
+    ROOT_TOPIC,
+    SERIAL_NUMBER,
+    STATUS_CURRENT_TOPIC,
+    STATUS_FAULT_TOPIC,
+)
 from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Message types the listener applies; payloads naming none of them are skipped
+# before decoding
+_LISTENER_MESSAGE_TYPES = (
+    b'"CURRENT-STATE"',
+    b'"STATE-CHANGE"',
+    b'"ENVIRONMENTAL-CURRENT-SENSOR-DATA"',
+)
+
+
+def _format_micrograms(value: int) -> str:
+    return f"{value} μg/m³"
+
+
+def _format_degrees(value: int) -> str:
+    return f"{value}°"
+
+
+def _format_fan_speed(value: int) -> str:
+    return f"{value}/10"
+
+
+def _format_minutes(value: int) -> str:
+    hours, mins = divmod(value, 60)
+    if hours > 0:
+        return f"{hours}h {mins}m"
+    return f"{mins}m"
+
+
+def _format_percent(value: int) -> str:
+    return f"{value}%"
+
+
+# Lower bounds (dBm, inclusive) of each signal label after the first
+_RSSI_THRESHOLDS = (-50, -40, -30)
+_RSSI_LABELS = ("Poor", "Fair", "Good", "Excellent")
+
+
+def _format_signal(value: int) -> str:
+    strength = _RSSI_LABELS[bisect.bisect_right(_RSSI_THRESHOLDS, value)]
+    return f"{value} dBm ({strength})"
+
+
+# Keys with a unit or special layout, mapped to a formatter for the numeric value
+_FORMATTERS: Dict[str, Callable[[int], str]] = {
+    "pm25": _format_micrograms,
+    "pm10": _format_micrograms,
+    "p25r": _format_micrograms,
+    "p10r": _format_micrograms,
+    "osal": _format_degrees,
+    "osau": _format_degrees,
+    "apos": _format_degrees,
+    "fnsp": _format_fan_speed,
+    "sltm": _format_minutes,
+    "hflr": _format_percent,
+    "rssi": _format_signal,
+}
 
 
 class DeviceStatePrinter:
@@ -59,209 +126,144 @@ class DeviceStatePrinter:
     @staticmethod
     def format_value(key: str, value: str) -> str:
         """Format parameter values with units and descriptions."""
-        if key in ["pm25", "pm10", "p25r", "p10r"]:
-            # Convert to integer and add μg/m³ unit
-            try:
-                num_val = int(value)
-                return f"{num_val} μg/m³"
-            except (ValueError, TypeError):
-                return str(value)
-        elif key in ["osal", "osau", "apos"]:
-            # Convert angles to degrees
-            try:
-                angle = int(value)
-                return f"{angle}°"
-            except (ValueError, TypeError):
-                return str(value)
-        elif key == "fnsp":
-            # Format fan speed
-            if value == "AUTO":
-                return "AUTO"
-            try:
-                speed = int(value)
-                return f"{speed}/10"
-            except (ValueError, TypeError):
-                return str(value)
-        elif key == "sltm":
-            # Format sleep timer
-            if value == "OFF":
-                return "OFF"
-            try:
-                minutes = int(value)
-                hours = minutes // 60
-                mins = minutes % 60
-                if hours > 0:
-                    return f"{hours}h {mins}m"
-                else:
-                    return f"{mins}m"
-            except (ValueError, TypeError):
-                return str(value)
-        elif key == "hflr":
-            # Format filter life as percentage
-            try:
-                pct = int(value)
-                return f"{pct}%"
-            except (ValueError, TypeError):
-                return str(value)
-        elif key == "rssi":
-            # Format signal strength
-            try:
-                dbm = int(value)
-                if dbm >= -30:
-                    strength = "Excellent"
-                elif dbm >= -40:
-                    strength = "Good"
-                elif dbm >= -50:
-                    strength = "Fair"
-                else:
-                    strength = "Poor"
-                return f"{dbm} dBm ({strength})"
-            except (ValueError, TypeError):
-                return str(value)
-        else:
+        formatter = _FORMATTERS.get(key)
+        if formatter is None:
             return str(value)
+        try:
+            return formatter(int(value))
+        except (ValueError, TypeError):
+            # Non-numeric values such as AUTO, OFF or INV are shown as-is
+            return str(value)
+
+    # "  Description         : " label for every known key, padded once here
+    _DESC_PREFIX = {key: f"  {desc:<20}: " for key, desc in PARAM_DESCRIPTIONS.items()}
+
+    # Fixed lines, newline included; each print_* method joins its lines and
+    # writes them to stdout in one call
+    _RULE = "=" * 50 + "\n"
+    _SUBRULE = "-" * 25 + "\n"
+
+    # (heading block, keys) for each product-state section of print_current_state
+    _STATE_SECTIONS = tuple(
+        ("\n" + heading + "\n" + "-" * 25 + "\n", keys)
+        for heading, keys in (
+            ("🔋 POWER & OPERATION", ("fpwr", "fnst", "fnsp", "auto")),
+            ("🌬️  AIR QUALITY & MODES", ("nmod", "sltm", "rhtm")),
+            ("🔄 OSCILLATION & DIRECTION", ("oscs", "oson", "osal", "osau", "ancp")),
+            ("🔧 FILTER STATUS", ("hflr", "hflt", "cflr", "cflt")),
+        )
+    )
+    _NETWORK_HEADING = "\n📡 NETWORK INFORMATION\n" + _SUBRULE
+    _NETWORK_KEYS = ("rssi", "channel")
+    _ENVIRONMENTAL_KEYS = ("pm25", "pm10", "p25r", "p10r", "sltm")
+
+    @staticmethod
+    def _line(key: str, value: Any) -> str:
+        """Return the labelled, formatted line for one parameter."""
+        prefix = DeviceStatePrinter._DESC_PREFIX.get(key) or f"  {key:<20}: "
+        return prefix + DeviceStatePrinter.format_value(key, value) + "\n"
 
     @staticmethod
     def print_current_state(msg: dict) -> None:
         """Print comprehensive current state with all parameters."""
         ps = msg.get("product-state", {})
-        print("\n" + "=" * 50)
-        print("           DYSON DEVICE STATE")
-        print("=" * 50)
-
-        # Power & Operation Section
-        print("\n🔋 POWER & OPERATION")
-        print("-" * 25)
-        for key in ["fpwr", "fnst", "fnsp", "auto"]:
-            if key in ps:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, ps[key])
-                print(f"  {desc:<20}: {value}")
-
-        # Air Quality & Modes Section
-        print("\n🌬️  AIR QUALITY & MODES")
-        print("-" * 25)
-        for key in ["nmod", "sltm", "rhtm"]:
-            if key in ps:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, ps[key])
-                print(f"  {desc:<20}: {value}")
-
-        # Oscillation & Direction Section
-        print("\n🔄 OSCILLATION & DIRECTION")
-        print("-" * 25)
-        for key in ["oscs", "oson", "osal", "osau", "ancp"]:
-            if key in ps:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, ps[key])
-                print(f"  {desc:<20}: {value}")
-
-        # Filter Status Section
-        print("\n🔧 FILTER STATUS")
-        print("-" * 25)
-        for key in ["hflr", "hflt", "cflr", "cflt"]:
-            if key in ps:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, ps[key])
-                print(f"  {desc:<20}: {value}")
-
-        # Network Information Section
-        print("\n📡 NETWORK INFORMATION")
-        print("-" * 25)
-        for key in ["rssi", "channel"]:
-            if key in msg:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, msg[key])
-                print(f"  {desc:<20}: {value}")
+        line = DeviceStatePrinter._line
+        rule = DeviceStatePrinter._RULE
+        parts = ["\n", rule, "           DYSON DEVICE STATE\n", rule]
+
+        for heading, keys in DeviceStatePrinter._STATE_SECTIONS:
+            parts.append(heading)
+            parts.extend(line(key, ps[key]) for key in keys if key in ps)
+
+        # Network details sit at the top level of the message
+        parts.append(DeviceStatePrinter._NETWORK_HEADING)
+        parts.extend(
+            line(key, msg[key])
+            for key in DeviceStatePrinter._NETWORK_KEYS
+            if key in msg
+        )
 
         # Device Information
-        print("\n📱 DEVICE INFORMATION")
-        print("-" * 25)
+        parts.append("\n📱 DEVICE INFORMATION\n" + DeviceStatePrinter._SUBRULE)
         if "time" in msg:
-            print(f"  {'Last Update':<20}: {msg['time']}")
+            parts.append(f"  {'Last Update':<20}: {msg['time']}\n")
         if "mode-reason" in msg:
-            print(f"  {'Mode Reason':<20}: {msg['mode-reason']}")
+            parts.append(f"  {'Mode Reason':<20}: {msg['mode-reason']}\n")
         if "state-reason" in msg:
-            print(f"  {'State Reason':<20}: {msg['state-reason']}")
+            parts.append(f"  {'State Reason':<20}: {msg['state-reason']}\n")
 
-        print("=" * 50 + "\n")
+        parts.append(rule + "\n")
+        sys.stdout.write("".join(parts))
 
     @staticmethod
     def print_state_change(msg: dict) -> None:
         """Print state changes with before/after values."""
         ps = msg.get("product-state", {})
-        print("\n" + "=" * 50)
-        print("         DYSON STATE CHANGE")
-        print("=" * 50)
+        format_value = DeviceStatePrinter.format_value
+        rule = DeviceStatePrinter._RULE
+        parts = ["\n", rule, "         DYSON STATE CHANGE\n", rule]
 
-        changes = []
         for key, value in ps.items():
-            if isinstance(value, list) and len(value) == 2:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                old_val = DeviceStatePrinter.format_value(key, value[0])
-                new_val = DeviceStatePrinter.format_value(key, value[1])
-                changes.append((desc, old_val, new_val))
+            prefix = DeviceStatePrinter._DESC_PREFIX.get(key) or f"  {key:<20}: "
+            if type(value) is list and len(value) == 2:
+                old_val = format_value(key, value[0])
+                new_val = format_value(key, value[1])
             else:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                val = DeviceStatePrinter.format_value(key, value)
-                changes.append((desc, "?", val))
-
-        for desc, old_val, new_val in changes:
+                old_val, new_val = "?", format_value(key, value)
             if old_val != new_val:
-                print(f"  {desc:<20}: {old_val} → {new_val}")
+                parts.append(f"{prefix}{old_val} → {new_val}\n")
             else:
-                print(f"  {desc:<20}: {new_val}")
+                parts.append(f"{prefix}{new_val}\n")
 
         if "time" in msg:
-            print(f"\n  {'Time':<20}: {msg['time']}")
-        print("=" * 50 + "\n")
+            parts.append(f"\n  {'Time':<20}: {msg['time']}\n")
+        parts.append(rule + "\n")
+        sys.stdout.write("".join(parts))
 
     @staticmethod
     def print_environmental(msg: dict) -> None:
         """Print environmental sensor data with proper formatting."""
         data = msg.get("data", {})
-        print("\n" + "=" * 50)
-        print("       ENVIRONMENTAL SENSOR DATA")
-        print("=" * 50)
-
-        print("\n🌡️  AIR QUALITY MEASUREMENTS")
-        print("-" * 30)
-
-        for key in ["pm25", "pm10", "p25r", "p10r"]:
-            if key in data:
-                desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get(key, key)
-                value = DeviceStatePrinter.format_value(key, data[key])
-                print(f"  {desc:<20}: {value}")
-
-        # Sleep timer in environmental data
-        if "sltm" in data:
-            desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get("sltm", "sltm")
-            value = DeviceStatePrinter.format_value("sltm", data["sltm"])
-            print(f"  {desc:<20}: {value}")
+        rule = DeviceStatePrinter._RULE
+        parts = ["\n", rule, "       ENVIRONMENTAL SENSOR DATA\n", rule]
+        parts.append("\n🌡️  AIR QUALITY MEASUREMENTS\n" + "-" * 30 + "\n")
+
+        # Particle readings, then the sleep timer the sensor message also carries
+        parts.extend(
+            DeviceStatePrinter._line(key, data[key])
+            for key in DeviceStatePrinter._ENVIRONMENTAL_KEYS
+            if key in data
+        )
 
         if "time" in msg:
-            print(f"\n  {'Time':<20}: {msg['time']}")
-        print("=" * 50 + "\n")
+            parts.append(f"\n  {'Time':<20}: {msg['time']}\n")
+        parts.append(rule + "\n")
+        sys.stdout.write("".join(parts))
 
     @staticmethod
     def print_location(msg: dict) -> None:
         """Print device location/position information."""
-        print("\n" + "=" * 50)
-        print("         DEVICE LOCATION")
-        print("=" * 50)
+        rule = DeviceStatePrinter._RULE
+        parts = ["\n", rule, "         DEVICE LOCATION\n", rule]
 
         if "apos" in msg:
-            desc = DeviceStatePrinter.PARAM_DESCRIPTIONS.get("apos", "apos")
-            value = DeviceStatePrinter.format_value("apos", msg["apos"])
-            print(f"  {desc:<20}: {value}")
+            parts.append(DeviceStatePrinter._line("apos", msg["apos"]))
 
         if "time" in msg:
-            print(f"  {'Time':<20}: {msg['time']}")
-        print("=" * 50 + "\n")
+            parts.append(f"  {'Time':<20}: {msg['time']}\n")
+        parts.append(rule + "\n")
+        sys.stdout.write("".join(parts))
 
     @staticmethod
-    def print_any_message(msg: dict) -> None:
-        """Smart printer that detects message type and formats appropriately."""
+    def print_any_message(msg: dict, raw_payload: Optional[bytes] = None) -> None:
+        """
+        Smart printer that detects message type and formats appropriately.
+
+        Args:
+            msg: The decoded message
+            raw_payload: The message as received; unknown types print it as-is
+                instead of re-serialising msg
+        """
         msg_type = msg.get("msg", "UNKNOWN")
 
         if msg_type == "CURRENT-STATE":
@@ -274,9 +276,17 @@ class DeviceStatePrinter:
             DeviceStatePrinter.print_location(msg)
         else:
             # Fallback for unknown message types
-            print(f"\n=== {msg_type} ===")
-            print(json.dumps(msg, indent=2))
-            print("=" * (len(msg_type) + 8) + "\n")
+            if raw_payload is not None:
+                body = raw_payload.decode(errors="replace")
+            else:
+                body = json_codec.dumps(msg)
+            sys.stdout.write(
+                f"\n=== {msg_type} ===\n"
+                + body
+                + "\n"
+                + "=" * (len(msg_type) + 8)
+                + "\n\n"
+            )
 
 
 class DeviceStateListener:
@@ -284,6 +294,18 @@ class DeviceStateListener:
     Thread-safe MQTT listener that maintains the latest device state.
     """
 
+    __slots__ = (
+        "_lock",
+        "_current_state",
+        "_environmental_data",
+        "_last_update",
+        "_client",
+        "_listener_thread",
+        "_stop_event",
+        "_running",
+        "_state_ready",
+    )
+
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._current_state: Optional[Dict[str, Any]] = None
@@ -293,48 +315,51 @@ class DeviceStateListener:
         self._listener_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._running = False
+        # Set once the first CURRENT-STATE has been stored
+        self._state_ready = threading.Event()
 
     def _mqtt_callback(self, client: Any, userdata: Any, msg: Any) -> None:
         """Handle incoming MQTT messages and update state safely."""
-        print(
-            f"[DeviceStateListener] DEBUG: Received message on {msg.topic}: "
-            f"{msg.payload}"
-        )
+        logger.debug("Received message on %s: %s", msg.topic, msg.payload)
+        payload = msg.payload
+        if not any(msg_type in payload for msg_type in _LISTENER_MESSAGE_TYPES):
+            return
         try:
-            data = json.loads(msg.payload.decode(errors="replace"))
+            data = json_codec.loads(payload)
             msg_type = data.get("msg")
 
             with self._lock:
                 if msg_type == "CURRENT-STATE":
                     self._current_state = data
                     self._last_update = time.time()
-                    print("[DeviceStateListener] Updated current state")
+                    self._state_ready.set()
+                    logger.info("Updated current state")
                 elif msg_type == "STATE-CHANGE":
-                    # Update current state with changes
-                    if self._current_state and "product-state" in data:
-                        if "product-state" not in self._current_state:
-                            self._current_state["product-state"] = {}
-
-                        # Apply state changes
-                        for key, value in data["product-state"].items():
-                            if isinstance(value, list) and len(value) == 2:
-                                # State change format: [old, new]
-                                self._current_state["product-state"][key] = value[1]
-                            else:
-                                self._current_state["product-state"][key] = value
-
-                        self._current_state["time"] = data.get("time")
+                    # Build an updated copy and swap it in, so snapshots already
+                    # handed to readers never change under them
+                    changes = data.get("product-state")
+                    if self._current_state and changes is not None:
+                        state = dict(self._current_state)
+                        product_state = dict(state.get("product-state", {}))
+                        # Changed keys arrive as [old, new]; keep the new value
+                        for key, value in changes.items():
+                            product_state[key] = (
+                                value[-1] if type(value) is list else value
+                            )
+                        state["product-state"] = product_state
+                        state["time"] = data.get("time")
+                        self._current_state = state
                         self._last_update = time.time()
-                        print("[DeviceStateListener] Applied state change")
+                        logger.info("Applied state change")
                 elif msg_type == "ENVIRONMENTAL-CURRENT-SENSOR-DATA":
                     self._environmental_data = data
                     self._last_update = time.time()
-                    print("[DeviceStateListener] Updated environmental data")
+                    logger.info("Updated environmental data")
                 else:
-                    print(f"[DeviceStateListener] Unknown message type: {msg_type}")
+                    logger.debug("Unknown message type: %s", msg_type)
 
         except Exception as e:
-            print(f"[DeviceStateListener] Parse error: {e}")
+            logger.warning("Parse error: %s", e)
 
     def start(self) -> bool:
         """Start the listener in a background thread."""
@@ -347,29 +372,23 @@ class DeviceStateListener:
         try:
             self._client = DysonMQTTClient(client_id="d2mqtt-statelistener")
             topics = [
-                f"{ROOT_TOPIC}/{SERIAL_NUMBER}/status/current",
-                f"{ROOT_TOPIC}/{SERIAL_NUMBER}/status/fault",
+                STATUS_CURRENT_TOPIC,
+                STATUS_FAULT_TOPIC,
             ]
 
             def listener_worker() -> None:
                 try:
-                    print("[DeviceStateListener] Starting listener worker...")
+                    logger.info("Starting listener worker...")
 
                     # Start the listener in the background
-                    import threading
-
                     def delayed_request() -> None:
                         # Wait a few seconds for connection to establish
                         time.sleep(3)
-                        print(
-                            "[DeviceStateListener] Sending " "REQUEST-CURRENT-STATE..."
-                        )
+                        logger.info("Sending REQUEST-CURRENT-STATE...")
                         try:
                             self._client.send_command("REQUEST-CURRENT-STATE")
                         except Exception as e:
-                            print(
-                                f"[DeviceStateListener] Error sending request: " f"{e}"
-                            )
+                            logger.error("Error sending request: %s", e)
 
                     # Start the delayed request in a separate thread
                     request_thread = threading.Thread(
@@ -380,7 +399,7 @@ class DeviceStateListener:
                     # Use the working subscribe_and_listen pattern
                     self._client.subscribe_and_listen(topics, self._mqtt_callback)
                 except Exception as e:
-                    print(f"[DeviceStateListener] Error: {e}")
+                    logger.error("Listener error: %s", e)
 
             self._stop_event.clear()
             self._listener_thread = threading.Thread(
@@ -394,7 +413,7 @@ class DeviceStateListener:
             return True
 
         except Exception as e:
-            print(f"[DeviceStateListener] Failed to start: {e}")
+            logger.error("Failed to start: %s", e)
             return False
 
     def stop(self) -> None:
@@ -407,19 +426,17 @@ class DeviceStateListener:
         self._running = False
 
     def get_current_state(self) -> Optional[Dict[str, Any]]:
-        """Get the latest device state (thread-safe)."""
-        with self._lock:
-            return self._current_state.copy() if self._current_state else None
+        """Get a snapshot of the latest device state; treat it as read-only."""
+        # No lock needed: updates swap in a new dict instead of mutating this one
+        return self._current_state or None
 
     def get_environmental_data(self) -> Optional[Dict[str, Any]]:
-        """Get the latest environmental data (thread-safe)."""
-        with self._lock:
-            return self._environmental_data.copy() if self._environmental_data else None
+        """Get a snapshot of the latest environmental data; treat it as read-only."""
+        return self._environmental_data or None
 
     def get_last_update_time(self) -> Optional[float]:
-        """Get the timestamp of the last update (thread-safe)."""
-        with self._lock:
-            return self._last_update
+        """Get the timestamp of the last update."""
+        return self._last_update
 
     def is_running(self) -> bool:
         """Check if the listener is running."""
@@ -427,9 +444,4 @@ class DeviceStateListener:
 
     def wait_for_state(self, timeout: float = 10) -> bool:
         """Wait for initial state to be received."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if self.get_current_state():
-                return True
-            time.sleep(0.1)
-        return False
+        return self._state_ready.wait(timeout)
@@ -2,7 +2,23 @@
 Utility functions for BlowControl.
 """
 
-from typing import Any
+from typing import Any, Dict
+
+_BOOL_MAP: Dict[str, bool] = {
+    "true": True,
+    "t": True,
+    "1": True,
+    "on": True,
+    "yes": True,
+    "y": True,
+    "false": False,
+    "f": False,
+    "0": False,
+    "off": False,
+    "no": False,
+    "n": False,
+}
+_INT_BOOL_MAP: Dict[int, bool] = {1: True, 0: False}
 
 
 def parse_boolean(value: Any) -> bool:
@@ -30,22 +46,13 @@ def parse_boolean(value: Any) -> bool:
     if isinstance(value, bool):
         return value
 
-    if isinstance(value, str):
-        value_lower = value.lower().strip()
-
-        # True values
-        if value_lower in ("true", "t", "1", "on", "yes", "y"):
-            return True
-
-        # False values
-        if value_lower in ("false", "f", "0", "off", "no", "n"):
-            return False
-
-    elif isinstance(value, int):
-        if value == 1:
-            return True
-        elif value == 0:
-            return False
+    try:
+        if isinstance(value, str):
+            return _BOOL_MAP[value.strip().lower()]
+        if isinstance(value, int):
+            return _INT_BOOL_MAP[value]
+    except KeyError:
+        pass
 
     raise ValueError(
         f"Cannot parse '{value}' as boolean. Supported formats: true/false, t/f, 1/0, on/off, yes/no, y/n"
@@ -0,0 +1,43 @@
+"""
+JSON encode/decode helpers for BlowControl.
+
+Uses orjson when it is installed (``pip install blowcontrol[fast]``) and
+falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    # unused-ignore: without orjson's stubs the module is already Any
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode(errors="replace")
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = True) -> str:
+    """
+    Encode an object as JSON.
+
+    Args:
+        obj: The object to encode
+        pretty: Indent by two spaces; otherwise emit compact single-line JSON
+
+    Returns:
+        The JSON document as a str.
+    """
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        return encoded.decode()
+    if pretty:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
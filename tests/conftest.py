@@ -142,3 +142,13 @@ def mock_logger():
         mock_logger = Mock()
         mock_get_logger.return_value = mock_logger
         yield mock_logger
+
+
+@pytest.fixture(autouse=True)
+def clear_state_cache():
+    """Keep the device state cache from leaking between tests."""
+    from blowcontrol.state.cache import invalidate_state_cache
+
+    invalidate_state_cache()
+    yield
+    invalidate_state_cache()
@@ -2,109 +2,83 @@
 Integration tests for CLI interface.
 """
 
+import json
+import logging
 from io import StringIO
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
-from blowcontrol.cli import main
+from blowcontrol.cli import (
+    _fast_parse_args,
+    main,
+    output_result,
+    validate_fan_speed_input,
+    validate_oscillation_heading,
+)
+from blowcontrol.commands.oscillation import OscillationResult
 
 
 class TestCLI:
     """Test CLI interface functionality."""
 
     def test_cli_help(self):
-        """Test CLI help output."""
-        with patch("sys.argv", ["blowcontrol", "--help"]):
+        """Test that top-level help is printed without building argparse."""
+        for argv in (["blowcontrol", "--help"], ["blowcontrol"]):
+            with patch("sys.argv", argv):
+                with patch("blowcontrol.cli._build_parser") as mock_build:
+                    with patch("sys.stdout", StringIO()) as mock_stdout:
+                        with pytest.raises(SystemExit) as exc_info:
+                            main()
+            assert exc_info.value.code == 0
+            mock_build.assert_not_called()
+            output = mock_stdout.getvalue()
+            assert output.startswith("usage: blowcontrol")
+            assert "Set oscillation direction" in output
+            assert "EXIT CODES:" in output
+
+    def test_cli_command_help(self):
+        """Test that command help still comes from argparse."""
+        with patch("sys.argv", ["blowcontrol", "power", "--help"]):
             with patch("argparse.ArgumentParser.print_help") as mock_help:
-                # This will raise SystemExit when --help is used
                 with pytest.raises(SystemExit):
                     main()
                 mock_help.assert_called_once()
 
-    def test_cli_no_command(self):
-        """Test CLI with no command specified."""
-        with patch("sys.argv", ["blowcontrol"]):
-            with pytest.raises(SystemExit):
-                main()
-
-    @patch("blowcontrol.cli.set_power")
-    def test_cli_power_on(self, mock_set_power):
-        """Test CLI power on command."""
-        mock_set_power.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "power", "on"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Power set to ON" in output
-                mock_set_power.assert_called_once_with("on")
-
-    @patch("blowcontrol.cli.set_power")
-    def test_cli_power_off(self, mock_set_power):
-        """Test CLI power off command."""
-        mock_set_power.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "power", "off"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Power set to OFF" in output
-                mock_set_power.assert_called_once_with("off")
-
-    @patch("blowcontrol.cli.set_fan_speed")
-    def test_cli_speed(self, mock_set_speed):
-        """Test CLI speed command."""
-        mock_set_speed.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "speed", "5"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Fan speed set to 5" in output
-                mock_set_speed.assert_called_once_with(5)
-
-    @patch("blowcontrol.cli.set_auto_mode")
-    def test_cli_auto_on(self, mock_set_auto):
-        """Test CLI auto mode on command."""
-        mock_set_auto.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "auto", "on"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Auto mode set to ON" in output
-                mock_set_auto.assert_called_once_with("on")
-
-    @patch("blowcontrol.cli.set_night_mode")
-    def test_cli_night_on(self, mock_set_night):
-        """Test CLI night mode on command."""
-        mock_set_night.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "night", "on"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Night mode set to ON" in output
-                mock_set_night.assert_called_once_with("on")
+    @pytest.mark.parametrize(
+        "argv, setter, called_with, message",
+        [
+            (["power", "on"], "power.set_power", True, "Power set to ON"),
+            (["power", "off"], "power.set_power", False, "Power set to OFF"),
+            # Any boolean spelling is accepted and shown as ON/OFF
+            (["power", "yes"], "power.set_power", True, "Power set to ON"),
+            (["speed", "5"], "fan_speed.set_fan_speed", 5, "Fan speed set to 5"),
+            (["auto", "on"], "auto_mode.set_auto_mode", True, "Auto mode set to ON"),
+            (
+                ["night", "on"],
+                "night_mode.set_night_mode",
+                True,
+                "Night mode set to ON",
+            ),
+            (
+                ["timer", "30"],
+                "sleep_timer.set_sleep_timer",
+                "30",
+                "Sleep timer set to 30",
+            ),
+        ],
+    )
+    def test_cli_command(self, argv, setter, called_with, message):
+        """Test that each command calls its setter and reports success."""
+        with patch(f"blowcontrol.commands.{setter}", return_value=True) as mock_set:
+            with patch("sys.argv", ["blowcontrol", *argv]):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    main()
 
-    @patch("blowcontrol.cli.set_sleep_timer")
-    def test_cli_timer(self, mock_set_timer):
-        """Test CLI timer command."""
-        mock_set_timer.return_value = True
-
-        with patch("sys.argv", ["blowcontrol", "timer", "30"]):
-            with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert "✓" in output
-                assert "Sleep timer set to 30" in output
-                mock_set_timer.assert_called_once_with("30")
+        output = mock_stdout.getvalue()
+        assert "✓" in output
+        assert message in output
+        mock_set.assert_called_once_with(called_with)
 
     def test_cli_invalid_speed(self):
         """Test CLI with invalid speed."""
@@ -121,7 +95,40 @@ class TestCLI:
                 with pytest.raises(SystemExit):
                     main()
 
-    @patch("blowcontrol.cli.set_power")
+    @patch("blowcontrol.commands.power.set_power")
+    def test_cli_invalid_power_state_message(self, mock_set_power):
+        """Test that unparseable input is reported without calling the setter."""
+        with patch("sys.argv", ["blowcontrol", "power", "maybe"]):
+            with patch("sys.stdout", StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert "✗ Invalid power state: Cannot parse" in mock_stdout.getvalue()
+        assert exc_info.value.code == 1
+        mock_set_power.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "argv, setter, action",
+        [
+            (["power", "on"], "power.set_power", "set power"),
+            (["speed", "5"], "fan_speed.set_fan_speed", "set fan speed"),
+            (["auto", "on"], "auto_mode.set_auto_mode", "set auto mode"),
+            (["night", "on"], "night_mode.set_night_mode", "set night mode"),
+            (["timer", "30"], "sleep_timer.set_sleep_timer", "set sleep timer"),
+        ],
+    )
+    def test_cli_command_exception(self, argv, setter, action):
+        """Test that unexpected errors are reported as failures."""
+        error = RuntimeError("Connection refused")
+        with patch(f"blowcontrol.commands.{setter}", side_effect=error):
+            with patch("sys.argv", ["blowcontrol", *argv]):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    with pytest.raises(SystemExit) as exc_info:
+                        main()
+
+        assert f"✗ Failed to {action}: Connection refused" in mock_stdout.getvalue()
+        assert exc_info.value.code == 1
+
+    @patch("blowcontrol.commands.power.set_power")
     def test_cli_json_output(self, mock_set_power):
         """Test CLI JSON output format."""
         mock_set_power.return_value = True
@@ -129,23 +136,24 @@ class TestCLI:
         with patch("sys.argv", ["blowcontrol", "power", "on", "--json"]):
             with patch("sys.stdout", StringIO()) as mock_stdout:
                 main()
-                output = mock_stdout.getvalue()
-                assert '"success": true' in output
-                assert '"message"' in output
+                output = json.loads(mock_stdout.getvalue())
+                assert output["success"] is True
+                assert "message" in output
 
-    @patch("blowcontrol.cli.set_power")
+    @patch("blowcontrol.commands.power.set_power")
     def test_cli_error_json_output(self, mock_set_power):
         """Test CLI JSON output format for errors."""
         mock_set_power.return_value = False
 
         with patch("sys.argv", ["blowcontrol", "power", "on", "--json"]):
             with patch("sys.stdout", StringIO()) as mock_stdout:
-                main()
-                output = mock_stdout.getvalue()
-                assert (
-                    '"success": false' in output
-                )  # The CLI shows failure when command fails
-                assert '"message"' in output
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                output = json.loads(mock_stdout.getvalue())
+                # The CLI shows failure when command fails
+                assert output["success"] is False
+                assert "message" in output
+        assert exc_info.value.code == 1
 
     def test_cli_debug_flag(self):
         """Test CLI debug flag."""
@@ -155,6 +163,141 @@ class TestCLI:
                     main()
                 mock_help.assert_called_once()
 
+    @patch("blowcontrol.commands.power.set_power")
+    def test_cli_debug_sets_root_level(self, mock_set_power):
+        """Test that --debug lowers the root logger level to INFO."""
+        mock_set_power.return_value = True
+        root = logging.getLogger()
+        saved_level = root.level
+
+        try:
+            with patch("sys.stdout", StringIO()):
+                with patch("sys.argv", ["blowcontrol", "--debug", "power", "on"]):
+                    main()
+                assert root.level == logging.INFO
+
+                with patch("sys.argv", ["blowcontrol", "power", "on"]):
+                    main()
+                assert root.level == logging.WARNING
+        finally:
+            root.setLevel(saved_level)
+
+    def test_fast_parse_args_common_shape(self):
+        """Test the argparse-free path for the usual argv shapes."""
+        assert _fast_parse_args(["power", "on"]) == ("power", "on", False, False)
+        assert _fast_parse_args(["--debug", "speed", "5", "--json"]) == (
+            "speed",
+            "5",
+            True,
+            True,
+        )
+        assert _fast_parse_args(["state", "--json"]) == ("state", None, True, False)
+
+    def test_fast_parse_args_falls_back(self):
+        """Test that help, unknown input and bad arity use the full parser."""
+        assert _fast_parse_args([]) is None
+        assert _fast_parse_args(["--help"]) is None
+        assert _fast_parse_args(["power", "-h"]) is None
+        assert _fast_parse_args(["bogus", "on"]) is None
+        assert _fast_parse_args(["power"]) is None
+        assert _fast_parse_args(["state", "extra"]) is None
+
+    @patch("blowcontrol.commands.power.set_power")
+    def test_cli_argparse_fallback(self, mock_set_power):
+        """Test that commands parsed by argparse reach the same handler."""
+        mock_set_power.return_value = True
+
+        with patch("blowcontrol.cli._fast_parse_args", return_value=None):
+            with patch("sys.argv", ["blowcontrol", "power", "on"]):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    main()
+                    assert "Power set to ON" in mock_stdout.getvalue()
+                    mock_set_power.assert_called_once_with(True)
+
+    def test_output_result_single_write(self):
+        """Test that text and JSON results are each written in one call."""
+        with patch("sys.stdout") as mock_stdout:
+            output_result(False, "Failed to set power")
+        mock_stdout.write.assert_called_once_with("✗ Failed to set power\n")
+
+        with patch("sys.stdout") as mock_stdout:
+            output_result(True, "Width set", {"actual_width": 90}, json_mode=True)
+        mock_stdout.write.assert_called_once()
+        assert json.loads(mock_stdout.write.call_args[0][0]) == {
+            "success": True,
+            "message": "Width set",
+            "actual_width": 90,
+        }
+
+    def test_output_result_indent_follows_tty(self):
+        """Test that JSON is indented on a terminal and compact when piped."""
+        with patch("sys.stdout") as mock_stdout:
+            mock_stdout.isatty.return_value = True
+            output_result(True, "ok", json_mode=True)
+        assert mock_stdout.write.call_args[0][0] == (
+            '{\n  "success": true,\n  "message": "ok"\n}\n'
+        )
+
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            output_result(True, "ok", json_mode=True)
+        assert mock_stdout.getvalue() == '{"success":true,"message":"ok"}\n'
+
+    def test_range_validators(self):
+        """Test the CLI speed and heading validators."""
+        assert validate_fan_speed_input("7") == 7
+        assert validate_fan_speed_input(10) == 10
+        assert validate_oscillation_heading("0") == 0
+        assert validate_oscillation_heading(359) == 359
+
+        with pytest.raises(ValueError, match="Fan speed must be between 0 and 10"):
+            validate_fan_speed_input("11")
+        with pytest.raises(ValueError, match="Heading must be between 0° and 359°"):
+            validate_oscillation_heading(360)
+        with pytest.raises(ValueError):
+            validate_oscillation_heading("north")
+
+
+class TestCLIBatch:
+    """Test the batch subcommand."""
+
+    @patch("blowcontrol.commands.fan_speed.set_fan_speed")
+    @patch("blowcontrol.commands.power.set_power")
+    def test_batch_runs_commands_in_order(self, mock_set_power, mock_set_speed):
+        """Test that each stdin line is dispatched to its handler."""
+        mock_set_power.return_value = True
+        mock_set_speed.return_value = True
+        commands = "# morning\npower on\n\nspeed 3\n"
+
+        with patch("sys.argv", ["blowcontrol", "batch"]):
+            with patch("sys.stdin", StringIO(commands)):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    main()
+                    output = mock_stdout.getvalue()
+
+        assert output == "✓ Power set to ON\n✓ Fan speed set to 3\n"
+        mock_set_power.assert_called_once_with(True)
+        mock_set_speed.assert_called_once_with(3)
+
+    @patch("blowcontrol.commands.power.set_power")
+    def test_batch_continues_after_errors(self, mock_set_power):
+        """Test that bad lines are reported, later lines still run, exit is 1."""
+        mock_set_power.return_value = True
+        commands = "speed 11\nlisten\nfrobnicate\npower off\n"
+
+        with patch("sys.argv", ["blowcontrol", "batch"]):
+            with patch("sys.stdin", StringIO(commands)):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    with pytest.raises(SystemExit) as exc_info:
+                        main()
+                    output = mock_stdout.getvalue()
+
+        assert exc_info.value.code == 1
+        assert "Invalid fan speed" in output
+        assert "Invalid batch command: listen" in output
+        assert "Invalid batch command: frobnicate" in output
+        assert "Power set to OFF" in output
+        mock_set_power.assert_called_once_with(False)
+
 
 class TestCLIState:
     """Test CLI state command specifically."""
@@ -194,10 +337,10 @@ class TestCLIState:
 class TestCLIOscillation:
     """Test CLI oscillation commands."""
 
-    @patch("blowcontrol.cli.set_oscillation_width")
+    @patch("blowcontrol.commands.oscillation.set_oscillation_width")
     def test_cli_oscillation_width(self, mock_set_width):
         """Test CLI oscillation width command."""
-        mock_set_width.return_value = {"success": True, "actual_width": 90}
+        mock_set_width.return_value = OscillationResult(success=True, actual_width=90)
 
         with patch("sys.argv", ["blowcontrol", "width", "medium"]):
             with patch("sys.stdout", StringIO()) as mock_stdout:
@@ -206,10 +349,12 @@ class TestCLIOscillation:
                 assert "✓" in output
                 mock_set_width.assert_called_once_with("medium")
 
-    @patch("blowcontrol.cli.set_oscillation_direction")
+    @patch("blowcontrol.commands.oscillation.set_oscillation_direction")
     def test_cli_oscillation_heading(self, mock_set_direction):
         """Test CLI oscillation direction command."""
-        mock_set_direction.return_value = {"success": True, "actual_heading": 90}
+        mock_set_direction.return_value = OscillationResult(
+            success=True, actual_heading=90
+        )
 
         with patch("sys.argv", ["blowcontrol", "direction", "90"]):
             with patch("sys.stdout", StringIO()) as mock_stdout:
@@ -217,3 +362,212 @@ class TestCLIOscillation:
                 output = mock_stdout.getvalue()
                 assert "✓" in output
                 mock_set_direction.assert_called_once_with(90)
+
+    @patch("blowcontrol.commands.oscillation.set_oscillation_width")
+    def test_cli_oscillation_width_invalid(self, mock_set_width):
+        """Test that a non-Dyson width is rejected before anything is sent."""
+        with patch("sys.argv", ["blowcontrol", "width", "30"]):
+            with patch("sys.stdout", StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                assert "✗ Invalid width input: Width 30°" in mock_stdout.getvalue()
+        assert exc_info.value.code == 1
+        mock_set_width.assert_not_called()
+
+    @patch("blowcontrol.commands.oscillation.set_oscillation_direction")
+    def test_cli_oscillation_heading_failure(self, mock_set_direction):
+        """Test that a failed result is reported with its fields and exit 1."""
+        mock_set_direction.return_value = OscillationResult(
+            success=False, error="No state"
+        )
+
+        with patch("sys.argv", ["blowcontrol", "direction", "90", "--json"]):
+            with patch("sys.stdout", StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+                output = json.loads(mock_stdout.getvalue())
+        assert exc_info.value.code == 1
+        assert output["success"] is False
+        assert output["message"] == "Failed to set oscillation direction: No state"
+        assert output["error"] == "No state"
+
+    # Keys the dict-returning commands printed with --json, before results
+    # became dataclasses
+    _ANGLE_KEYS = {
+        "success",
+        "actual_width",
+        "actual_heading",
+        "lower_angle",
+        "upper_angle",
+        "adjusted",
+        "original_heading",
+    }
+    _WIDTH_KEYS = _ANGLE_KEYS | {"width_adjusted", "requested_width", "adjusted_width"}
+    _DIRECTION_KEYS = _ANGLE_KEYS | {
+        "width_preserved",
+        "current_width",
+        "oscillation_was_off",
+    }
+
+    @pytest.mark.parametrize(
+        "argv, setter, result, baseline_keys",
+        [
+            (
+                ["width", "medium"],
+                "set_oscillation_width",
+                OscillationResult(success=False, error="Boom", requested_width="90"),
+                _WIDTH_KEYS | {"error"},
+            ),
+            (
+                ["width", "medium"],
+                "set_oscillation_width",
+                OscillationResult(
+                    success=True,
+                    actual_width=90,
+                    actual_heading=180,
+                    lower_angle=135,
+                    upper_angle=225,
+                    original_heading=180,
+                    requested_width="medium",
+                    adjusted_width="medium",
+                ),
+                _WIDTH_KEYS,
+            ),
+            (
+                ["direction", "90"],
+                "set_oscillation_direction",
+                OscillationResult(success=False, error="Boom"),
+                _DIRECTION_KEYS | {"error"},
+            ),
+            (
+                ["direction", "90"],
+                "set_oscillation_direction",
+                OscillationResult(
+                    success=True,
+                    actual_width=90,
+                    actual_heading=90,
+                    lower_angle=45,
+                    upper_angle=135,
+                    original_heading=90,
+                    width_preserved=True,
+                    current_width=90,
+                    requested_heading=90,
+                ),
+                _DIRECTION_KEYS | {"requested_heading"},
+            ),
+        ],
+    )
+    def test_cli_oscillation_json_keys(self, argv, setter, result, baseline_keys):
+        """Test that --json keeps every result key, nulls included."""
+        with patch(f"blowcontrol.commands.oscillation.{setter}", return_value=result):
+            with patch("sys.argv", ["blowcontrol", *argv, "--json"]):
+                with patch("sys.stdout", StringIO()) as mock_stdout:
+                    try:
+                        main()
+                    except SystemExit:
+                        pass
+                    output = json.loads(mock_stdout.getvalue())
+
+        expected = result.to_dict()
+        assert baseline_keys <= set(output)
+        assert set(output) == set(expected)
+        assert {k: v for k, v in output.items() if k != "message"} == {
+            k: v for k, v in expected.items() if k != "message"
+        }
+        # An unset message must not replace the CLI's own message
+        assert output["message"].startswith(
+            "Oscillation" if result.success else "Failed to set oscillation"
+        )
+
+
+class TestCLIListen:
+    """Test CLI listen output formatting."""
+
+    @staticmethod
+    def _listen(argv, payloads, stdout):
+        """Run listen with a mocked client that delivers the given payloads."""
+
+        def deliver(topics, callback):
+            for payload in payloads:
+                callback(None, None, Mock(payload=payload))
+
+        with patch("blowcontrol.mqtt.client.DysonMQTTClient") as mock_client_class:
+            mock_client_class.return_value.subscribe_and_listen.side_effect = deliver
+            with patch("sys.argv", ["blowcontrol", "listen", *argv]):
+                with patch("sys.stdout", stdout):
+                    main()
+        return stdout
+
+    @staticmethod
+    def _payload(data):
+        return json.dumps(data).encode()
+
+    def test_listen_state_change(self):
+        """Test STATE-CHANGE formatting, including missing fields."""
+        payload = self._payload(
+            {
+                "msg": "STATE-CHANGE",
+                "time": "2024-01-01T12:00:00Z",
+                "product-state": {
+                    "fpwr": ["OFF", "ON"],
+                    "fnsp": ["0003", "0005"],
+                    "oson": ["OFF", "ON"],
+                    "osal": ["0000", "0135"],
+                    "osau": ["0000", "0225"],
+                },
+            }
+        )
+
+        output = self._listen([], [payload], StringIO()).getvalue()
+
+        assert "State Change at 2024-01-01T12:00:00Z" in output
+        assert "Power: ON" in output
+        assert "Fan Speed: 0005" in output
+        assert "Night Mode: UNKNOWN" in output
+        assert "Oscillation Width: 90°" in output
+        assert "Oscillation Heading: 180°" in output
+        assert "Error" not in output
+
+    def test_listen_current_state_single_write(self):
+        """Test that a CURRENT-STATE summary is written in one call."""
+        payload = self._payload(
+            {
+                "msg": "CURRENT-STATE",
+                "product-state": {"fpwr": ["OFF", "ON"], "fnsp": ["0003", "0005"]},
+            }
+        )
+
+        mock_stdout = self._listen([], [payload], Mock())
+
+        mock_stdout.write.assert_called_once_with(
+            "\n📋 Current State Response\n  Power: ON\n  Fan Speed: 0005\n"
+        )
+
+    def test_listen_other_messages(self):
+        """Test LOCATION and unrecognised message types, in arrival order."""
+        payloads = [
+            self._payload({"msg": "LOCATION", "apos": "0180"}),
+            self._payload({"msg": "ENVIRONMENTAL-CURRENT"}),
+        ]
+
+        output = self._listen([], payloads, StringIO()).getvalue()
+
+        assert output.index("Location: 0180°") < output.index(
+            "Message: ENVIRONMENTAL-CURRENT"
+        )
+
+    def test_listen_json_mode(self):
+        """Test that --json prints each message as indented JSON."""
+        payload = {"msg": "LOCATION", "apos": "0180"}
+
+        output = self._listen(["--json"], [self._payload(payload)], StringIO())
+
+        assert json.loads(output.getvalue()) == payload
+
+    def test_listen_raw_mode(self):
+        """Test that --raw prints payloads without re-encoding them."""
+        payload = b'{"msg":"LOCATION","apos":"0180"}'
+
+        output = self._listen(["--raw"], [payload], StringIO())
+
+        assert output.getvalue() == payload.decode() + "\n"
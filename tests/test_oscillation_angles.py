@@ -7,11 +7,17 @@ import unittest
 from unittest.mock import patch
 
 from blowcontrol.commands.oscillation import (
+    _OSC_TABLE,
+    VALID_WIDTHS,
+    VALID_WIDTHS_SORTED,
     WIDTH_DISPLAY_NAMES,
     WIDTH_NAMES,
+    _extract_position,
+    angle_distance,
     get_oscillation_info,
     parse_width_input,
     set_oscillation_angles,
+    wrap360,
 )
 
 
@@ -22,11 +28,11 @@ class TestOscillationAngles(unittest.TestCase):
         """Set up test fixtures."""
         # Create a mock client that will be used by all oscillation functions
         self.mock_client_patcher = patch(
-            "blowcontrol.commands.oscillation.DysonMQTTClient"
+            "blowcontrol.commands.oscillation.get_pooled_client"
         )
-        self.mock_client_class = self.mock_client_patcher.start()
-        self.mock_client = self.mock_client_class.return_value
-        self.mock_client.send_standalone_command.return_value = True
+        self.mock_get_client = self.mock_client_patcher.start()
+        self.mock_client = self.mock_get_client.return_value
+        self.mock_client.send_command.return_value = True
 
     def tearDown(self):
         """Clean up test fixtures."""
@@ -46,10 +52,10 @@ class TestOscillationAngles(unittest.TestCase):
         for width, heading, expected_lower, expected_upper in test_cases:
             with self.subTest(width=width, heading=heading):
                 result = set_oscillation_angles(width, heading)
-                self.assertTrue(result["success"])
-                self.assertEqual(result["lower_angle"], expected_lower)
-                self.assertEqual(result["upper_angle"], expected_upper)
-                self.assertEqual(result["actual_width"], width)
+                self.assertTrue(result.success)
+                self.assertEqual(result.lower_angle, expected_lower)
+                self.assertEqual(result.upper_angle, expected_upper)
+                self.assertEqual(result.actual_width, width)
                 # Heading might be adjusted for bounds, so don't test exact
                 # match
 
@@ -86,12 +92,12 @@ class TestOscillationAngles(unittest.TestCase):
         for width, heading, should_adjust in test_cases:
             with self.subTest(width=width, heading=heading):
                 result = set_oscillation_angles(width, heading)
-                self.assertTrue(result["success"])
-                self.assertEqual(result["adjusted"], should_adjust)
+                self.assertTrue(result.success)
+                self.assertEqual(result.adjusted, should_adjust)
 
                 # Check bounds are respected
-                self.assertGreaterEqual(result["lower_angle"], 5)
-                self.assertLessEqual(result["upper_angle"], 355)
+                self.assertGreaterEqual(result.lower_angle, 5)
+                self.assertLessEqual(result.upper_angle, 355)
 
     def test_valid_widths(self):
         """Test that valid widths work correctly."""
@@ -100,8 +106,8 @@ class TestOscillationAngles(unittest.TestCase):
         for width in valid_widths:
             with self.subTest(width=width):
                 result = set_oscillation_angles(width, 180)
-                self.assertTrue(result["success"])
-                self.assertEqual(result["actual_width"], width)
+                self.assertTrue(result.success)
+                self.assertEqual(result.actual_width, width)
 
     def test_named_widths(self):
         """Test parsing named width inputs."""
@@ -111,6 +117,9 @@ class TestOscillationAngles(unittest.TestCase):
             ("medium", 90),
             ("wide", 180),
             ("full", 350),
+            ("Medium", 90),
+            ("WIDE", 180),
+            ("nArRoW", 45),
             ("0", 0),
             ("45", 45),
             ("90", 90),
@@ -140,6 +149,16 @@ class TestOscillationAngles(unittest.TestCase):
         self.assertEqual(WIDTH_NAMES["wide"], 180)
         self.assertEqual(WIDTH_NAMES["full"], 350)
 
+    def test_width_maps_consistent(self):
+        """Test that the frozen width maps agree with each other."""
+        self.assertEqual(set(WIDTH_NAMES.values()), set(VALID_WIDTHS))
+        self.assertEqual(tuple(sorted(VALID_WIDTHS)), VALID_WIDTHS_SORTED)
+        self.assertEqual(
+            dict(WIDTH_DISPLAY_NAMES), {v: k for k, v in WIDTH_NAMES.items()}
+        )
+        with self.assertRaises(TypeError):
+            WIDTH_NAMES["huge"] = 400
+
     def test_width_display_names(self):
         """Test width display names."""
         self.assertEqual(WIDTH_DISPLAY_NAMES[0], "off")
@@ -152,23 +171,23 @@ class TestOscillationAngles(unittest.TestCase):
         """Test edge cases and boundary conditions."""
         # Test minimum valid heading (gets adjusted)
         result = set_oscillation_angles(45, 5)
-        self.assertTrue(result["success"])
-        self.assertEqual(result["lower_angle"], 5)
-        self.assertEqual(result["upper_angle"], 49)
-        self.assertTrue(result["adjusted"])
+        self.assertTrue(result.success)
+        self.assertEqual(result.lower_angle, 5)
+        self.assertEqual(result.upper_angle, 49)
+        self.assertTrue(result.adjusted)
 
         # Test maximum valid heading (gets adjusted)
         result = set_oscillation_angles(45, 355)
-        self.assertTrue(result["success"])
-        self.assertEqual(result["lower_angle"], 311)
-        self.assertEqual(result["upper_angle"], 355)
-        self.assertTrue(result["adjusted"])
+        self.assertTrue(result.success)
+        self.assertEqual(result.lower_angle, 311)
+        self.assertEqual(result.upper_angle, 355)
+        self.assertTrue(result.adjusted)
 
         # Test zero width (off)
         result = set_oscillation_angles(0, 180)
-        self.assertTrue(result["success"])
-        self.assertEqual(result["lower_angle"], 180)
-        self.assertEqual(result["upper_angle"], 180)
+        self.assertTrue(result.success)
+        self.assertEqual(result.lower_angle, 180)
+        self.assertEqual(result.upper_angle, 180)
 
     def test_round_trip_conversion(self):
         """Test that converting width+heading to angles and back gives same result."""
@@ -183,42 +202,42 @@ class TestOscillationAngles(unittest.TestCase):
             with self.subTest(width=width, heading=heading):
                 # Convert to angles
                 result = set_oscillation_angles(width, heading)
-                self.assertTrue(result["success"])
+                self.assertTrue(result.success)
 
-                lower = result["lower_angle"]
-                upper = result["upper_angle"]
+                lower = result.lower_angle
+                upper = result.upper_angle
 
                 # Convert back to width + heading
                 info = get_oscillation_info(f"{lower:04d}", f"{upper:04d}")
 
                 # Width should be close (within 1° due to integer division)
-                width_diff = abs(info["width"] - result["actual_width"])
+                width_diff = abs(info["width"] - result.actual_width)
                 self.assertLessEqual(
                     width_diff,
                     1,
-                    f"Width difference too large: {info['width']} vs {result['actual_width']}",
+                    f"Width difference too large: {info['width']} vs {result.actual_width}",
                 )
 
                 # Heading should be close (within 1° due to integer division)
-                heading_diff = abs(info["heading"] - result["actual_heading"])
+                heading_diff = abs(info["heading"] - result.actual_heading)
                 self.assertLessEqual(
                     heading_diff,
                     1,
-                    f"Heading difference too large: {info['heading']} vs {result['actual_heading']}",
+                    f"Heading difference too large: {info['heading']} vs {result.actual_heading}",
                 )
 
     def test_smart_adjustment_logic(self):
         """Test that heading adjustments prefer width preservation."""
         # Test case where width would be preserved
         result = set_oscillation_angles(90, 0)  # Would be -45° to 45°
-        self.assertTrue(result["success"])
-        self.assertTrue(result["adjusted"])
-        self.assertEqual(result["actual_width"], 90)  # Width preserved
-        self.assertNotEqual(result["actual_heading"], 0)  # Heading adjusted
+        self.assertTrue(result.success)
+        self.assertTrue(result.adjusted)
+        self.assertEqual(result.actual_width, 90)  # Width preserved
+        self.assertNotEqual(result.actual_heading, 0)  # Heading adjusted
 
         # Verify the adjusted heading puts angles within bounds
-        self.assertGreaterEqual(result["lower_angle"], 5)
-        self.assertLessEqual(result["upper_angle"], 355)
+        self.assertGreaterEqual(result.lower_angle, 5)
+        self.assertLessEqual(result.upper_angle, 355)
 
     def test_wrap_around_detection(self):
         """Test wrap-around angle detection."""
@@ -230,6 +249,55 @@ class TestOscillationAngles(unittest.TestCase):
         # Note: Our implementation doesn't allow wrap-around in normal cases
         # but the detection logic exists
 
+        # Wrap-around angles report the short arc across 0°
+        result = get_oscillation_info("0350", "0010")
+        self.assertTrue(result["is_wrap_around"])
+        self.assertEqual(result["width"], 20)
+        self.assertEqual(result["heading"], 0)
+
+    def test_bounds_table(self):
+        """Test the precomputed bounds table against off-step widths."""
+        self.assertEqual(len(_OSC_TABLE), 4 * 360)
+        self.assertEqual(_OSC_TABLE[(90, 180)], (135, 225, 180, None))
+        self.assertEqual(_OSC_TABLE[(350, 0)], (5, 355, 180, "lower bound"))
+
+        # Widths between Dyson's steps are computed on demand
+        result = set_oscillation_angles(60, 350)
+        self.assertTrue(result.success)
+        self.assertEqual(result.lower_angle, 295)
+        self.assertEqual(result.upper_angle, 355)
+
+    def test_angle_distance(self):
+        """Test the shortest angular distance, including across 0°."""
+        test_cases = [(0, 0, 0), (10, 350, 20), (350, 10, 20), (0, 180, 180)]
+
+        for a1, a2, expected in test_cases:
+            with self.subTest(a1=a1, a2=a2):
+                self.assertEqual(angle_distance(a1, a2), expected)
+
+    def test_extract_position(self):
+        """Test reading the oscillation range and position from state."""
+        test_cases = [
+            # (state, expected (osal, osau, heading))
+            ({"product-state": {"osal": "0135", "osau": "0225"}}, (135, 225, 180)),
+            ({"product-state": {"osal": "0350", "osau": "0010"}}, (350, 10, 0)),
+            ({"product-state": {"apos": "0128"}}, (None, None, 128)),
+            ({"osal": "0045", "osau": "0135"}, (45, 135, 90)),
+            ({"product-state": {"fpwr": "ON"}}, (None, None, None)),
+        ]
+
+        for state, expected in test_cases:
+            with self.subTest(state=state):
+                self.assertEqual(_extract_position(state), expected)
+
+    def test_wrap360(self):
+        """Test wrapping angles into 0-359."""
+        test_cases = [(0, 0), (359, 359), (360, 0), (365, 5), (-5, 355)]
+
+        for angle, expected in test_cases:
+            with self.subTest(angle=angle):
+                self.assertEqual(wrap360(angle), expected)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
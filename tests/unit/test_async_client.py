@@ -3,49 +3,175 @@
 Tests for async MQTT client functionality.
 """
 
-from unittest.mock import patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from blowcontrol.mqtt.async_client import (
+    AsyncDysonMQTTClient,
     async_get_state,
+    async_send_command,
     async_set_fan_speed,
     async_set_power,
+    async_set_states,
+    get_state_sync,
 )
 
 
 class TestAsyncClient:
     """Test async MQTT client functions."""
 
+    @staticmethod
+    def _mock_async_client(mock_client_class, replies):
+        """Configure the async client mock to answer the state request."""
+        mock_client = mock_client_class.return_value
+        mock_client.aconnect = AsyncMock()
+        mock_client.wait_connected_async = AsyncMock(return_value=True)
+        mock_client.aclose = AsyncMock()
+
+        def send_command(msg_type):
+            topic, callback = mock_client._client.message_callback_add.call_args[0]
+            assert topic.endswith("/status/current")
+            for reply in replies:
+                callback(None, None, Mock(payload=json.dumps(reply).encode()))
+
+        mock_client.send_command.side_effect = send_command
+        return mock_client
+
     @pytest.mark.asyncio
-    @patch("blowcontrol.mqtt.async_client.DysonMQTTClient")
+    @patch("blowcontrol.mqtt.async_client.AsyncDysonMQTTClient")
     async def test_async_get_state_success(self, mock_client_class):
         """Test successful async state retrieval."""
-        with patch("blowcontrol.mqtt.async_client.asyncio.to_thread") as mock_to_thread:
-            mock_to_thread.return_value = {
-                "state": {"product-state": {"fpwr": ["ON", "ON"]}},
-                "environmental": {"data": [{"hact": "0001", "pm25": "0002"}]},
-            }
+        state = {"msg": "CURRENT-STATE", "product-state": {"fpwr": "ON"}}
+        environmental = {"msg": "ENVIRONMENTAL-CURRENT-SENSOR-DATA", "data": {}}
+        mock_client = self._mock_async_client(mock_client_class, [environmental, state])
 
-            result = await async_get_state()
+        result = await async_get_state(timeout=5, quiet=True)
 
-            assert "state" in result
-            assert "environmental" in result
-            mock_to_thread.assert_called_once()
+        assert result == {"state": state, "environmental": environmental}
+        mock_client.aconnect.assert_awaited_once()
+        mock_client.send_command.assert_called_once_with("REQUEST-CURRENT-STATE")
+        mock_client.aclose.assert_awaited_once()
 
     @pytest.mark.asyncio
-    @patch("blowcontrol.mqtt.async_client.DysonMQTTClient")
-    async def test_async_get_state_failure(self, mock_client_class):
-        """Test async state retrieval failure."""
-        with patch("blowcontrol.mqtt.async_client.asyncio.to_thread") as mock_to_thread:
-            mock_to_thread.return_value = {"state": None, "environmental": None}
+    @patch("blowcontrol.mqtt.async_client.AsyncDysonMQTTClient")
+    async def test_async_get_state_concurrent_calls_share_fetch(
+        self, mock_client_class
+    ):
+        """Test that concurrent callers share one connection and request."""
+        state = {"msg": "CURRENT-STATE", "product-state": {"fpwr": "ON"}}
+        mock_client = self._mock_async_client(mock_client_class, [state])
 
-            result = await async_get_state()
+        results = await asyncio.gather(
+            async_get_state(timeout=5, quiet=True),
+            async_get_state(timeout=5, quiet=True),
+        )
 
-            assert "state" in result
-            assert "environmental" in result
-            assert result["state"] is None
-            mock_to_thread.assert_called_once()
+        assert results[0] == results[1] == {"state": state, "environmental": None}
+        assert results[0] is not results[1]
+        mock_client_class.assert_called_once()
+        mock_client.send_command.assert_called_once_with("REQUEST-CURRENT-STATE")
+
+        # Once the shared fetch finishes, the next call starts a new one
+        await async_get_state(timeout=5, quiet=True)
+        assert mock_client_class.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("blowcontrol.mqtt.async_client.json_codec")
+    @patch("blowcontrol.mqtt.async_client.AsyncDysonMQTTClient")
+    async def test_async_get_state_skips_other_messages(
+        self, mock_client_class, mock_json_codec
+    ):
+        """Test that unrelated message types are not decoded."""
+        self._mock_async_client(mock_client_class, [{"msg": "LOCATION"}])
+
+        result = await async_get_state(timeout=0.01, quiet=True)
+
+        assert result == {"state": None, "environmental": None}
+        mock_json_codec.loads.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("time.sleep")
+    @patch("blowcontrol.mqtt.async_client.AsyncDysonMQTTClient")
+    async def test_async_get_state_failure(self, mock_client_class, mock_sleep):
+        """Test async state retrieval when the device does not answer."""
+        mock_client = self._mock_async_client(mock_client_class, [])
+
+        result = await async_get_state(timeout=0.01, quiet=True)
+
+        assert result == {"state": None, "environmental": None}
+        # The request follows CONNACK rather than a fixed sleep
+        mock_client.wait_connected_async.assert_awaited_once()
+        mock_sleep.assert_not_called()
+        mock_client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("blowcontrol.mqtt.async_client.AsyncDysonMQTTClient")
+    async def test_async_get_state_connect_error(self, mock_client_class):
+        """Test that a failed connect returns an empty result and still closes."""
+        mock_client = self._mock_async_client(mock_client_class, [])
+        mock_client.aconnect.side_effect = OSError("Connection refused")
+
+        result = await async_get_state(timeout=5, quiet=True)
+
+        assert result == {"state": None, "environmental": None}
+        mock_client.send_command.assert_not_called()
+        mock_client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("paho.mqtt.client.Client")
+    async def test_async_client_uses_event_loop(self, mock_mqtt_client, mock_env_vars):
+        """Test that the socket is serviced by the event loop, not a thread."""
+        client = AsyncDysonMQTTClient(client_id="test-client")
+        client._loop = Mock()
+        paho_client = mock_mqtt_client.return_value
+        sock = Mock()
+
+        await asyncio.to_thread(
+            client._on_socket_open, paho_client, None, sock
+        )  # as during the executor-side connect
+        client._loop.call_soon_threadsafe.assert_called_once_with(
+            client._watch_socket, paho_client, sock
+        )
+        client._watch_socket(paho_client, sock)
+        client._loop.add_reader.assert_called_once_with(sock, paho_client.loop_read)
+        client._loop.create_task.call_args[0][0].close()  # keepalive coroutine
+        paho_client.loop_start.assert_not_called()
+
+        client._on_connect(paho_client, None, None, 0)
+        assert await client.wait_connected_async(timeout=1) is True
+
+        client._unwatch_socket(sock)
+        client._loop.remove_reader.assert_called_once_with(sock)
+        await client.aclose(timeout=0)
+        paho_client.disconnect.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("paho.mqtt.client.Client")
+    async def test_async_client_aclose_without_socket(
+        self, mock_mqtt_client, mock_env_vars
+    ):
+        """Test that aclose does not wait when no socket was ever opened."""
+        client = AsyncDysonMQTTClient(client_id="test-client")
+
+        with patch("blowcontrol.mqtt.async_client.logger") as mock_logger:
+            await asyncio.wait_for(client.aclose(), timeout=0.5)
+
+        mock_logger.warning.assert_not_called()
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_get_state_sync(self, mock_get_state):
+        """Test that the blocking wrapper runs async_get_state and returns it."""
+        mock_get_state.return_value = {"state": {"msg": "CURRENT-STATE"}}
+
+        assert get_state_sync(timeout=5, quiet=True) == {
+            "state": {"msg": "CURRENT-STATE"}
+        }
+        assert get_state_sync() == {"state": {"msg": "CURRENT-STATE"}}
+        mock_get_state.assert_any_call(timeout=5, quiet=True)
+        assert mock_get_state.await_count == 2
 
     @pytest.mark.asyncio
     @patch("blowcontrol.mqtt.async_client.DysonMQTTClient")
@@ -76,3 +202,44 @@ class TestAsyncClient:
             result = await async_set_fan_speed(5)
             assert result is True
             mock_to_thread.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch("blowcontrol.mqtt.async_client.get_pooled_client")
+    async def test_commands_reuse_pooled_client(self, mock_get_client):
+        """Test that async commands publish on the pooled connection."""
+        mock_client = Mock()
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
+
+        assert await async_send_command("REQUEST-CURRENT-STATE") is True
+        assert await async_set_power(True) is True
+        assert await async_set_fan_speed(5) is True
+        assert await async_set_fan_speed(0) is True
+
+        mock_client.send_command.assert_called_once_with("REQUEST-CURRENT-STATE")
+        mock_client.set_boolean_state.assert_called_once_with("fpwr", True)
+        assert [c[0][0] for c in mock_client.set_states.call_args_list] == [
+            {"fpwr": True, "fnsp": "0005"},
+            {"fpwr": False},
+        ]
+        mock_client.connect.assert_not_called()
+        mock_client.disconnect.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("blowcontrol.mqtt.async_client.get_pooled_client")
+    async def test_async_set_states_failure(self, mock_get_client):
+        """Test that a failed batched publish returns False."""
+        mock_get_client.return_value.set_states.side_effect = OSError("Down")
+
+        assert await async_set_states({"fpwr": True, "nmod": False}) is False
+
+    @pytest.mark.asyncio
+    @patch("blowcontrol.mqtt.async_client.get_pooled_client")
+    async def test_async_commands_propagate_other_errors(self, mock_get_client):
+        """Test that errors other than connection failures are not swallowed."""
+        mock_get_client.side_effect = ValueError("DEVICE_IP is required but not set.")
+
+        with pytest.raises(ValueError, match="DEVICE_IP"):
+            await async_set_power(True)
+        with pytest.raises(ValueError, match="DEVICE_IP"):
+            await async_send_command("REQUEST-CURRENT-STATE")
@@ -0,0 +1,42 @@
+"""
+Unit tests for the shared asyncio runtime.
+"""
+
+import asyncio
+
+import pytest
+
+from blowcontrol.async_runtime import run_coro
+
+
+async def _loop_of_caller():
+    return asyncio.get_running_loop()
+
+
+async def _fail():
+    raise RuntimeError("boom")
+
+
+class TestRunCoro:
+    """Test running coroutines on the background loop."""
+
+    def test_returns_result(self):
+        """Test that the coroutine result is returned."""
+
+        async def add(a, b):
+            return a + b
+
+        assert run_coro(add(2, 3)) == 5
+
+    def test_reuses_loop(self):
+        """Test that consecutive calls run on the same event loop."""
+        first = run_coro(_loop_of_caller())
+        second = run_coro(_loop_of_caller())
+
+        assert first is second
+        assert first.is_running()
+
+    def test_propagates_exceptions(self):
+        """Test that exceptions raised by the coroutine reach the caller."""
+        with pytest.raises(RuntimeError, match="boom"):
+            run_coro(_fail())
@@ -6,10 +6,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from blowcontrol.commands._parse import parse_int_input
 from blowcontrol.commands.auto_mode import set_auto_mode
 from blowcontrol.commands.fan_speed import set_fan_speed, validate_fan_speed
 from blowcontrol.commands.night_mode import set_night_mode
 from blowcontrol.commands.oscillation import (
+    OscillationResult,
     get_oscillation_info,
     parse_width_input,
     set_oscillation_angles,
@@ -18,31 +20,47 @@ from blowcontrol.commands.oscillation import (
 )
 from blowcontrol.commands.power import request_current_state, set_power
 from blowcontrol.commands.sleep_timer import parse_sleep_time, set_sleep_timer
+from blowcontrol.state.cache import get_state_cached, invalidate_state_cache
+
+
+class TestParseIntInput:
+    """Test shared integer input parsing."""
+
+    def test_parse_int_input(self):
+        """Test parsing ints, numeric strings, and bools."""
+        assert parse_int_input(5) == 5
+        assert parse_int_input("42") == 42
+        assert parse_int_input(True) == 1
+
+    def test_parse_int_input_invalid(self):
+        """Test rejecting non-numeric input."""
+        with pytest.raises(ValueError):
+            parse_int_input("abc")
+        with pytest.raises(ValueError, match="Cannot convert"):
+            parse_int_input(4.5)
 
 
 class TestPowerCommands:
     """Test power control commands."""
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.power.DysonMQTTClient")
-    def test_set_power_on(self, mock_client_class, mock_paho_client, mock_env_vars):
+    @patch("blowcontrol.commands.power.get_pooled_client")
+    def test_set_power_on(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting power ON."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_power(True)
 
         assert result is True
-        mock_client.connect.assert_called_once()
         mock_client.set_boolean_state.assert_called_once_with("fpwr", True)
-        mock_client.disconnect.assert_called_once()
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.power.DysonMQTTClient")
-    def test_set_power_off(self, mock_client_class, mock_paho_client, mock_env_vars):
+    @patch("blowcontrol.commands.power.get_pooled_client")
+    def test_set_power_off(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting power OFF."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_power(False)
 
@@ -50,13 +68,13 @@ class TestPowerCommands:
         mock_client.set_boolean_state.assert_called_once_with("fpwr", False)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.power.DysonMQTTClient")
+    @patch("blowcontrol.commands.power.get_pooled_client")
     def test_set_power_flexible_inputs(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test power command with various flexible boolean inputs."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         # Test string inputs
         for true_input in [
@@ -119,36 +137,42 @@ class TestPowerCommands:
         mock_client.set_boolean_state.assert_called_once_with("fpwr", False)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.power.DysonMQTTClient")
-    def test_set_power_error(self, mock_client_class, mock_paho_client, mock_env_vars):
+    @patch("blowcontrol.commands.power.get_pooled_client")
+    def test_set_power_error(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test power command error handling."""
-        mock_client = Mock()
-        mock_client.connect.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_get_client.side_effect = Exception("Connection failed")
 
         result = set_power(True)
 
         assert result is False
 
+    @patch("blowcontrol.commands.power.get_pooled_client")
+    def test_set_power_explicit_client(self, mock_get_client):
+        """Test that a caller-supplied client is used instead of the pool."""
+        client = Mock()
+
+        assert set_power(True, client=client) is True
+
+        client.set_boolean_state.assert_called_once_with("fpwr", True)
+        mock_get_client.assert_not_called()
+
     def test_set_power_invalid_boolean(self):
         """Test power command with invalid boolean input."""
         result = set_power("invalid")
         assert result is False
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.power.DysonMQTTClient")
+    @patch("blowcontrol.commands.power.get_pooled_client")
     def test_request_current_state(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test requesting current state."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         request_current_state()
 
-        mock_client.connect.assert_called_once()
         mock_client.send_command.assert_called_once_with("REQUEST-CURRENT-STATE")
-        mock_client.disconnect.assert_called_once()
 
 
 class TestFanSpeedCommands:
@@ -189,43 +213,61 @@ class TestFanSpeedCommands:
             validate_fan_speed(11)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.fan_speed.DysonMQTTClient")
+    @patch("blowcontrol.commands.fan_speed.get_pooled_client")
     def test_set_fan_speed_valid(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test setting valid fan speed."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_fan_speed(5)
 
         assert result is True
         mock_client.set_numeric_state.assert_called_once_with("fnsp", "0005")
 
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    @patch("blowcontrol.commands.fan_speed.get_pooled_client")
+    def test_set_fan_speed_unchanged(self, mock_get_client, mock_async_get_state):
+        """Test that a speed matching the cached state is not re-sent."""
+        mock_async_get_state.return_value = {
+            "state": {"product-state": {"fpwr": "ON", "fnsp": "0005"}}
+        }
+        get_state_cached()
+
+        assert set_fan_speed(5) is True
+        mock_get_client.assert_not_called()
+
+        # A different speed is still sent
+        assert set_fan_speed(6) is True
+        mock_get_client.return_value.set_numeric_state.assert_called_once_with(
+            "fnsp", "0006"
+        )
+
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.commands.fan_speed.set_power")
-    @patch("blowcontrol.commands.fan_speed.DysonMQTTClient")
+    @patch("blowcontrol.commands.fan_speed.get_pooled_client")
     def test_set_fan_speed_zero(
-        self, mock_client_class, mock_set_power, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_set_power, mock_paho_client, mock_env_vars
     ):
         """Test setting fan speed to 0 (power off)."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
         mock_set_power.return_value = True
 
         result = set_fan_speed(0)
 
         assert result is True
-        mock_set_power.assert_called_once_with(False)
+        mock_set_power.assert_called_once_with(False, client=None)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.fan_speed.DysonMQTTClient")
+    @patch("blowcontrol.commands.fan_speed.get_pooled_client")
     def test_set_fan_speed_invalid(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test setting invalid fan speed."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         # set_fan_speed catches ValueError and returns False
         result = set_fan_speed(11)
@@ -235,14 +277,12 @@ class TestFanSpeedCommands:
         assert result is False
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.fan_speed.DysonMQTTClient")
+    @patch("blowcontrol.commands.fan_speed.get_pooled_client")
     def test_set_fan_speed_error(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test fan speed command error handling."""
-        mock_client = Mock()
-        mock_client.connect.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_get_client.side_effect = Exception("Connection failed")
 
         result = set_fan_speed(5)
 
@@ -253,11 +293,11 @@ class TestAutoModeCommands:
     """Test auto mode control commands."""
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.auto_mode.DysonMQTTClient")
-    def test_set_auto_mode_on(self, mock_client_class, mock_paho_client, mock_env_vars):
+    @patch("blowcontrol.commands.auto_mode.get_pooled_client")
+    def test_set_auto_mode_on(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting auto mode ON."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_auto_mode(True)
 
@@ -265,13 +305,11 @@ class TestAutoModeCommands:
         mock_client.set_boolean_state.assert_called_once_with("auto", True)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.auto_mode.DysonMQTTClient")
-    def test_set_auto_mode_off(
-        self, mock_client_class, mock_paho_client, mock_env_vars
-    ):
+    @patch("blowcontrol.commands.auto_mode.get_pooled_client")
+    def test_set_auto_mode_off(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting auto mode OFF."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_auto_mode(False)
 
@@ -279,14 +317,12 @@ class TestAutoModeCommands:
         mock_client.set_boolean_state.assert_called_once_with("auto", False)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.auto_mode.DysonMQTTClient")
+    @patch("blowcontrol.commands.auto_mode.get_pooled_client")
     def test_set_auto_mode_error(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test auto mode command error handling."""
-        mock_client = Mock()
-        mock_client.connect.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_get_client.side_effect = Exception("Connection failed")
 
         result = set_auto_mode(True)
 
@@ -297,13 +333,11 @@ class TestNightModeCommands:
     """Test night mode control commands."""
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.night_mode.DysonMQTTClient")
-    def test_set_night_mode_on(
-        self, mock_client_class, mock_paho_client, mock_env_vars
-    ):
+    @patch("blowcontrol.commands.night_mode.get_pooled_client")
+    def test_set_night_mode_on(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting night mode ON."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_night_mode(True)
 
@@ -311,13 +345,11 @@ class TestNightModeCommands:
         mock_client.set_boolean_state.assert_called_once_with("nmod", True)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.night_mode.DysonMQTTClient")
-    def test_set_night_mode_off(
-        self, mock_client_class, mock_paho_client, mock_env_vars
-    ):
+    @patch("blowcontrol.commands.night_mode.get_pooled_client")
+    def test_set_night_mode_off(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting night mode OFF."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_night_mode(False)
 
@@ -325,14 +357,12 @@ class TestNightModeCommands:
         mock_client.set_boolean_state.assert_called_once_with("nmod", False)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.night_mode.DysonMQTTClient")
+    @patch("blowcontrol.commands.night_mode.get_pooled_client")
     def test_set_night_mode_error(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test night mode command error handling."""
-        mock_client = Mock()
-        mock_client.connect.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_get_client.side_effect = Exception("Connection failed")
 
         result = set_night_mode(True)
 
@@ -396,11 +426,11 @@ class TestSleepTimerCommands:
             parse_sleep_time(541)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.sleep_timer.DysonMQTTClient")
-    def test_set_sleep_timer(self, mock_client_class, mock_paho_client, mock_env_vars):
+    @patch("blowcontrol.commands.sleep_timer.get_pooled_client")
+    def test_set_sleep_timer(self, mock_get_client, mock_paho_client, mock_env_vars):
         """Test setting sleep timer."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_sleep_timer(30)
 
@@ -408,13 +438,13 @@ class TestSleepTimerCommands:
         mock_client.set_numeric_state.assert_called_once_with("sltm", "0030")
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.sleep_timer.DysonMQTTClient")
+    @patch("blowcontrol.commands.sleep_timer.get_pooled_client")
     def test_set_sleep_timer_zero(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test setting sleep timer to 0 (off)."""
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         result = set_sleep_timer(0)
 
@@ -422,14 +452,12 @@ class TestSleepTimerCommands:
         mock_client.set_numeric_state.assert_called_once_with("sltm", "OFF")
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.sleep_timer.DysonMQTTClient")
+    @patch("blowcontrol.commands.sleep_timer.get_pooled_client")
     def test_set_sleep_timer_error(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test sleep timer command error handling."""
-        mock_client = Mock()
-        mock_client.connect.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_get_client.side_effect = Exception("Connection failed")
 
         result = set_sleep_timer(30)
 
@@ -461,6 +489,18 @@ class TestOscillationCommands:
         assert parse_width_input("44") == 44
         assert parse_width_input("351") == 351
 
+    def test_oscillation_result_to_dict(self):
+        """Test converting an oscillation result for JSON output."""
+        result = OscillationResult(success=False, error="Failed to set heading")
+
+        data = result.to_dict()
+
+        assert data["success"] is False
+        assert data["error"] == "Failed to set heading"
+        assert data["actual_width"] is None
+        assert data["adjusted"] is False
+        assert set(data) >= {"lower_angle", "upper_angle", "original_heading"}
+
     def test_get_oscillation_info(self):
         """Test getting oscillation info from angles."""
         info = get_oscillation_info("0135", "0225")
@@ -472,40 +512,49 @@ class TestOscillationCommands:
         assert info["heading"] == 180
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_angles_valid(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test setting valid oscillation angles."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         result = set_oscillation_angles(90, 180)
 
-        assert result["success"] is True
-        assert result["actual_width"] == 90
-        assert result["actual_heading"] == 180
-        assert result["lower_angle"] == 135
-        assert result["upper_angle"] == 225
-        mock_client.send_standalone_command.assert_called_once()
+        assert result.success is True
+        assert result.actual_width == 90
+        assert result.actual_heading == 180
+        assert result.lower_angle == 135
+        assert result.upper_angle == 225
+        mock_client.send_command.assert_called_once_with(
+            "STATE-SET",
+            {
+                "oscs": "ON",
+                "oson": "ON",
+                "osal": "0135",
+                "osau": "0225",
+                "ancp": "CUST",
+            },
+        )
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_angles_zero_width(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test setting oscillation with zero width (heading only)."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         result = set_oscillation_angles(0, 270)
 
-        assert result["success"] is True
-        assert result["actual_width"] == 0
-        assert result["actual_heading"] == 270
-        mock_client.send_standalone_command.assert_called_once()
+        assert result.success is True
+        assert result.actual_width == 0
+        assert result.actual_heading == 270
+        mock_client.send_command.assert_called_once()
 
     def test_set_oscillation_angles_invalid_width(self):
         """Test setting oscillation with invalid width."""
@@ -522,89 +571,89 @@ class TestOscillationCommands:
             set_oscillation_angles(90, 360)
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_angles_bounds_adjustment(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test bounds adjustment for oscillation angles."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Test that heading gets adjusted when it would cause out-of-bounds
         # angles
         # 2° heading would cause -43° to 47° (invalid)
         result = set_oscillation_angles(90, 2)
 
-        assert result["success"] is True
-        assert result["actual_width"] == 90
-        assert result["adjusted"] is True
-        assert result["original_heading"] == 2
+        assert result.success is True
+        assert result.actual_width == 90
+        assert result.adjusted is True
+        assert result.original_heading == 2
         # The heading should be adjusted to keep angles within 5°-355° bounds
-        assert result["lower_angle"] >= 5
-        assert result["upper_angle"] <= 355
+        assert result.lower_angle >= 5
+        assert result.upper_angle <= 355
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_angles_wrap_around(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test wrap-around case handling."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Test wrap-around case (e.g., 350° to 10°)
         # 0° heading with 180° width would cause -90° to 90°
         result = set_oscillation_angles(180, 0)
 
-        assert result["success"] is True
-        assert result["actual_width"] == 180
-        assert result["adjusted"] is True
+        assert result.success is True
+        assert result.actual_width == 180
+        assert result.adjusted is True
         # The heading should be adjusted to avoid wrap-around
-        assert result["lower_angle"] >= 5
-        assert result["upper_angle"] <= 355
+        assert result.lower_angle >= 5
+        assert result.upper_angle <= 355
 
     @patch("paho.mqtt.client.Client")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_angles_error(
-        self, mock_client_class, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_paho_client, mock_env_vars
     ):
         """Test oscillation command error handling."""
         mock_client = Mock()
-        mock_client.send_standalone_command.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.side_effect = Exception("Connection failed")
+        mock_get_client.return_value = mock_client
 
         result = set_oscillation_angles(90, 180)
 
-        assert result["success"] is False
-        assert "error" in result
+        assert result.success is False
+        assert result.error is not None
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_width(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test setting oscillation width."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Mock the async state call to return a fallback
         mock_async_get_state.return_value = None
 
         result = set_oscillation_width("medium")
 
-        assert result["success"] is True
-        assert result["actual_width"] == 90
-        mock_client.send_standalone_command.assert_called_once()
+        assert result.success is True
+        assert result.actual_width == 90
+        mock_client.send_command.assert_called_once()
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_width_invalid(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test setting invalid oscillation width."""
         # Mock the async state call
@@ -612,20 +661,20 @@ class TestOscillationCommands:
 
         result = set_oscillation_width("invalid")
 
-        assert result["success"] is False
-        assert "error" in result
-        assert "Invalid width name" in result["error"]
+        assert result.success is False
+        assert result.error is not None
+        assert "Invalid width name" in result.error
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_width_adjustment(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test that invalid widths get adjusted to valid ones."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Mock the async state call to return None (fallback to default
         # heading)
@@ -633,50 +682,78 @@ class TestOscillationCommands:
 
         # Test that 44 gets adjusted to 45 (narrow)
         result = set_oscillation_width("44")
-        assert result["success"] is True
-        assert result["actual_width"] == 45
-        assert result["width_adjusted"] is True
-        assert result["requested_width"] == "44"
-        assert result["adjusted_width"] == "narrow"
+        assert result.success is True
+        assert result.actual_width == 45
+        assert result.width_adjusted is True
+        assert result.requested_width == "44"
+        assert result.adjusted_width == "narrow"
 
         # Test that 351 gets adjusted to 350 (full)
         result = set_oscillation_width("351")
-        assert result["success"] is True
-        assert result["actual_width"] == 350
-        assert result["width_adjusted"] is True
-        assert result["requested_width"] == "351"
-        assert result["adjusted_width"] == "full"
+        assert result.success is True
+        assert result.actual_width == 350
+        assert result.width_adjusted is True
+        assert result.requested_width == "351"
+        assert result.adjusted_width == "full"
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
+    def test_set_oscillation_width_unchanged(
+        self, mock_get_client, mock_async_get_state
+    ):
+        """Test that a width the device is already using is not re-sent."""
+        mock_async_get_state.return_value = {
+            "state": {
+                "product-state": {
+                    "oscs": "ON",
+                    "oson": "ON",
+                    "osal": "0135",
+                    "osau": "0225",
+                    "ancp": "CUST",
+                }
+            }
+        }
+
+        result = set_oscillation_width("medium")
+
+        assert result.success is True
+        assert result.lower_angle == 135
+        assert result.upper_angle == 225
+        mock_get_client.assert_not_called()
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_width_zero(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test setting oscillation width to zero (off)."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Mock the async state call
         mock_async_get_state.return_value = None
 
         result = set_oscillation_width("off")
 
-        assert result["success"] is True
-        assert result["actual_width"] == 0
-        assert result["adjusted_width"] == "off"
+        assert result.success is True
+        assert result.actual_width == 0
+        assert result.adjusted_width == "off"
+        mock_client.send_command.assert_called_once_with(
+            "STATE-SET", {"oscs": "OFF", "oson": "OFF"}
+        )
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_direction(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test setting oscillation direction."""
         mock_client = Mock()
-        mock_client.send_standalone_command.return_value = True
-        mock_client_class.return_value = mock_client
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
 
         # Mock the async state call to return None (fallback to default
         # behavior)
@@ -684,24 +761,87 @@ class TestOscillationCommands:
 
         result = set_oscillation_direction(270)
 
-        assert result["success"] is True
-        assert result["actual_heading"] == 270
-        mock_client.send_standalone_command.assert_called_once()
+        assert result.success is True
+        assert result.actual_heading == 270
+        mock_client.send_command.assert_called_once()
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
+    def test_set_oscillation_direction_off_unchanged(
+        self, mock_get_client, mock_async_get_state
+    ):
+        """Test that re-setting the current heading with oscillation off is a no-op."""
+        mock_async_get_state.return_value = {
+            "state": {
+                "product-state": {
+                    "oscs": "OFF",
+                    "oson": "ON",
+                    "osal": "0090",
+                    "osau": "0090",
+                    "ancp": "CUST",
+                }
+            }
+        }
+
+        result = set_oscillation_direction(90)
+        assert result.success is True
+        assert result.oscillation_was_off is True
+        mock_get_client.assert_not_called()
+
+        # A new heading is still sent
+        result = set_oscillation_direction(120)
+        assert result.success is True
+        mock_get_client.return_value.send_command.assert_called_once()
+
+    @patch("paho.mqtt.client.Client")
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
+    def test_set_oscillation_direction_snaps_width(
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
+    ):
+        """Test that an off-step current width snaps to the closest valid step."""
+        mock_client = Mock()
+        mock_client.send_command.return_value = True
+        mock_get_client.return_value = mock_client
+
+        test_cases = [
+            # (osal, osau, expected_width)
+            ("0050", "0320", 350),  # 270° is closer to 350° than 180°
+            ("0100", "0235", 90),  # 135° ties between 90° and 180°
+            ("0100", "0110", 0),  # 10° is closest to off
+        ]
+
+        for osal, osau, expected_width in test_cases:
+            mock_async_get_state.return_value = {
+                "state": {
+                    "product-state": {
+                        "oscs": "ON",
+                        "oson": "ON",
+                        "osal": osal,
+                        "osau": osau,
+                    }
+                }
+            }
+            invalidate_state_cache()
+
+            result = set_oscillation_direction(180)
+
+            assert result.current_width == expected_width
 
     @patch("paho.mqtt.client.Client")
     @patch("blowcontrol.mqtt.async_client.async_get_state")
-    @patch("blowcontrol.commands.oscillation.DysonMQTTClient")
+    @patch("blowcontrol.commands.oscillation.get_pooled_client")
     def test_set_oscillation_direction_invalid(
-        self, mock_client_class, mock_async_get_state, mock_paho_client, mock_env_vars
+        self, mock_get_client, mock_async_get_state, mock_paho_client, mock_env_vars
     ):
         """Test setting invalid oscillation direction."""
         # Mock the async state call
         mock_async_get_state.return_value = None
 
         result = set_oscillation_direction(-1)
-        assert result["success"] is False
-        assert "Heading must be between 0° and 359°" in result["error"]
+        assert result.success is False
+        assert "Heading must be between 0° and 359°" in result.error
 
         result = set_oscillation_direction(360)
-        assert result["success"] is False
-        assert "Heading must be between 0° and 359°" in result["error"]
+        assert result.success is False
+        assert "Heading must be between 0° and 359°" in result.error
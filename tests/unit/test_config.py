@@ -26,6 +26,22 @@ class TestConfig:
         assert blowcontrol.config.ROOT_TOPIC == "438M"
         assert blowcontrol.config.SERIAL_NUMBER == "9HC-EU-TEST123"
 
+    def test_device_topics(self, mock_env_vars):
+        """Test that device topics share the precomputed base topic."""
+        import importlib
+
+        import blowcontrol.config
+
+        importlib.reload(blowcontrol.config)
+
+        assert blowcontrol.config.BASE_TOPIC == "438M/9HC-EU-TEST123"
+        assert blowcontrol.config.get_device_topic() == "438M/9HC-EU-TEST123"
+        assert blowcontrol.config.COMMAND_TOPIC == "438M/9HC-EU-TEST123/command"
+        assert (
+            blowcontrol.config.STATUS_CURRENT_TOPIC
+            == "438M/9HC-EU-TEST123/status/current"
+        )
+
     def test_mqtt_port_default(self):
         """Test that MQTT_PORT defaults to 1883."""
         with patch.dict(os.environ, {"TESTING": "1"}, clear=True):
@@ -86,9 +102,36 @@ SERIAL_NUMBER=9HC-EU-ENV123
 
                     mock_load_dotenv.assert_called_once()
 
+    def test_dotenv_skipped_without_file(self):
+        """Test that python-dotenv is not called when there is no .env file."""
+        with patch("os.path.exists", return_value=False):
+            with patch("dotenv.load_dotenv") as mock_load_dotenv:
+                import importlib
+
+                import blowcontrol.config
+
+                importlib.reload(blowcontrol.config)
+
+                mock_load_dotenv.assert_not_called()
+
+    def test_dotenv_skipped_by_env(self):
+        """Test that SKIP_DOTENV disables .env loading."""
+        with patch.dict(os.environ, {"SKIP_DOTENV": "1"}):
+            with patch("os.path.exists", return_value=True):
+                with patch("dotenv.load_dotenv") as mock_load_dotenv:
+                    import importlib
+
+                    import blowcontrol.config
+
+                    importlib.reload(blowcontrol.config)
+
+                    mock_load_dotenv.assert_not_called()
+
     def test_dotenv_optional(self):
         """Test that .env loading is optional."""
-        with patch("dotenv.load_dotenv", side_effect=ImportError):
+        with patch("os.path.exists", return_value=True), patch(
+            "dotenv.load_dotenv", side_effect=ImportError
+        ):
             # Should not raise an exception for ImportError
             import importlib
 
@@ -0,0 +1,191 @@
+"""
+Unit tests for the device state printer and listener.
+"""
+
+import json
+import threading
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+
+from blowcontrol.state.device_state import DeviceStateListener, DeviceStatePrinter
+
+
+def _message(payload, topic="438M/TEST/status/current"):
+    """Build a paho-style message carrying a JSON payload as bytes."""
+    return Mock(topic=topic, payload=json.dumps(payload).encode())
+
+
+class TestDeviceStateListener:
+    """Test state tracking from incoming MQTT messages."""
+
+    def test_callback_tracks_state_changes(self, sample_device_state, capsys):
+        """Test that a state change is applied on top of the current state."""
+        listener = DeviceStateListener()
+
+        listener._mqtt_callback(None, None, _message(sample_device_state))
+        listener._mqtt_callback(
+            None,
+            None,
+            _message(
+                {
+                    "msg": "STATE-CHANGE",
+                    "time": "2025-07-22T21:42:00.000Z",
+                    "product-state": {"fpwr": ["ON", "OFF"], "fnsp": "0005"},
+                }
+            ),
+        )
+
+        state = listener.get_current_state()
+        assert state["product-state"]["fpwr"] == "OFF"
+        assert state["product-state"]["fnsp"] == "0005"
+        assert state["time"] == "2025-07-22T21:42:00.000Z"
+        assert listener.get_last_update_time() is not None
+        # Progress goes to the module logger, not stdout
+        assert capsys.readouterr().out == ""
+
+    def test_state_snapshots_are_not_mutated(self, sample_device_state):
+        """Test that a state change leaves earlier snapshots untouched."""
+        listener = DeviceStateListener()
+        listener._mqtt_callback(None, None, _message(sample_device_state))
+        before = listener.get_current_state()
+
+        listener._mqtt_callback(
+            None,
+            None,
+            _message({"msg": "STATE-CHANGE", "product-state": {"fpwr": ["ON", "OFF"]}}),
+        )
+
+        assert before["product-state"]["fpwr"] == "ON"
+        assert listener.get_current_state()["product-state"]["fpwr"] == "OFF"
+
+    def test_wait_for_state(self, sample_device_state):
+        """Test that waiting returns as soon as the first state arrives."""
+        listener = DeviceStateListener()
+        assert listener.wait_for_state(timeout=0.01) is False
+
+        timer = threading.Timer(
+            0.01,
+            listener._mqtt_callback,
+            (None, None, _message(sample_device_state)),
+        )
+        timer.start()
+        assert listener.wait_for_state(timeout=5) is True
+        timer.join()
+
+    def test_callback_stores_environmental_data(self, sample_environmental_data):
+        """Test that sensor data is kept separately from the state."""
+        listener = DeviceStateListener()
+
+        listener._mqtt_callback(None, None, _message(sample_environmental_data))
+
+        assert listener.get_environmental_data() == sample_environmental_data
+        assert listener.get_current_state() is None
+
+    @patch("blowcontrol.state.device_state.json_codec")
+    def test_callback_skips_unhandled_types(self, mock_json_codec):
+        """Test that message types the listener ignores are not decoded."""
+        listener = DeviceStateListener()
+
+        listener._mqtt_callback(None, None, _message({"msg": "CURRENT-FAULTS"}))
+
+        mock_json_codec.loads.assert_not_called()
+        assert listener.get_last_update_time() is None
+
+    def test_callback_ignores_invalid_payload(self):
+        """Test that a malformed payload is logged rather than raised."""
+        listener = DeviceStateListener()
+
+        payload = b'{"msg":"CURRENT-STATE",'
+        with patch("blowcontrol.state.device_state.logger") as mock_logger:
+            listener._mqtt_callback(None, None, Mock(topic="t", payload=payload))
+
+        assert listener.get_current_state() is None
+        mock_logger.warning.assert_called_once()
+
+    def test_listener_has_no_instance_dict(self):
+        """Test that listener attributes live in slots."""
+        listener = DeviceStateListener()
+
+        assert not hasattr(listener, "__dict__")
+        with pytest.raises(AttributeError):
+            listener.unexpected = True
+
+
+class TestDeviceStatePrinter:
+    """Test human-readable state output."""
+
+    @pytest.mark.parametrize(
+        "key, value, expected",
+        [
+            ("pm25", "0091", "91 μg/m³"),
+            ("osau", "0350", "350°"),
+            ("fnsp", "0002", "2/10"),
+            ("fnsp", "AUTO", "AUTO"),
+            ("sltm", "0095", "1h 35m"),
+            ("sltm", "0030", "30m"),
+            ("sltm", "OFF", "OFF"),
+            ("hflr", "0100", "100%"),
+            ("cflr", "INV", "INV"),
+            ("rssi", "-30", "-30 dBm (Excellent)"),
+            ("rssi", "-31", "-31 dBm (Good)"),
+            ("rssi", "-50", "-50 dBm (Fair)"),
+            ("rssi", "-51", "-51 dBm (Poor)"),
+            ("osal", None, "None"),
+        ],
+    )
+    def test_format_value(self, key, value, expected):
+        """Test unit formatting, with non-numeric values shown as-is."""
+        assert DeviceStatePrinter.format_value(key, value) == expected
+
+    def test_print_current_state_sections(self, sample_device_state):
+        """Test that known keys print under their section with aligned labels."""
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            DeviceStatePrinter.print_current_state(
+                {**sample_device_state, "rssi": "-45"}
+            )
+
+        output = mock_stdout.getvalue()
+        rule = "-" * 25
+        assert f"\n🔋 POWER & OPERATION\n{rule}\n  Fan Power           : ON\n" in output
+        assert "  Fan Speed           : 2/10" in output
+        assert "  HEPA Filter Remaining: 100%" in output
+        network = f"📡 NETWORK INFORMATION\n{rule}\n  WiFi Signal Strength: -45 dBm"
+        assert network in output
+        assert "  Last Update         : 2025-07-22T21:41:44.000Z" in output
+
+    def test_unknown_message_printed_as_json(self):
+        """Test that unknown message types fall back to a JSON dump."""
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            DeviceStatePrinter.print_any_message({"msg": "HELLO", "value": 1})
+
+        _, heading, body = mock_stdout.getvalue().split("\n", 2)
+        assert heading == "=== HELLO ==="
+        assert json.loads(body.rstrip("=\n")) == {"msg": "HELLO", "value": 1}
+
+    def test_unknown_message_printed_from_raw_payload(self):
+        """Test that a raw payload is printed instead of re-encoding the dict."""
+        raw = b'{"msg":"HELLO","value":1}'
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            with patch("blowcontrol.state.device_state.json_codec") as mock_codec:
+                DeviceStatePrinter.print_any_message(json.loads(raw), raw)
+
+        assert mock_stdout.getvalue().split("\n")[2] == raw.decode()
+        mock_codec.dumps.assert_not_called()
+
+    def test_print_state_change_single_write(self):
+        """Test that a message is written to stdout in one call."""
+        msg = {
+            "msg": "STATE-CHANGE",
+            "time": "2025-07-22T21:42:00.000Z",
+            "product-state": {"fnsp": ["0002", "AUTO"], "sltm": "0030"},
+        }
+        with patch("sys.stdout") as mock_stdout:
+            DeviceStatePrinter.print_any_message(msg)
+
+        mock_stdout.write.assert_called_once()
+        output = mock_stdout.write.call_args[0][0]
+        assert "  Fan Speed           : 2/10 → AUTO\n" in output
+        assert "  Sleep Timer         : ? → 30m\n" in output
+        assert output.endswith("=" * 50 + "\n\n")
@@ -0,0 +1,43 @@
+"""
+Unit tests for the fast state entry point.
+"""
+
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from blowcontrol import fast
+
+
+class TestFastEntryPoint:
+    """Test the argparse-free `state --json` path."""
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_state_json(self, mock_get_state, sample_device_state):
+        """Test that the state is printed as indented JSON."""
+        mock_get_state.return_value = {"state": sample_device_state}
+
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            assert fast.main(["state", "--json"]) == 0
+
+        assert json.loads(mock_stdout.getvalue()) == {"state": sample_device_state}
+        mock_get_state.assert_called_once_with(quiet=True)
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_state_error(self, mock_get_state):
+        """Test that a failed fetch is reported as JSON with exit code 1."""
+        mock_get_state.side_effect = Exception("Connection failed")
+
+        with patch("sys.stdout", StringIO()) as mock_stdout:
+            assert fast.main(["state", "--json"]) == 1
+
+        assert json.loads(mock_stdout.getvalue()) == {
+            "success": False,
+            "message": "Failed to get state: Connection failed",
+        }
+
+    def test_unsupported_arguments(self):
+        """Test that anything but `state --json` prints usage."""
+        with patch("sys.stderr", StringIO()) as mock_stderr:
+            assert fast.main(["power", "on"]) == 2
+        assert "usage:" in mock_stderr.getvalue()
@@ -0,0 +1,36 @@
+"""
+Unit tests for the JSON codec helpers.
+"""
+
+import json
+from unittest.mock import patch
+
+from blowcontrol.utils import json_codec
+
+
+class TestJsonCodec:
+    """Test JSON decoding and pretty encoding with and without orjson."""
+
+    def test_loads_bytes_and_str(self):
+        """Test decoding from bytes and str payloads."""
+        assert json_codec.loads(b'{"msg": "STATE-CHANGE"}') == {"msg": "STATE-CHANGE"}
+        assert json_codec.loads('{"fnsp": "0005"}') == {"fnsp": "0005"}
+
+    def test_dumps_pretty_indents(self):
+        """Test that output matches the stdlib two-space indentation."""
+        data = {"msg": "STATE-CHANGE", "product-state": {"fpwr": ["OFF", "ON"]}}
+        assert json_codec.dumps(data) == json.dumps(data, indent=2)
+
+    def test_dumps_compact(self):
+        """Test that compact output is a single line without spaces."""
+        data = {"msg": "LOCATION", "apos": "0180"}
+        assert (
+            json_codec.dumps(data, pretty=False) == '{"msg":"LOCATION","apos":"0180"}'
+        )
+
+    def test_stdlib_fallback(self):
+        """Test the stdlib path used when orjson is not installed."""
+        with patch.object(json_codec, "orjson", None):
+            assert json_codec.loads(b'{"apos": "0180"}') == {"apos": "0180"}
+            assert json_codec.dumps({"a": 1}) == '{\n  "a": 1\n}'
+            assert json_codec.dumps({"a": 1}, pretty=False) == '{"a":1}'
@@ -0,0 +1,51 @@
+"""
+Tests that package imports stay lazy.
+"""
+
+import importlib
+import sys
+
+import pytest
+
+import blowcontrol.commands
+import blowcontrol.mqtt
+import blowcontrol.state
+
+
+class TestLazyImports:
+    """Test PEP 562 lazy attributes on the subpackages."""
+
+    def test_cli_import_skips_mqtt(self):
+        """Test that importing the CLI does not load paho-mqtt or dotenv."""
+        saved = dict(sys.modules)
+        # Forget the package and the heavy dependencies, then import the CLI
+        # afresh in this interpreter and see what came back
+        for name in saved:
+            if name.split(".")[0] in ("blowcontrol", "paho", "dotenv"):
+                del sys.modules[name]
+        try:
+            importlib.import_module("blowcontrol.cli")
+            loaded = [
+                name
+                for name in ("paho", "dotenv", "blowcontrol.mqtt.client")
+                if name in sys.modules
+            ]
+        finally:
+            for name in set(sys.modules) - set(saved):
+                del sys.modules[name]
+            sys.modules.update(saved)
+        assert loaded == []
+
+    @pytest.mark.parametrize(
+        "package", [blowcontrol.commands, blowcontrol.mqtt, blowcontrol.state]
+    )
+    def test_all_names_resolve(self, package):
+        """Test that every exported name can be loaded and is listed by dir()."""
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+            assert name in dir(package)
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'nope'"):
+            blowcontrol.commands.nope
@@ -3,11 +3,12 @@ Unit tests for MQTT client functionality.
 """
 
 import json
+import re
 from unittest.mock import Mock, patch
 
 import pytest
 
-from blowcontrol.mqtt.client import DysonMQTTClient
+from blowcontrol.mqtt.client import DysonMQTTClient, _timestamp
 
 
 class TestDysonMQTTClient:
@@ -29,7 +30,7 @@ class TestDysonMQTTClient:
         assert client.password == "test-password"
         assert client.client_id == "test-client"
         assert client._connected is False
-        assert client._subscribed_topics == []
+        assert client._subscribed_topics is None
 
     def test_client_initialization_missing_ip(self):
         """Test client initialization fails with missing IP."""
@@ -77,6 +78,34 @@ class TestDysonMQTTClient:
         mock_client_instance.disconnect.assert_called_once()
         assert client._connected is False
 
+    @patch("paho.mqtt.client.Client")
+    def test_disconnect_before_loop_stop(self, mock_mqtt_client, mock_env_vars):
+        """Test that DISCONNECT is sent before the network loop is stopped."""
+        mock_client_instance = Mock()
+        mock_mqtt_client.return_value = mock_client_instance
+
+        client = DysonMQTTClient(client_id="test-client")
+        client.disconnect()
+
+        assert [c[0] for c in mock_client_instance.method_calls[-2:]] == [
+            "disconnect",
+            "loop_stop",
+        ]
+
+    @patch("paho.mqtt.client.Client")
+    def test_is_connected(self, mock_mqtt_client, mock_env_vars):
+        """Test connection status follows the underlying socket."""
+        mock_client_instance = Mock()
+        mock_mqtt_client.return_value = mock_client_instance
+
+        client = DysonMQTTClient(client_id="test-client")
+
+        mock_client_instance.socket.return_value = None
+        assert client.is_connected() is False
+
+        mock_client_instance.socket.return_value = Mock()
+        assert client.is_connected() is True
+
     @patch("paho.mqtt.client.Client")
     def test_publish_message(self, mock_mqtt_client, mock_env_vars):
         """Test publishing messages."""
@@ -161,6 +190,66 @@ class TestDysonMQTTClient:
             assert payload["msg"] == "STATE-SET"
             assert payload["data"]["fnsp"] == "0005"
 
+    @patch("paho.mqtt.client.Client")
+    def test_set_states(self, mock_mqtt_client, mock_env_vars):
+        """Test setting several states in one publish."""
+        client = DysonMQTTClient(client_id="test-client")
+
+        with patch.object(client, "publish") as mock_publish:
+            client.set_states({"fpwr": True, "nmod": False, "fnsp": "0005"})
+
+            mock_publish.assert_called_once()
+            call_args = mock_publish.call_args
+            assert call_args[0][0] == "438M/9HC-EU-TEST123/command"
+
+            payload = json.loads(call_args[0][1])
+            assert payload["msg"] == "STATE-SET"
+            assert payload["data"] == {"fpwr": "ON", "nmod": "OFF", "fnsp": "0005"}
+
+    @patch("paho.mqtt.client.Client")
+    def test_payload_fast_path_is_valid_json(self, mock_mqtt_client, mock_env_vars):
+        """Test that templated and json.dumps payloads decode the same way."""
+        client = DysonMQTTClient(client_id="test-client")
+
+        with patch.object(client, "publish") as mock_publish:
+            client.set_numeric_state("fnsp", "0005")
+            client.set_numeric_state("note", 'say "hi"')
+            client.send_command("REQUEST-CURRENT-STATE")
+            client.set_boolean_state("fpwr", False)
+            client.set_numeric_state("fnsp", "AUTO")
+
+        # Payloads are built as bytes so paho publishes them without re-encoding
+        assert all(isinstance(c[0][1], bytes) for c in mock_publish.call_args_list)
+        payloads = [json.loads(c[0][1]) for c in mock_publish.call_args_list]
+        assert payloads[0]["data"] == {"fnsp": "0005"}
+        assert payloads[1]["data"] == {"note": 'say "hi"'}
+        assert payloads[2]["msg"] == "REQUEST-CURRENT-STATE"
+        assert "data" not in payloads[2]
+        assert payloads[3]["data"] == {"fpwr": "OFF"}
+        assert payloads[4]["data"] == {"fnsp": "AUTO"}
+        assert payloads[3]["mode-reason"] == payloads[4]["mode-reason"] == "RAPP"
+        assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ", payloads[0]["time"])
+
+    @patch("time.time", side_effect=[86400.2, 86400.9, 86401.0])
+    def test_timestamp_formatted_once_per_second(self, mock_time):
+        """Test that the payload timestamp is reused within the same second."""
+        first = _timestamp()
+        assert first == "1970-01-02T00:00:00Z"
+        assert _timestamp() is first
+        assert _timestamp() == "1970-01-02T00:00:01Z"
+
+    @patch("paho.mqtt.client.Client")
+    def test_command_topic_required(self, mock_mqtt_client, mock_env_vars):
+        """Test that publishing without a configured topic fails clearly."""
+        client = DysonMQTTClient(client_id="test-client")
+        client._command_topic = None
+
+        with pytest.raises(ValueError, match="ROOT_TOPIC and SERIAL_NUMBER"):
+            client.set_boolean_state("fpwr", True)
+        with patch.object(client, "publish") as mock_publish:
+            client.set_boolean_state("fpwr", True, topic="custom/topic")
+        assert mock_publish.call_args[0][0] == "custom/topic"
+
     @patch("paho.mqtt.client.Client")
     def test_send_command(self, mock_mqtt_client, mock_env_vars):
         """Test sending commands."""
@@ -230,6 +319,12 @@ class TestDysonMQTTClient:
         assert len(client.client_id) > 0
         assert "blowcontrol" in client.client_id.lower()
 
+        # Later clients in the same process share the tag, not the ID
+        other = DysonMQTTClient(client_id=None)
+        assert other.client_id != client.client_id
+        assert other.client_id.rsplit("-", 1)[0] == client.client_id.rsplit("-", 1)[0]
+        assert len(client.client_id) <= 23
+
     @patch("paho.mqtt.client.Client")
     def test_on_connect_callback(self, mock_mqtt_client, mock_env_vars):
         """Test on_connect callback."""
@@ -247,6 +342,19 @@ class TestDysonMQTTClient:
         client._on_connect(mock_client_instance, None, None, 0)
         mock_client_instance.subscribe.assert_called_with("test/topic")
 
+    @patch("paho.mqtt.client.Client")
+    def test_wait_connected(self, mock_mqtt_client, mock_env_vars):
+        """Test that wait_connected follows CONNACK and disconnects."""
+        client = DysonMQTTClient(client_id="test-client")
+
+        assert client.wait_connected(timeout=0) is False
+        client._on_connect(mock_mqtt_client.return_value, None, None, 5)
+        assert client.wait_connected(timeout=0) is False
+        client._on_connect(mock_mqtt_client.return_value, None, None, 0)
+        assert client.wait_connected(timeout=0) is True
+        client._on_disconnect(mock_mqtt_client.return_value, None, 0)
+        assert client.wait_connected(timeout=0) is False
+
     @patch("paho.mqtt.client.Client")
     def test_on_disconnect_callback(self, mock_mqtt_client, mock_env_vars):
         """Test on_disconnect callback."""
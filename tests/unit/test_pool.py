@@ -0,0 +1,106 @@
+"""
+Unit tests for the MQTT connection pool.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from blowcontrol.mqtt import pool
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    """Start and finish every test with an empty pool."""
+    pool.close_all()
+    yield
+    pool.close_all()
+
+
+class TestConnectionPool:
+    """Test pooled client reuse and lifecycle."""
+
+    @patch("blowcontrol.mqtt.pool.DysonMQTTClient")
+    def test_get_client_connects_once(self, mock_client_class):
+        """Test that repeated lookups reuse a single connection."""
+        mock_client = Mock()
+        mock_client.is_connected.return_value = True
+        mock_client_class.return_value = mock_client
+
+        first = pool.get_client("192.168.1.100", 1883, "serial", "password")
+        second = pool.get_client("192.168.1.100", 1883, "serial", "password")
+
+        assert first is second
+        mock_client_class.assert_called_once()
+        mock_client.connect.assert_called_once()
+
+    @patch("blowcontrol.mqtt.pool.DysonMQTTClient")
+    def test_get_client_keyed_by_broker(self, mock_client_class):
+        """Test that different brokers get different clients."""
+        mock_client_class.side_effect = [Mock(), Mock()]
+
+        first = pool.get_client("192.168.1.100", 1883, "serial", "password")
+        second = pool.get_client("192.168.1.101", 1883, "serial", "password")
+
+        assert first is not second
+        assert mock_client_class.call_count == 2
+
+    @patch("blowcontrol.mqtt.pool.DysonMQTTClient")
+    def test_get_client_connect_failure_not_pooled(self, mock_client_class):
+        """Test that a client that failed to connect is not cached."""
+        mock_client = Mock()
+        mock_client.connect.side_effect = [Exception("Connection failed"), None]
+        mock_client_class.return_value = mock_client
+
+        with pytest.raises(Exception, match="Connection failed"):
+            pool.get_client("192.168.1.100", 1883, "serial", "password")
+
+        pool.get_client("192.168.1.100", 1883, "serial", "password")
+        assert mock_client_class.call_count == 2
+
+    @patch("blowcontrol.mqtt.pool.DysonMQTTClient")
+    def test_get_client_evicts_least_recently_used(self, mock_client_class):
+        """Test that the pool closes its oldest client once it is full."""
+        mock_client_class.side_effect = lambda **kwargs: Mock()
+        ips = [f"192.168.1.{n}" for n in range(pool.MAX_POOLED_CLIENTS + 1)]
+
+        clients = [pool.get_client(ip, 1883, "serial", "password") for ip in ips[:-1]]
+        pool.get_client(ips[0], 1883, "serial", "password")  # now most recent
+        pool.get_client(ips[-1], 1883, "serial", "password")
+
+        assert len(pool._pool) == pool.MAX_POOLED_CLIENTS
+        clients[1].disconnect.assert_called_once()
+        clients[0].disconnect.assert_not_called()
+        assert pool.get_client(ips[0], 1883, "serial", "password") is clients[0]
+
+    def test_health_check_reconnects(self):
+        """Test that a dropped connection is re-established."""
+        mock_client = Mock()
+        mock_client.is_connected.return_value = False
+
+        pool.health_check(mock_client)
+
+        mock_client.disconnect.assert_called_once()
+        mock_client.connect.assert_called_once()
+
+    def test_health_check_connected(self):
+        """Test that a healthy connection is left alone."""
+        mock_client = Mock()
+        mock_client.is_connected.return_value = True
+
+        pool.health_check(mock_client)
+
+        mock_client.disconnect.assert_not_called()
+        mock_client.connect.assert_not_called()
+
+    @patch("blowcontrol.mqtt.pool.DysonMQTTClient")
+    def test_close_all(self, mock_client_class):
+        """Test that close_all disconnects pooled clients."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        pool.get_client("192.168.1.100", 1883, "serial", "password")
+        pool.close_all()
+
+        mock_client.disconnect.assert_called_once()
+        assert pool._pool == {}
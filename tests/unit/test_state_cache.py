@@ -0,0 +1,69 @@
+"""
+Unit tests for the device state cache.
+"""
+
+from unittest.mock import patch
+
+from blowcontrol.state import cache
+
+SAMPLE_RESULT = {"state": {"product-state": {"oson": "OFF"}}, "faults": None}
+
+
+class TestStateCache:
+    """Test cached state lookups and invalidation."""
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_repeated_lookups_share_one_fetch(self, mock_get_state):
+        """Test that lookups within the TTL reuse the cached state."""
+        mock_get_state.return_value = SAMPLE_RESULT
+
+        first = cache.get_state_cached()
+        second = cache.get_state_cached()
+
+        assert first is second
+        mock_get_state.assert_called_once_with(quiet=True)
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_expired_state_is_refetched(self, mock_get_state):
+        """Test that a zero TTL always fetches."""
+        mock_get_state.return_value = SAMPLE_RESULT
+
+        cache.get_state_cached(ttl=0)
+        cache.get_state_cached(ttl=0)
+
+        assert mock_get_state.call_count == 2
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_invalidate_forces_fetch(self, mock_get_state):
+        """Test that invalidation drops the cached state."""
+        mock_get_state.return_value = SAMPLE_RESULT
+
+        cache.get_state_cached()
+        cache.invalidate_state_cache()
+        cache.get_state_cached()
+
+        assert mock_get_state.call_count == 2
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_empty_result_not_cached(self, mock_get_state):
+        """Test that a failed fetch is retried on the next lookup."""
+        mock_get_state.return_value = None
+
+        assert cache.get_state_cached() is None
+        cache.get_state_cached()
+
+        assert mock_get_state.call_count == 2
+
+    @patch("blowcontrol.mqtt.async_client.async_get_state")
+    def test_peek_does_not_fetch(self, mock_get_state):
+        """Test that peeking only returns an already cached state."""
+        mock_get_state.return_value = SAMPLE_RESULT
+
+        assert cache.peek_state_cached() is None
+        mock_get_state.assert_not_called()
+
+        cache.get_state_cached()
+        assert cache.peek_state_cached() is SAMPLE_RESULT
+
+        cache.invalidate_state_cache()
+        assert cache.peek_state_cached() is None